@@ -2,18 +2,30 @@
 Chat completion handler that orchestrates OpenRouter LLM and MCP database queries.
 """
 
+import asyncio
+import json
 import logging
 import re
 import time
-from typing import List, Dict, Any, Optional
+from collections import Counter
+from typing import List, Dict, Any, Optional, Tuple
 from uuid import uuid4
 
+from .config import config
 from .models import (
     ChatMessage, ChatCompletionRequest, ChatCompletionResponse, 
-    MCPQueryResult, MessageRole
+    MCPQueryResult, MCPTool, MessageRole
 )
 from .llm_manager import llm_manager
 from .mcp_client import MCPDatabaseClient, mcp_client
+from .pipeline import StageTimeoutError, StageTimer
+from .prompt_templates import (
+    SQL_GENERATION_HEADER, SQL_GENERATION_RULES, TOOL_CALLING_HEADER, prompt_templates, render_table_list
+)
+from .schema_linker import SchemaLinker
+from .paraphrase_cache import ParaphraseCache
+from .sql_cache import SQLTranslationCache, schema_version
+from .sql_preflight import PreflightResult, SQLPreflight, extract_statement
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +37,12 @@ class ChatCompletionHandler:
         """Initialize the chat completion handler."""
         self.llm_client = llm_manager
         self.mcp_client = mcp_client
-        
+        self.sql_cache = SQLTranslationCache(config.sql_cache_path, config.sql_cache_max_entries)
+        self._preflight_counts: Counter = Counter()
+        self.paraphrase_cache: Optional[ParaphraseCache] = None
+        if config.sql_cache_enabled and config.paraphrase_cache_enabled:
+            self.paraphrase_cache = ParaphraseCache(config.paraphrase_cache_capacity)
+                
         # SQL query detection patterns
         self.sql_patterns = [
             r'\b(?:select|SELECT)\b.*\b(?:from|FROM)\b',
@@ -67,57 +84,55 @@ class ChatCompletionHandler:
             # Check if this looks like a database query
             needs_database = self._needs_database_query(user_message.content)
             
+            timer = StageTimer()
             mcp_context = {}
             query_result = None
+            response = None
             
             if needs_database:
                 logger.info("Message appears to need database access")
+                tool_calling = config.chat_orchestration_mode == "tool_calling"
+                metadata, query_result, tools = await self._gather_database_context(
+                    timer, user_message.content, generate_sql=not tool_calling
+                )
                 
-                # Get database metadata for context
-                metadata = await self.mcp_client.get_database_metadata()
+                query_tool = next((tool for tool in tools if tool.name == "execute_query"), None)
+                if tool_calling and metadata and query_tool and not (query_result and query_result.success):
+                    # No usable cached SQL; the model writes and runs the query itself
+                    response, query_result = await self._complete_with_tools(
+                        timer, request, user_message.content, metadata, query_tool
+                    )
+                    
                 if metadata:
                     mcp_context["database_metadata"] = metadata
-                
-                # Check if there's an explicit SQL query in the message
-                sql_query = self._extract_sql_query(user_message.content)
-                
-                if sql_query:
-                    # Execute the explicit query
-                    logger.info(f"Executing explicit SQL query: {sql_query}")
-                    query_result = await self.mcp_client.execute_query(sql_query)
+                if query_result:
                     mcp_context["query_results"] = query_result.__dict__
-                else:
-                    # Let the LLM decide what query to run
-                    suggested_query = await self._suggest_sql_query(
-                        user_message.content, 
-                        metadata
-                    )
-                    
-                    if suggested_query:
-                        logger.info(f"Executing LLM-suggested query: {suggested_query}")
-                        query_result = await self.mcp_client.execute_query(suggested_query)
-                        mcp_context["query_results"] = query_result.__dict__
-                
-                # Get available tools for context
-                tools = await self.mcp_client.list_tools()
                 mcp_context["available_tools"] = [
                     {"name": tool.name, "description": tool.description}
                     for tool in tools
                 ]
             
             # Create the completion with MCP context
-            response = await self.llm_client.create_completion_with_mcp_context(
-                messages=request.messages,
-                mcp_context=mcp_context,
-                model=request.model,
-                max_tokens=request.max_tokens,
-                temperature=request.temperature,
-                stream=request.stream
-            )
-            
+            if response is None:
+                response = await timer.run(
+                    "completion",
+                    self.llm_client.create_completion_with_mcp_context(
+                        messages=request.messages,
+                        mcp_context=mcp_context,
+                        model=request.model,
+                        max_tokens=request.max_tokens,
+                        temperature=request.temperature,
+                        stream=request.stream
+                    ),
+                    config.chat_completion_timeout
+                )
+                
             # If we have query results, add them to the first choice
             if query_result and response.choices:
                 response.choices[0].query_result = query_result
+                
+            response.timings = timer.finish()
+            logger.info(f"Chat completion stage timings (ms): {response.timings}")
             
             logger.info("Successfully processed chat completion")
             return response
@@ -160,7 +175,246 @@ class ChatCompletionHandler:
                 )]
             )
             return error_response
-    
+            
+    async def _gather_database_context(
+        self,
+        timer: StageTimer,
+        user_question: str,
+        generate_sql: bool = True
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[MCPQueryResult], List[MCPTool]]:
+        """
+        Collect metadata, query results and tools for the completion.
+        
+        Metadata and the tool list are fetched concurrently with the query
+        branch. An explicit SQL query runs right away; otherwise the query
+        is taken from the SQL translation cache, then from the paraphrase cache
+        of rephrased questions, and only generated from the metadata if
+        neither has it.
+        
+        Args:
+            timer: Timer recording the pipeline stages
+            user_question: Content of the latest user message
+            generate_sql: Whether to ask the LLM for SQL when no cache has it
+            
+        Returns:
+            Database metadata, query result and available tools
+        """
+        metadata_task = asyncio.ensure_future(self._fetch_metadata(timer))
+        
+        async def query_branch() -> Optional[MCPQueryResult]:
+            sql_query = self._extract_sql_query(user_question)
+            if sql_query:
+                logger.info(f"Executing explicit SQL query: {sql_query}")
+                return await self._run_query(timer, sql_query)
+                
+            metadata = await metadata_task
+            cache_key = self._translation_key(user_question, metadata)
+            sql_query = self.sql_cache.get(*cache_key) if cache_key else None
+            if sql_query:
+                logger.info(f"Executing cached SQL for the question: {sql_query}")
+                query_result = await self._run_query(timer, sql_query)
+                if not query_result.success:
+                    self.sql_cache.discard(*cache_key)
+                    if self.paraphrase_cache:
+                        self.paraphrase_cache.remove(sql_query, *cache_key[1:])
+                return query_result
+                
+            sql_query = self.paraphrase_cache.lookup(*cache_key) if cache_key and self.paraphrase_cache else None
+            if sql_query:
+                logger.info(f"Executing SQL of a rephrased question: {sql_query}")
+                query_result = await self._run_query(timer, sql_query)
+                # Reused SQL stays out of the exact cache, which persists it
+                if not query_result.success:
+                    self.paraphrase_cache.remove(sql_query, *cache_key[1:])
+                return query_result
+                
+            if not generate_sql:
+                return None
+                
+            # Let the LLM decide what query to run
+            sql_query = await self._generate_sql(timer, user_question, metadata)
+            if not sql_query:
+                return None
+            logger.info(f"Executing LLM-suggested query: {sql_query}")
+            query_result = await self._run_query(timer, sql_query)
+            if cache_key and query_result.success:
+                self.sql_cache.put(*cache_key, sql_query)
+                if self.paraphrase_cache:
+                    self.paraphrase_cache.add(*cache_key, sql_query)
+            return query_result
+            
+        try:
+            return await asyncio.gather(metadata_task, query_branch(), self._fetch_tools(timer))
+        finally:
+            metadata_task.cancel()
+            
+    async def _complete_with_tools(
+        self,
+        timer: StageTimer,
+        request: ChatCompletionRequest,
+        user_question: str,
+        metadata: Dict[str, Any],
+        query_tool: MCPTool
+    ) -> Tuple[ChatCompletionResponse, Optional[MCPQueryResult]]:
+        """
+        Answer in one conversation in which the model runs its own queries.
+        
+        The MCP ``execute_query`` tool is bound to the model, so writing the
+        SQL and answering share the conversation instead of taking a separate
+        SQL generation call. Tool calls are executed through the MCP client;
+        when the model ran exactly one query and it succeeded, its SQL is
+        cached for the question like generated SQL.
+        
+        Args:
+            timer: Timer recording the pipeline stages
+            request: Chat completion request
+            user_question: Content of the latest user message
+            metadata: Database metadata
+            query_tool: The MCP server's execute_query tool
+            
+        Returns:
+            The model's final response and the result of its last successful query
+        """
+        executed: List[Tuple[str, MCPQueryResult]] = []
+        
+        async def execute_tool(name: str, arguments: Dict[str, Any]) -> str:
+            sql_query = arguments.get("query") if isinstance(arguments, dict) else None
+            if name != query_tool.name:
+                return json.dumps({"error": f"Unknown tool: {name}"})
+            if not isinstance(sql_query, str) or not sql_query.strip():
+                return json.dumps({"error": "The query argument is required"})
+            if config.sql_preflight_enabled:
+                preflight = self._preflight_sql(sql_query, metadata)
+                if not preflight.ok:
+                    # The model sees the error and can correct the query without a server round trip
+                    return json.dumps({"error": f"Query rejected before execution: {preflight.error}"})
+                sql_query = preflight.sql
+                
+            logger.info(f"Executing model-requested query: {sql_query}")
+            query_result = await self._run_query(timer, sql_query)
+            executed.append((sql_query, query_result))
+            return self._format_tool_result(query_result)
+            
+        tool_definition = {
+            "type": "function",
+            "function": {
+                "name": query_tool.name,
+                "description": query_tool.description or "",
+                "parameters": query_tool.input_schema
+            }
+        }
+        messages = [
+            ChatMessage(role=MessageRole.SYSTEM, content=self._create_tool_calling_prompt(metadata, user_question)),
+            *request.messages
+        ]
+        response = await timer.run(
+            "completion",
+            self.llm_client.create_completion_with_tools(
+                messages=messages,
+                tools=[tool_definition],
+                execute_tool=execute_tool,
+                max_rounds=config.tool_calling_max_rounds
+            ),
+            config.chat_completion_timeout
+        )
+        
+        successful = [(sql_query, query_result) for sql_query, query_result in executed if query_result.success]
+        cache_key = self._translation_key(user_question, metadata)
+        if cache_key and len(executed) == 1 and successful:
+            self.sql_cache.put(*cache_key, successful[0][0])
+            if self.paraphrase_cache:
+                self.paraphrase_cache.add(*cache_key, successful[0][0])
+                
+        if successful:
+            return response, successful[-1][1]
+        return response, executed[-1][1] if executed else None
+        
+    def _format_tool_result(self, query_result: MCPQueryResult) -> str:
+        """Serialize a query result for the model, keeping at most the configured number of rows."""
+        if not query_result.success:
+            return json.dumps({"error": query_result.error})
+        rows = query_result.data or []
+        payload: Dict[str, Any] = {
+            "columns": query_result.columns,
+            "row_count": query_result.row_count,
+            "rows": rows[:config.tool_result_max_rows]
+        }
+        if len(rows) > config.tool_result_max_rows:
+            payload["truncated"] = True
+        return json.dumps(payload, default=str)
+        
+    def _translation_key(
+        self,
+        user_question: str,
+        metadata: Optional[Dict[str, Any]]
+    ) -> Optional[Tuple[str, str, str]]:
+        """Get the SQL translation cache key for a question, or None if it cannot be cached."""
+        if not config.sql_cache_enabled or not metadata:
+            return None
+        schema = prompt_templates.get(
+            metadata, "schema_version",
+            lambda document: schema_version(document, json.dumps(document.get("tables"), sort_keys=True, default=str))
+        )
+        return user_question, schema, self.llm_client._get_model_name()
+        
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get chat pipeline statistics.
+        
+        Returns:
+            Dictionary with SQL translation, paraphrase and prompt template cache counters and
+            SQL pre-flight counters
+        """
+        return {
+            "sql_cache": self.sql_cache.stats(),
+            "paraphrase_cache": self.paraphrase_cache.stats() if self.paraphrase_cache else None,
+            "prompt_templates": prompt_templates.stats(),
+            "sql_preflight": {key: self._preflight_counts[key] for key in ("checked", "repaired", "rejected")}
+        }
+        
+    async def _fetch_metadata(self, timer: StageTimer) -> Optional[Dict[str, Any]]:
+        """Fetch database metadata, answering without it if it is too slow."""
+        try:
+            return await timer.run(
+                "metadata", self.mcp_client.get_database_metadata(), config.chat_metadata_timeout
+            )
+        except StageTimeoutError as e:
+            logger.warning(f"Continuing without database metadata: {str(e)}")
+            return None
+            
+    async def _fetch_tools(self, timer: StageTimer) -> List[MCPTool]:
+        """Fetch the available tools, answering without them if it is too slow."""
+        try:
+            return await timer.run("tools", self.mcp_client.list_tools(), config.chat_tools_timeout)
+        except StageTimeoutError as e:
+            logger.warning(f"Continuing without the tool list: {str(e)}")
+            return []
+            
+    async def _generate_sql(
+        self,
+        timer: StageTimer,
+        user_question: str,
+        metadata: Optional[Dict[str, Any]]
+    ) -> Optional[str]:
+        """Ask the LLM for a SQL query, giving up if it is too slow."""
+        try:
+            return await timer.run(
+                "sql_generation",
+                self._suggest_sql_query(user_question, metadata),
+                config.chat_sql_generation_timeout
+            )
+        except StageTimeoutError as e:
+            logger.warning(f"Continuing without a SQL query: {str(e)}")
+            return None
+            
+    async def _run_query(self, timer: StageTimer, sql_query: str) -> MCPQueryResult:
+        """Execute a SQL query, returning a failed result if it is too slow."""
+        try:
+            return await timer.run("query", self.mcp_client.execute_query(sql_query), config.chat_query_timeout)
+        except StageTimeoutError as e:
+            logger.warning(str(e))
+            return MCPQueryResult(success=False, error=f"Query execution error: {str(e)}")
+            
     def _get_latest_user_message(self, messages: List[ChatMessage]) -> Optional[ChatMessage]:
         """Get the latest user message from the conversation."""
         for message in reversed(messages):
@@ -264,7 +518,7 @@ class ChatCompletionHandler:
         
         try:
             # Create a prompt for SQL generation
-            system_prompt = self._create_sql_generation_prompt(metadata)
+            system_prompt = self._create_sql_generation_prompt(metadata, user_question)
             
             messages = [
                 ChatMessage(role=MessageRole.SYSTEM, content=system_prompt),
@@ -291,8 +545,11 @@ class ChatCompletionHandler:
                 response.choices[0].message.content):
                 sql_content = response.choices[0].message.content.strip()
                 
-                # Extract SQL from the response
-                query = self._extract_sql_from_response(sql_content)
+                # Extract SQL from the response, checked and repaired against the schema
+                if config.sql_preflight_enabled:
+                    query = self._preflight_sql(sql_content, metadata).sql
+                else:
+                    query = self._extract_sql_from_response(sql_content)
                 if query:
                     logger.info(f"LLM suggested query: {query}")
                     return query
@@ -301,61 +558,59 @@ class ChatCompletionHandler:
             logger.error(f"Error generating SQL suggestion: {str(e)}")
         
         return None
-    
-    def _create_sql_generation_prompt(self, metadata: Dict[str, Any]) -> str:
-        """Create a prompt for SQL query generation."""
-        prompt_parts = [
-            "You are a SQL expert. Generate appropriate SELECT queries for the given database.",
-            "Database information:",
-        ]
         
-        if "tables" in metadata:
-            prompt_parts.append("Available tables:")
-            for table_name, table_info in metadata["tables"].items():
-                prompt_parts.append(f"- {table_name}")
-                if "columns" in table_info:
-                    columns_data = table_info["columns"]
-                    if isinstance(columns_data, dict):
-                        columns = list(columns_data.keys())
-                    elif isinstance(columns_data, list):
-                        # Ensure all items in the list are strings
-                        columns = [str(col) for col in columns_data]
-                    else:
-                        columns = []
-                    prompt_parts.append(f"  Columns: {', '.join(columns)}")
-        
-        prompt_parts.extend([
-            "",
-            "Rules:",
-            "- Only generate SELECT statements",
-            "- Use proper SQL syntax",
-            "- Include only the SQL query in your response",
-            "- Do not include explanations or markdown formatting",
-            "- Limit results with LIMIT clause when appropriate"
-        ])
-        
-        return "\n".join(prompt_parts)
-    
+    def _create_sql_generation_prompt(self, metadata: Dict[str, Any], question: Optional[str] = None) -> str:
+        """
+        Create a prompt for SQL query generation.
+        
+        With schema linking enabled and a question given, only the tables,
+        columns and joins relevant to the question are included, within the
+        configured token budget. The schema index and the full table listing
+        are built once per metadata version.
+        """
+        schema = self._schema_section(metadata, question)
+        return "\n".join(part for part in (SQL_GENERATION_HEADER, schema, SQL_GENERATION_RULES) if part)
+        
+    def _create_tool_calling_prompt(self, metadata: Dict[str, Any], question: str) -> str:
+        """Create the system prompt for answering with the execute_query tool."""
+        return "\n".join(part for part in (TOOL_CALLING_HEADER, self._schema_section(metadata, question)) if part)
+        
+    def _schema_section(self, metadata: Dict[str, Any], question: Optional[str]) -> str:
+        """Get the schema part of a prompt, linked to the question when enabled."""
+        if question is not None and config.schema_linking_enabled:
+            linker = prompt_templates.get(metadata, "schema_linker", SchemaLinker)
+            return linker.link(question, config.sql_prompt_token_budget)
+        return prompt_templates.get(metadata, "sql_table_list", render_table_list)
+        
     def _extract_sql_from_response(self, response: str) -> Optional[str]:
         """Extract SQL query from LLM response."""
-        # Remove common formatting
-        response = response.strip()
-        
-        # Remove markdown code blocks
-        if response.startswith('```'):
-            lines = response.split('\n')
-            if len(lines) > 2:
-                response = '\n'.join(lines[1:-1])
+        # Code fences and prose around the statement are dropped
+        return extract_statement(response)
         
-        # Remove trailing semicolon and whitespace
-        response = response.strip().rstrip(';').strip()
+    def _preflight_sql(self, sql_text: str, metadata: Dict[str, Any]) -> PreflightResult:
+        """
+        Check and repair generated SQL against the schema before sending it to the MCP server.
         
-        # Check if it looks like a valid SELECT statement
-        if response.upper().startswith('SELECT'):
-            return response
+        Args:
+            sql_text: Generated SQL, possibly with prose around it
+            metadata: Database metadata
+            
+        Returns:
+            Pre-flight result with the query to run, or the error it was rejected for
+        """
+        preflight = prompt_templates.get(
+            metadata, "sql_preflight", lambda document: SQLPreflight(document, config.sql_preflight_row_limit)
+        )
+        result = preflight.check(sql_text)
+        self._preflight_counts["checked"] += 1
+        if not result.ok:
+            self._preflight_counts["rejected"] += 1
+            logger.warning(f"Rejected generated SQL without running it: {result.error}")
+        elif result.repairs:
+            self._preflight_counts["repaired"] += 1
+            logger.info(f"Repaired generated SQL ({', '.join(result.repairs)}): {result.sql}")
+        return result
         
-        return None
-    
     async def test_integration(self) -> Dict[str, Any]:
         """
         Test the integration between OpenRouter and MCP.
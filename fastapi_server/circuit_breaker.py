@@ -0,0 +1,145 @@
+"""
+Circuit breaker for calls to the MCP server.
+
+When the MCP server hangs or is down, every chat request would otherwise wait
+out its own timeout. After a run of consecutive failures the breaker opens
+and calls fail immediately; once the reset timeout has passed a single probe
+call is let through, and its outcome closes the breaker or opens it again.
+"""
+
+import logging
+import time
+from enum import Enum
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    """States of a circuit breaker."""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused because the circuit is open."""
+    
+    def __init__(self, message: str, retry_after: float):
+        """
+        Initialize the error.
+        
+        Args:
+            message: Reason for the refusal
+            retry_after: Suggested seconds to wait before retrying
+        """
+        super().__init__(f"{message}; retry after {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with half-open probing."""
+    
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1
+    ):
+        """
+        Initialize the circuit breaker.
+        
+        Args:
+            name: Name of the protected dependency, used in messages
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before probing
+            half_open_max_calls: Probe calls allowed at once while half-open
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._times_opened = 0
+        self._rejected = 0
+        
+    @property
+    def state(self) -> CircuitState:
+        """Current state, moving from open to half-open once the reset timeout passed."""
+        if self._state is CircuitState.OPEN and self._retry_after() <= 0:
+            self._state = CircuitState.HALF_OPEN
+            self._probes = 0
+            logger.info(f"Circuit for {self.name} half-open, probing")
+        return self._state
+        
+    def before_call(self) -> None:
+        """
+        Admit a call or refuse it.
+        
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with its
+                probe calls already in flight
+        """
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return
+        if state is CircuitState.HALF_OPEN and self._probes < self.half_open_max_calls:
+            self._probes += 1
+            return
+            
+        self._rejected += 1
+        raise CircuitOpenError(
+            f"{self.name} unavailable: circuit open after {self._failures} consecutive failures",
+            retry_after=max(self._retry_after(), 0.0)
+        )
+        
+    def record_success(self) -> None:
+        """Record a call that reached a responsive dependency."""
+        if self._state is CircuitState.HALF_OPEN:
+            logger.info(f"Circuit for {self.name} closed after successful probe")
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._probes = 0
+        
+    def record_failure(self) -> None:
+        """Record a call that failed or timed out."""
+        self._failures += 1
+        if self._state is CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self._state is not CircuitState.OPEN:
+                self._times_opened += 1
+                logger.warning(
+                    f"Circuit for {self.name} opened after {self._failures} consecutive failures"
+                )
+            self._state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+            self._probes = 0
+            
+    def release(self) -> None:
+        """Release a call that ended without an outcome, such as a cancelled one."""
+        if self._state is CircuitState.HALF_OPEN and self._probes > 0:
+            self._probes -= 1
+            
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get circuit breaker counters.
+        
+        Returns:
+            Dictionary with the state, failure count and refusal counters
+        """
+        stats: Dict[str, Any] = {
+            "state": self.state.value,
+            "consecutive_failures": self._failures,
+            "times_opened": self._times_opened,
+            "rejected": self._rejected
+        }
+        if self._state is CircuitState.OPEN:
+            stats["retry_in_seconds"] = round(max(self._retry_after(), 0.0), 3)
+        return stats
+        
+    def _retry_after(self) -> float:
+        return self._opened_at + self.reset_timeout - time.monotonic()
@@ -3,7 +3,7 @@ Configuration management for FastAPI server using Pydantic Settings.
 """
 
 import os
-from typing import Optional
+from typing import List, Optional
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings
 
@@ -42,11 +42,80 @@ class FastAPIServerConfig(BaseSettings):
         default="http://localhost:8000",
         description="URL of the MCP server"
     )
+    mcp_server_urls: str = Field(
+        default="",
+        description="Comma-separated URLs of MCP server replicas to balance across; overrides mcp_server_url"
+    )
     mcp_transport: str = Field(
         default="sse",
         description="Transport protocol for MCP connection (stdio or http)"
     )
     
+    mcp_pool_size: int = Field(
+        default=4,
+        description="Number of MCP sessions kept open for the HTTP and SSE transports"
+    )
+    
+    mcp_stdio_pool_size: int = Field(
+        default=2,
+        description="Number of pre-started MCP server processes kept for the stdio transport"
+    )
+    
+    mcp_pool_strategy: str = Field(
+        default="least_outstanding",
+        description="How requests pick a pooled MCP session (least_outstanding or round_robin)"
+    )
+    
+    mcp_health_check_interval: float = Field(
+        default=10.0,
+        description="Seconds an MCP session may sit idle before it is pinged"
+    )
+    
+    mcp_connect_attempts: int = Field(
+        default=3,
+        description="Connection attempts per round before the MCP connection is marked failed"
+    )
+    
+    mcp_reconnect_initial_delay: float = Field(
+        default=0.5,
+        description="Initial delay in seconds between MCP connection attempts"
+    )
+    
+    mcp_reconnect_max_delay: float = Field(
+        default=30.0,
+        description="Maximum delay in seconds between MCP connection attempts"
+    )
+    
+    mcp_call_timeout: float = Field(
+        default=30.0,
+        description="Maximum seconds for a single MCP call, capped by the request budget"
+    )
+    
+    mcp_circuit_failure_threshold: int = Field(
+        default=5,
+        description="Consecutive MCP call failures or timeouts that open the circuit breaker"
+    )
+    
+    mcp_circuit_reset_timeout: float = Field(
+        default=30.0,
+        description="Seconds the MCP circuit breaker stays open before a probe call"
+    )
+    
+    mcp_cache_max_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        description="Memory budget in bytes for cached MCP metadata, tool lists and query results, 0 to disable"
+    )
+    
+    mcp_metadata_cache_ttl: float = Field(
+        default=300.0,
+        description="Seconds cached database metadata and tool lists stay valid, 0 to disable"
+    )
+    
+    mcp_result_cache_ttl: float = Field(
+        default=0.0,
+        description="Seconds SQL query results are cached, 0 to disable; a write can go unnoticed that long"
+    )
+    
     # FastAPI Server Configuration
     fastapi_port: int = Field(
         default=8001,
@@ -56,6 +125,88 @@ class FastAPIServerConfig(BaseSettings):
         default="0.0.0.0",
         description="Host for FastAPI server"
     )
+    request_timeout: float = Field(
+        default=120.0,
+        description="Time budget in seconds for handling one incoming request"
+    )
+    
+    # Chat orchestration
+    chat_orchestration_mode: str = Field(
+        default="pipeline",
+        description="How database questions are answered (pipeline, tool_calling)"
+    )
+    tool_calling_max_rounds: int = Field(
+        default=3,
+        description="Maximum model responses with tool calls per chat completion in tool_calling mode"
+    )
+    tool_result_max_rows: int = Field(
+        default=50,
+        description="Maximum query result rows returned to the model from a tool call"
+    )
+    
+    # Chat pipeline stage timeouts
+    chat_metadata_timeout: float = Field(
+        default=10.0,
+        description="Seconds to wait for database metadata before answering without it"
+    )
+    chat_tools_timeout: float = Field(
+        default=10.0,
+        description="Seconds to wait for the MCP tool list before answering without it"
+    )
+    chat_sql_generation_timeout: float = Field(
+        default=30.0,
+        description="Seconds the LLM may take to suggest a SQL query"
+    )
+    chat_query_timeout: float = Field(
+        default=30.0,
+        description="Seconds a SQL query may take in the chat pipeline"
+    )
+    chat_completion_timeout: float = Field(
+        default=90.0,
+        description="Seconds the final LLM completion may take"
+    )
+    
+    # SQL generation prompt
+    schema_linking_enabled: bool = Field(
+        default=True,
+        description="Only include the tables and columns relevant to the question in the SQL generation prompt"
+    )
+    sql_prompt_token_budget: int = Field(
+        default=1500,
+        description="Approximate token budget for the schema part of the SQL generation prompt"
+    )
+    
+    # SQL pre-flight
+    sql_preflight_enabled: bool = Field(
+        default=True,
+        description="Check and repair generated SQL against the cached schema before running it"
+    )
+    sql_preflight_row_limit: int = Field(
+        default=1000,
+        description="LIMIT added to generated queries that have none"
+    )
+    
+    # SQL translation cache
+    sql_cache_enabled: bool = Field(
+        default=True,
+        description="Reuse SQL generated for previously asked questions"
+    )
+    sql_cache_path: Optional[str] = Field(
+        default=None,
+        description="SQLite file persisting generated SQL across restarts, in memory only if unset"
+    )
+    sql_cache_max_entries: int = Field(
+        default=10000,
+        description="Maximum number of cached SQL translations"
+    )
+    paraphrase_cache_enabled: bool = Field(
+        default=False,
+        description="Reuse SQL generated for earlier questions with the same normalized wording"
+    )
+    paraphrase_cache_capacity: int = Field(
+        default=1000,
+        description="Maximum number of questions in the paraphrase cache"
+    )
     
     # Database Configuration (for MCP server reference)
     database_path: str = Field(
@@ -125,6 +276,138 @@ class FastAPIServerConfig(BaseSettings):
             raise ValueError("MCP transport must be 'stdio', 'http', or 'sse'")
         return v
     
+    @field_validator("mcp_stdio_pool_size")
+    @classmethod
+    def validate_mcp_stdio_pool_size(cls, v: int) -> int:
+        """Validate stdio pool size is reasonable."""
+        if v < 1 or v > 32:
+            raise ValueError("MCP stdio pool size must be between 1 and 32")
+        return v
+    
+    @field_validator("mcp_pool_size")
+    @classmethod
+    def validate_mcp_pool_size(cls, v: int) -> int:
+        """Validate session pool size is reasonable."""
+        if v < 1 or v > 64:
+            raise ValueError("MCP pool size must be between 1 and 64")
+        return v
+    
+    @field_validator("mcp_pool_strategy")
+    @classmethod
+    def validate_mcp_pool_strategy(cls, v: str) -> str:
+        """Validate session selection strategy."""
+        if v not in ["least_outstanding", "round_robin"]:
+            raise ValueError("MCP pool strategy must be 'least_outstanding' or 'round_robin'")
+        return v
+    
+    @field_validator("mcp_health_check_interval")
+    @classmethod
+    def validate_mcp_health_check_interval(cls, v: float) -> float:
+        """Validate health check interval is not negative."""
+        if v < 0:
+            raise ValueError("MCP health check interval must not be negative")
+        return v
+    
+    @field_validator("mcp_connect_attempts")
+    @classmethod
+    def validate_mcp_connect_attempts(cls, v: int) -> int:
+        """Validate connection attempts is positive."""
+        if v < 1 or v > 10:
+            raise ValueError("MCP connect attempts must be between 1 and 10")
+        return v
+    
+    @field_validator("mcp_reconnect_initial_delay")
+    @classmethod
+    def validate_mcp_reconnect_initial_delay(cls, v: float) -> float:
+        """Validate initial reconnect delay is reasonable."""
+        if v < 0.0 or v > 60.0:
+            raise ValueError("MCP reconnect initial delay must be between 0 and 60 seconds")
+        return v
+    
+    @field_validator("mcp_reconnect_max_delay")
+    @classmethod
+    def validate_mcp_reconnect_max_delay(cls, v: float) -> float:
+        """Validate maximum reconnect delay is reasonable."""
+        if v < 0.0 or v > 600.0:
+            raise ValueError("MCP reconnect max delay must be between 0 and 600 seconds")
+        return v
+    
+    @field_validator(
+        "mcp_call_timeout", "mcp_circuit_reset_timeout", "request_timeout",
+        "chat_metadata_timeout", "chat_tools_timeout", "chat_sql_generation_timeout",
+        "chat_query_timeout", "chat_completion_timeout"
+    )
+    @classmethod
+    def validate_positive_timeout(cls, v: float) -> float:
+        """Validate timeouts are positive."""
+        if v <= 0:
+            raise ValueError("Timeouts must be positive")
+        return v
+    
+    @field_validator("mcp_circuit_failure_threshold")
+    @classmethod
+    def validate_mcp_circuit_failure_threshold(cls, v: int) -> int:
+        """Validate circuit breaker threshold is reasonable."""
+        if v < 1 or v > 100:
+            raise ValueError("MCP circuit failure threshold must be between 1 and 100")
+        return v
+    
+    @field_validator("mcp_cache_max_bytes", "mcp_metadata_cache_ttl", "mcp_result_cache_ttl")
+    @classmethod
+    def validate_mcp_cache_settings(cls, v: float) -> float:
+        """Validate cache limits are not negative."""
+        if v < 0:
+            raise ValueError("MCP cache size and TTLs must not be negative")
+        return v
+    
+    @field_validator("sql_cache_max_entries", "paraphrase_cache_capacity")
+    @classmethod
+    def validate_sql_cache_max_entries(cls, v: int) -> int:
+        """Validate SQL cache sizes are positive."""
+        if v < 1:
+            raise ValueError("SQL caches must hold at least one entry")
+        return v
+    
+    @field_validator("chat_orchestration_mode")
+    @classmethod
+    def validate_chat_orchestration_mode(cls, v: str) -> str:
+        """Validate chat orchestration mode."""
+        if v not in ["pipeline", "tool_calling"]:
+            raise ValueError("Chat orchestration mode must be 'pipeline' or 'tool_calling'")
+        return v
+    
+    @field_validator("tool_calling_max_rounds")
+    @classmethod
+    def validate_tool_calling_max_rounds(cls, v: int) -> int:
+        """Validate tool-calling rounds are reasonable."""
+        if v < 1 or v > 10:
+            raise ValueError("Tool calling max rounds must be between 1 and 10")
+        return v
+    
+    @field_validator("tool_result_max_rows")
+    @classmethod
+    def validate_tool_result_max_rows(cls, v: int) -> int:
+        """Validate tool results include at least one row."""
+        if v < 1:
+            raise ValueError("Tool result max rows must be at least 1")
+        return v
+    
+    @field_validator("sql_preflight_row_limit")
+    @classmethod
+    def validate_sql_preflight_row_limit(cls, v: int) -> int:
+        """Validate the added LIMIT returns rows."""
+        if v < 1:
+            raise ValueError("SQL pre-flight row limit must be at least 1")
+        return v
+    
+    @field_validator("sql_prompt_token_budget")
+    @classmethod
+    def validate_sql_prompt_token_budget(cls, v: int) -> int:
+        """Validate prompt budget leaves room for at least a small table."""
+        if v < 100:
+            raise ValueError("SQL prompt token budget must be at least 100")
+        return v
+    
     @field_validator("log_level")
     @classmethod
     def validate_log_level(cls, v: str) -> str:
@@ -195,6 +478,12 @@ class FastAPIServerConfig(BaseSettings):
             raise ValueError("Retry backoff factor must be between 1.0 and 5.0")
         return v
     
+    @property
+    def mcp_backend_urls(self) -> List[str]:
+        """URLs of the MCP servers to connect to."""
+        urls = [url.strip() for url in self.mcp_server_urls.split(",") if url.strip()]
+        return urls or [self.mcp_server_url]
+    
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
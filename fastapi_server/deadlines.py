@@ -0,0 +1,50 @@
+"""
+Per-request time budgets.
+
+Each incoming request gets a deadline, stored in a context variable so that
+calls made on the request's behalf (such as MCP tool calls) can size their
+own timeouts from whatever budget is left.
+"""
+
+import time
+from contextvars import ContextVar, Token
+from typing import Optional
+
+_request_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+def start_request_budget(seconds: float) -> Token:
+    """
+    Start the time budget of the current request.
+    
+    Args:
+        seconds: Time the request may take
+        
+    Returns:
+        Token for reset_request_budget
+    """
+    return _request_deadline.set(time.monotonic() + seconds)
+
+
+def reset_request_budget(token: Token) -> None:
+    """
+    End the time budget started with start_request_budget.
+    
+    Args:
+        token: Token returned by start_request_budget
+    """
+    _request_deadline.reset(token)
+
+
+def remaining_budget() -> Optional[float]:
+    """
+    Get the time left in the current request's budget.
+    
+    Returns:
+        Seconds left (negative once the deadline has passed), or None outside
+        of a request
+    """
+    deadline = _request_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
@@ -0,0 +1,35 @@
+"""
+Fast JSON decoding for MCP payloads.
+
+Query results can hold thousands of rows, and decoding them with the standard
+library dominates the client's share of a request. orjson is used when it is
+installed; otherwise decoding falls back to the json module.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Decode a JSON document.
+    
+    Args:
+        data: JSON text
+        
+    Returns:
+        Decoded value
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def backend() -> str:
+    """Get the name of the JSON library in use."""
+    return "orjson" if orjson is not None else "json"
@@ -2,12 +2,13 @@
 LangChain-based LLM manager for multi-provider support (OpenRouter, Google Gemini).
 """
 
+import asyncio
 import logging
 import time
-from typing import List, Dict, Any, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from uuid import uuid4
 
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, BaseMessage
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, BaseMessage, ToolMessage
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_openai import ChatOpenAI
 from langchain_google_genai import ChatGoogleGenerativeAI
@@ -17,6 +18,7 @@ from .config import config
 from .models import (
     ChatMessage, ChatCompletionResponse, Choice, Usage, MessageRole
 )
+from .prompt_templates import prompt_templates, render_database_context
 from .retry_utils import RetryConfig, retry_with_backoff, is_retryable_error
 
 logger = logging.getLogger(__name__)
@@ -29,6 +31,7 @@ class LLMManager:
         """Initialize LLM manager with configured provider."""
         self.provider = config.llm_provider
         self.llm = self._initialize_llm()
+        self._tool_models: Dict[Tuple[str, ...], Any] = {}
         
         # Initialize retry configuration
         self.retry_config = RetryConfig(
@@ -181,17 +184,73 @@ class LLMManager:
         # Convert messages to LangChain format
         lc_messages = self._convert_messages_to_langchain(messages)
         
-        # Use retry decorator for the API call
+        response = await self._invoke(self.llm, lc_messages)
+        
+        # Convert response to our format
+        return self._convert_response_to_chat_completion(response, model_name, messages)
+        
+    async def create_completion_with_tools(
+        self,
+        messages: List[ChatMessage],
+        tools: List[Dict[str, Any]],
+        execute_tool: Callable[[str, Dict[str, Any]], Awaitable[str]],
+        max_rounds: int = 3,
+        **kwargs
+    ) -> ChatCompletionResponse:
+        """
+        Create a chat completion in which the model may call tools.
+        
+        The tools are bound to the model natively. Whenever the model answers
+        with tool calls, they are executed concurrently through
+        ``execute_tool`` and their results are appended to the same
+        conversation, until the model answers in text. After ``max_rounds``
+        rounds of tool calls the model is asked once more without tools.
+        
+        Args:
+            messages: List of chat messages
+            tools: Tool definitions in OpenAI function format
+            execute_tool: Coroutine function executing a tool call by name and
+                arguments and returning its result as text
+            max_rounds: Maximum number of model responses with tool calls
+            **kwargs: Additional parameters (ignored, uses configured values)
+            
+        Returns:
+            ChatCompletionResponse object with the model's final answer
+        """
+        model_name = self._get_model_name()
+        lc_messages = self._convert_messages_to_langchain(messages)
+        
+        # Binding converts the tool definitions, so it is done once per tool set
+        tools_key = tuple(tool["function"]["name"] for tool in tools)
+        if tools_key not in self._tool_models:
+            self._tool_models[tools_key] = self.llm.bind_tools(tools)
+        tool_model = self._tool_models[tools_key]
+        
+        for round_number in range(1, max_rounds + 1):
+            response = await self._invoke(tool_model, lc_messages)
+            tool_calls = getattr(response, "tool_calls", None)
+            if not tool_calls:
+                logger.info(f"Tool-calling completion answered after {round_number} model calls")
+                return self._convert_response_to_chat_completion(response, model_name, messages)
+                
+            logger.info(f"Model requested {len(tool_calls)} tool calls: {[call['name'] for call in tool_calls]}")
+            results = await asyncio.gather(*(execute_tool(call["name"], call["args"]) for call in tool_calls))
+            lc_messages.append(response)
+            lc_messages.extend(
+                ToolMessage(content=result, tool_call_id=call["id"]) for call, result in zip(tool_calls, results)
+            )
+            
+        logger.warning(f"Model still requested tools after {max_rounds} rounds, asking for an answer without them")
+        response = await self._invoke(self.llm, lc_messages)
+        return self._convert_response_to_chat_completion(response, model_name, messages)
+        
+    async def _invoke(self, llm: Any, lc_messages: List[BaseMessage]) -> AIMessage:
+        """Invoke a LangChain model with retries."""
         @retry_with_backoff(self.retry_config)
         async def _make_api_call():
             try:
                 # Invoke the LLM
-                response = await self.llm.ainvoke(lc_messages)
-                
-                # Convert response to our format
-                return self._convert_response_to_chat_completion(
-                    response, model_name, messages
-                )
+                return await llm.ainvoke(lc_messages)
                 
             except LangChainException as e:
                 logger.warning(f"LangChain error: {e}")
@@ -260,26 +319,10 @@ class LLMManager:
         context_parts = []
         
         if "database_metadata" in mcp_context:
-            metadata = mcp_context["database_metadata"]
-            context_parts.append("Available database information:")
-            context_parts.append(f"Database: {metadata.get('database_path', 'Unknown')}")
-            
-            if "tables" in metadata:
-                context_parts.append("Tables and their structure:")
-                for table_name, table_info in metadata["tables"].items():
-                    context_parts.append(f"- {table_name}:")
-                    if "columns" in table_info:
-                        columns_data = table_info["columns"]
-                        if isinstance(columns_data, dict):
-                            columns = ", ".join(columns_data.keys())
-                        elif isinstance(columns_data, list):
-                            # Ensure all items in the list are strings
-                            columns = ", ".join([str(col) for col in columns_data])
-                        else:
-                            columns = "Unknown"
-                        context_parts.append(f"  Columns: {columns}")
-                    if "row_count" in table_info:
-                        context_parts.append(f"  Rows: {table_info['row_count']}")
+            # Rendered once per metadata version
+            context_parts.append(prompt_templates.get(
+                mcp_context["database_metadata"], "database_context", render_database_context
+            ))
         
         if "query_results" in mcp_context:
             results = mcp_context["query_results"]
@@ -17,6 +17,10 @@ from .models import (
     ErrorResponse, HealthResponse, ErrorDetail
 )
 from .chat_handler import chat_handler
+from .deadlines import reset_request_budget, start_request_budget
+from .mcp_balancer import MCPLoadBalancer
+from .mcp_cache import ClientCache
+from .mcp_pool import MCPSessionPool
 
 # Configure logging
 logging.basicConfig(
@@ -36,7 +40,7 @@ async def lifespan(app: FastAPI):
         logger.info(f"OpenRouter model: {config.openrouter_model}")
     elif config.llm_provider == "gemini":
         logger.info(f"Gemini model: {config.gemini_model}")
-    logger.info(f"MCP server URL: {config.mcp_server_url}")
+    logger.info(f"MCP server URL: {', '.join(config.mcp_backend_urls)}")
     
     # Test connections on startup
     try:
@@ -64,6 +68,7 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down FastAPI server")
     try:
         await chat_handler.mcp_client.disconnect()
+        chat_handler.sql_cache.close()
     except Exception as e:
         logger.error(f"Error during shutdown: {str(e)}")
 
@@ -86,6 +91,26 @@ if config.allow_cors:
         allow_headers=["*"],
     )
 
+@app.middleware("http")
+async def request_budget(request: Request, call_next):
+    """Give each request a time budget that MCP calls made for it must fit in."""
+    budget = config.request_timeout
+    header = request.headers.get("x-request-timeout")
+    if header:
+        try:
+            requested = float(header)
+            if requested > 0:
+                budget = min(budget, requested)
+        except ValueError:
+            logger.warning(f"Ignoring invalid X-Request-Timeout header: {header}")
+            
+    token = start_request_budget(budget)
+    try:
+        return await call_next(request)
+    finally:
+        reset_request_budget(token)
+
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -197,7 +222,8 @@ async def mcp_status():
         if not connected:
             return {
                 "connected": False,
-                "error": "Cannot connect to MCP server"
+                "error": "Cannot connect to MCP server",
+                "connection": chat_handler.mcp_client.connection_status()
             }
         
         # Get server capabilities
@@ -205,15 +231,26 @@ async def mcp_status():
         resources = await chat_handler.mcp_client.list_resources()
         metadata = await chat_handler.mcp_client.get_database_metadata()
         
-        return {
+        status = {
             "connected": True,
             "server_url": config.mcp_server_url,
+            "server_urls": config.mcp_backend_urls,
             "transport": config.mcp_transport,
+            "connection": chat_handler.mcp_client.connection_status(),
             "tools": [{"name": tool.name, "description": tool.description} for tool in tools],
             "resources": [{"name": res.name, "uri": res.uri} for res in resources],
             "database_metadata": metadata
         }
         
+        if isinstance(chat_handler.mcp_client.pool, MCPSessionPool):
+            status["session_pool"] = chat_handler.mcp_client.pool.stats()
+        elif isinstance(chat_handler.mcp_client.pool, MCPLoadBalancer):
+            status["load_balancer"] = chat_handler.mcp_client.pool.stats()
+        if isinstance(getattr(chat_handler.mcp_client, "cache", None), ClientCache):
+            status["cache"] = chat_handler.mcp_client.cache.stats()
+            
+        return status
+        
     except Exception as e:
         logger.error(f"Error getting MCP status: {str(e)}")
         return {
@@ -222,6 +259,12 @@ async def mcp_status():
         }
 
 
+@app.get("/chat/stats")
+async def chat_stats():
+    """Get chat pipeline cache statistics."""
+    return chat_handler.stats()
+
+
 @app.get("/test/integration")
 async def test_integration():
     """Test the integration between OpenRouter and MCP."""
@@ -248,6 +291,7 @@ async def root():
             "health": "/health",
             "models": "/models",
             "mcp_status": "/mcp/status",
+            "chat_stats": "/chat/stats",
             "integration_test": "/test/integration"
         },
         "documentation": "/docs"
@@ -0,0 +1,282 @@
+"""
+Load balancing across several MCP server replicas.
+
+Each backend keeps its own session pool, so sessions stay pinned to the
+replica that created them. Requests go to the healthy backend with the lowest
+expected latency: an exponentially weighted moving average of its recent call
+latencies, scaled by the number of requests already in flight on it. A call
+that fails on one backend is retried on the next best one, and each backend's
+circuit breaker takes it out of rotation after repeated failures until a
+probe call succeeds again.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, TypeVar
+
+from mcp import ClientSession
+
+from .circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+from .mcp_pool import MCPPoolError, MCPSessionPool, is_server_error
+from .retry_utils import RetryConfig
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Weight of the newest sample in the latency moving average
+EWMA_ALPHA = 0.3
+
+# Seconds a backend's pool may wait for a live session before the request
+# fails over to another backend
+BACKEND_CHECKOUT_TIMEOUT = 1.0
+
+
+class Backend:
+    """One MCP server replica with its session pool and health statistics."""
+    
+    def __init__(self, name: str, pool_factory: Callable[[], MCPSessionPool], breaker: CircuitBreaker):
+        """
+        Initialize the backend.
+        
+        Args:
+            name: Name of the backend, usually its URL
+            pool_factory: Callable creating an unstarted session pool for the backend
+            breaker: Circuit breaker tracking the backend's health
+        """
+        self.name = name
+        self.pool_factory = pool_factory
+        self.breaker = breaker
+        self.pool: Optional[MCPSessionPool] = None
+        self.latency_ewma: Optional[float] = None
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        
+    @property
+    def available(self) -> bool:
+        """Whether the backend has a pool and its circuit is not open."""
+        return self.pool is not None and self.breaker.state is not CircuitState.OPEN
+        
+    def score(self) -> float:
+        """Expected latency of the next request, lower is better."""
+        # Backends without samples yet score zero so they get measured first
+        return (self.latency_ewma or 0.0) * (self.outstanding + 1)
+        
+    def record_latency(self, seconds: float) -> None:
+        """Add a latency sample to the moving average."""
+        if self.latency_ewma is None:
+            self.latency_ewma = seconds
+        else:
+            self.latency_ewma = EWMA_ALPHA * seconds + (1 - EWMA_ALPHA) * self.latency_ewma
+            
+    async def open(self) -> None:
+        """
+        Open the backend's session pool.
+        
+        Raises:
+            MCPPoolError: If no session to the backend could be opened
+        """
+        pool = self.pool_factory()
+        await pool.start()
+        self.pool = pool
+        
+    async def close(self) -> None:
+        """Close the backend's session pool."""
+        pool, self.pool = self.pool, None
+        if pool is not None:
+            await pool.close()
+            
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get backend metrics.
+        
+        Returns:
+            Dictionary with health, latency and request counters
+        """
+        return {
+            "name": self.name,
+            "available": self.available,
+            "circuit": self.breaker.stats(),
+            "latency_ewma_ms": round(self.latency_ewma * 1000, 2) if self.latency_ewma is not None else None,
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "failures": self.failures,
+            "pool": self.pool.stats() if self.pool is not None else None
+        }
+
+
+class MCPLoadBalancer:
+    """Least-latency load balancer with failover across MCP backends."""
+    
+    def __init__(self, backends: List[Backend], reopen_retry: Optional[RetryConfig] = None):
+        """
+        Initialize the load balancer.
+        
+        Args:
+            backends: Backends to balance across
+            reopen_retry: Backoff between attempts to reopen a backend whose
+                pool could not be opened or died
+        """
+        self.backends = backends
+        self.reopen_retry = reopen_retry or RetryConfig(initial_delay=1.0, max_delay=30.0)
+        
+        self._background: Set[asyncio.Task] = set()
+        self._next = 0
+        self._closed = False
+        self._failovers = 0
+        
+    async def start(self) -> None:
+        """
+        Open all backends concurrently.
+        
+        Backends that fail to open are retried in the background.
+        
+        Raises:
+            MCPPoolError: If no backend could be opened
+        """
+        results = await asyncio.gather(
+            *(backend.open() for backend in self.backends), return_exceptions=True
+        )
+        failed = [
+            (backend, result) for backend, result in zip(self.backends, results)
+            if isinstance(result, BaseException)
+        ]
+        if len(failed) == len(self.backends):
+            raise MCPPoolError(f"Could not open any MCP backend: {failed[0][1]}")
+            
+        for backend, error in failed:
+            logger.warning(f"Could not open MCP backend {backend.name}: {error}")
+            backend.breaker.record_failure()
+            self._schedule_reopen(backend)
+        logger.info(f"Opened {len(self.backends) - len(failed)} of {len(self.backends)} MCP backends")
+        
+    async def run(self, operation: Callable[[ClientSession], Awaitable[T]]) -> T:
+        """
+        Run an operation on the best available backend, failing over on errors.
+        
+        Errors the server answered with are raised without failover.
+        
+        Args:
+            operation: Coroutine function taking the session to use
+            
+        Returns:
+            The operation's result
+            
+        Raises:
+            MCPPoolError: If no backend is available
+        """
+        tried: Set[Backend] = set()
+        last_error: Optional[Exception] = None
+        while True:
+            backend = self._select(tried)
+            if backend is None:
+                if last_error is not None:
+                    raise last_error
+                raise MCPPoolError("No healthy MCP backend available")
+            tried.add(backend)
+            
+            try:
+                backend.breaker.before_call()
+            except CircuitOpenError:
+                continue
+                
+            if last_error is not None:
+                self._failovers += 1
+                logger.warning(f"Failing over to MCP backend {backend.name}: {last_error!r}")
+            try:
+                return await self._call(backend, operation)
+            except Exception as e:
+                if is_server_error(e):
+                    raise
+                last_error = e
+                
+    @property
+    def live_sessions(self) -> int:
+        """Number of open sessions across all backends."""
+        return sum(backend.pool.live_sessions for backend in self.backends if backend.pool is not None)
+        
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get load balancer metrics.
+        
+        Returns:
+            Dictionary with failover count and per-backend metrics
+        """
+        return {
+            "failovers": self._failovers,
+            "backends": [backend.stats() for backend in self.backends]
+        }
+        
+    async def close(self) -> None:
+        """Close all backends and stop background reopens."""
+        self._closed = True
+        for task in list(self._background):
+            task.cancel()
+        await asyncio.gather(*(backend.close() for backend in self.backends), return_exceptions=True)
+        
+    def _select(self, exclude: Set[Backend]) -> Optional[Backend]:
+        candidates = [backend for backend in self.backends if backend.available and backend not in exclude]
+        if not candidates:
+            return None
+        start = self._next % len(candidates)
+        self._next += 1
+        # Rotating the starting point spreads ties evenly across backends
+        ordered = candidates[start:] + candidates[:start]
+        return min(ordered, key=lambda backend: backend.score())
+        
+    async def _call(self, backend: Backend, operation: Callable[[ClientSession], Awaitable[T]]) -> T:
+        pool = backend.pool
+        backend.outstanding += 1
+        backend.requests += 1
+        started = time.monotonic()
+        try:
+            result = await pool.run(operation)
+        except asyncio.CancelledError:
+            # A call cut off by its deadline still says the backend is slow
+            backend.record_latency(time.monotonic() - started)
+            backend.breaker.release()
+            raise
+        except Exception as e:
+            if is_server_error(e):
+                backend.record_latency(time.monotonic() - started)
+                backend.breaker.record_success()
+                raise
+            backend.failures += 1
+            backend.breaker.record_failure()
+            if isinstance(e, MCPPoolError) and backend.pool is pool and pool.live_sessions == 0:
+                logger.warning(f"MCP backend {backend.name} has no live sessions, reopening it")
+                backend.pool = None
+                self._in_background(pool.close())
+                self._schedule_reopen(backend)
+            raise
+        finally:
+            backend.outstanding -= 1
+            
+        backend.record_latency(time.monotonic() - started)
+        backend.breaker.record_success()
+        return result
+        
+    def _schedule_reopen(self, backend: Backend) -> None:
+        self._in_background(self._reopen(backend))
+        
+    def _in_background(self, coro: Any) -> None:
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        
+    async def _reopen(self, backend: Backend) -> None:
+        attempt = 0
+        while not self._closed and backend.pool is None:
+            await asyncio.sleep(self.reopen_retry.calculate_delay(attempt))
+            attempt += 1
+            try:
+                await backend.open()
+            except Exception as e:
+                logger.warning(f"Could not reopen MCP backend {backend.name}: {e}")
+                continue
+            backend.breaker.record_success()
+            logger.info(f"Reopened MCP backend {backend.name}")
+            if self._closed:
+                await backend.close()
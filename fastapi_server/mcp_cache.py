@@ -0,0 +1,176 @@
+"""
+Client-side cache for MCP responses.
+
+Database metadata and the tool list rarely change, yet every chat turn needs
+them, and identical SQL queries are often repeated across turns. The cache
+keeps decoded responses in an LRU bounded by their serialized size. Each
+entry has a TTL and, when the server stamped the response with a version,
+that version: once a newer version is seen for the same namespace, entries
+from older versions are dropped. Change notifications from the server clear
+whole namespaces.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CacheEntry(NamedTuple):
+    """A cached value with its accounting data."""
+    
+    value: Any
+    size: int
+    expires_at: float
+    version: Optional[str]
+
+
+class ClientCache:
+    """LRU cache bounded by bytes, with TTL and version-based invalidation."""
+    
+    def __init__(self, max_bytes: int):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_bytes: Upper bound for the summed size of cached entries
+        """
+        self.max_bytes = max_bytes
+        
+        self._entries: "OrderedDict[Tuple[str, str], CacheEntry]" = OrderedDict()
+        self._versions: Dict[str, str] = {}
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """
+        Get a cached value.
+        
+        Args:
+            namespace: Group the entry belongs to, such as "metadata"
+            key: Key within the namespace
+            
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        entry = self._entries.get((namespace, key))
+        if entry is None:
+            self._misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove((namespace, key))
+            self._misses += 1
+            return None
+            
+        self._entries.move_to_end((namespace, key))
+        self._hits += 1
+        return entry.value
+        
+    def put(
+        self,
+        namespace: str,
+        key: str,
+        value: Any,
+        size: int,
+        ttl: float,
+        version: Optional[str] = None
+    ) -> None:
+        """
+        Cache a value.
+        
+        Args:
+            namespace: Group the entry belongs to
+            key: Key within the namespace
+            value: Value to cache
+            size: Size of the value in bytes, usually its serialized length
+            ttl: Seconds the entry stays valid, 0 to skip caching
+            version: Server version stamp of the value, if any
+        """
+        if version is not None:
+            self.observe_version(namespace, version)
+        if ttl <= 0 or size > self.max_bytes:
+            return
+            
+        self._remove((namespace, key))
+        self._entries[(namespace, key)] = CacheEntry(value, size, time.monotonic() + ttl, version)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._evictions += 1
+            
+    def observe_version(self, namespace: str, version: str) -> None:
+        """
+        Record the server's current version for a namespace.
+        
+        Entries of the namespace stamped with a different version are dropped.
+        
+        Args:
+            namespace: Namespace the version applies to
+            version: Version string reported by the server
+        """
+        if self._versions.get(namespace) == version:
+            return
+        previous = self._versions.get(namespace)
+        self._versions[namespace] = version
+        if previous is None:
+            return
+            
+        stale = [
+            key for key, entry in self._entries.items()
+            if key[0] == namespace and entry.version is not None and entry.version != version
+        ]
+        for key in stale:
+            self._remove(key)
+        if stale:
+            self._invalidations += 1
+            logger.debug(f"Version of {namespace} changed to {version}, dropped {len(stale)} cached entries")
+            
+    def invalidate(self, namespace: Optional[str] = None) -> int:
+        """
+        Drop cached entries.
+        
+        Args:
+            namespace: Namespace to clear, or None to clear everything
+            
+        Returns:
+            Number of entries dropped
+        """
+        keys = [key for key in self._entries if namespace is None or key[0] == namespace]
+        for key in keys:
+            self._remove(key)
+        if namespace is None:
+            self._versions.clear()
+        else:
+            self._versions.pop(namespace, None)
+        self._invalidations += 1
+        return len(keys)
+        
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+        
+        Returns:
+            Dictionary with size, hit and eviction counters
+        """
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+            "evictions": self._evictions,
+            "invalidations": self._invalidations
+        }
+        
+    def _remove(self, key: Tuple[str, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
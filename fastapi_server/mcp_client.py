@@ -4,136 +4,491 @@ MCP client integration for connecting to the database MCP server.
 
 import asyncio
 import logging
-import json
+import sys
+import time
 import httpx
-from typing import Optional, List, Dict, Any
-from contextlib import AsyncExitStack
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, TypeVar, Union
 
-from mcp import ClientSession, StdioServerParameters
+from mcp import ClientSession, StdioServerParameters, types
 from mcp.client.stdio import stdio_client
 from mcp.client.sse import sse_client
 from mcp.client.streamable_http import streamablehttp_client
 
+from . import json_codec
+from .circuit_breaker import CircuitBreaker
 from .config import config
+from .deadlines import remaining_budget
+from .mcp_balancer import BACKEND_CHECKOUT_TIMEOUT, Backend, MCPLoadBalancer
+from .mcp_cache import ClientCache
+from .mcp_pool import MCPPoolError, MCPSessionPool, is_server_error
 from .models import MCPQueryResult, MCPResource, MCPTool
+from .retry_utils import RetryConfig
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Resource whose update notifications cover every schema and data change
+METADATA_URI = "database://metadata"
+
 
 class MCPClientError(Exception):
     """Custom exception for MCP client errors."""
     pass
 
 
+class ConnectionState(str, Enum):
+    """States of the connection to the MCP server."""
+    DISCONNECTED = "disconnected"
+    CONNECTING = "connecting"
+    CONNECTED = "connected"
+    BACKOFF = "backoff"
+    FAILED = "failed"
+
+
+async def call_trusted_tool(session: ClientSession, name: str, arguments: Dict[str, Any]) -> types.CallToolResult:
+    """
+    Call a tool without validating its structured result against the output schema.
+    
+    ClientSession.call_tool checks structured content with jsonschema on every
+    call, which walks every row of a large result. The database server builds
+    its results from a pydantic model, so the check is skipped for its tools.
+    
+    Args:
+        session: Session to call the tool on
+        name: Tool name
+        arguments: Tool arguments
+        
+    Returns:
+        The tool result as sent by the server
+    """
+    return await session.send_request(
+        types.ClientRequest(
+            types.CallToolRequest(params=types.CallToolRequestParams(name=name, arguments=arguments))
+        ),
+        types.CallToolResult
+    )
+
+
+def decode_query_result(result: types.CallToolResult) -> Tuple[MCPQueryResult, int]:
+    """
+    Turn an execute_query tool result into an MCPQueryResult.
+    
+    The structured content was already decoded along with the JSON-RPC
+    message, so the text copy of it is only parsed for servers that do not
+    send structured content. The rows come from the trusted database server
+    and are used as they are, without validating them again.
+    
+    Args:
+        result: Successful execute_query tool result
+        
+    Returns:
+        The query result and the size of its JSON text in bytes, 0 if unknown
+    """
+    text = None
+    if isinstance(result.content, list) and len(result.content) > 0:
+        text = getattr(result.content[0], "text", None)
+        
+    if isinstance(result.structuredContent, dict):
+        result_data = result.structuredContent
+    elif text is not None:
+        result_data = json_codec.loads(text)
+    elif isinstance(result.content, list) and len(result.content) > 0:
+        result_data = result.content[0]
+    else:
+        result_data = result.content
+        
+    # Extract data from result
+    if isinstance(result_data, dict):
+        success = result_data.get("success", True)
+        # The MCP server returns data in "rows" field, not "data"
+        data = result_data.get("data", result_data.get("rows", []))
+        columns = result_data.get("columns", [])
+        error = result_data.get("error")
+        version = result_data.get("version")
+    else:
+        # Fallback for simpler result format
+        success = True
+        data = result_data if isinstance(result_data, list) else []
+        columns = list(data[0].keys()) if data and isinstance(data[0], dict) else []
+        error = None
+        version = None
+        
+    query_result = MCPQueryResult.model_construct(
+        success=success,
+        data=data,
+        columns=columns,
+        error=error,
+        row_count=len(data) if data else 0,
+        version=version
+    )
+    return query_result, len(text) if text is not None else 0
+
+
 class MCPDatabaseClient:
     """Client for connecting to the MCP database server."""
     
     def __init__(self):
         """Initialize MCP client."""
-        self.session: Optional[ClientSession] = None
-        self.exit_stack: Optional[AsyncExitStack] = None
+        self.pool: Optional[Union[MCPSessionPool, MCPLoadBalancer]] = None
         self.transport_type = config.mcp_transport
         self.server_url = config.mcp_server_url
-        self.connected = False
+        self.server_urls = config.mcp_backend_urls
+        self.state = ConnectionState.DISCONNECTED
+        self.retry_config = RetryConfig(
+            max_retries=config.mcp_connect_attempts,
+            initial_delay=config.mcp_reconnect_initial_delay,
+            max_delay=config.mcp_reconnect_max_delay
+        )
+        self.breaker = CircuitBreaker(
+            "MCP server",
+            failure_threshold=config.mcp_circuit_failure_threshold,
+            reset_timeout=config.mcp_circuit_reset_timeout
+        )
+        self.cache = ClientCache(config.mcp_cache_max_bytes)
+        
+        self._connect_task: Optional[asyncio.Task] = None
+        self._background: Set[asyncio.Task] = set()
+        self._state_since = time.monotonic()
+        self._failures = 0
+        self._connects = 0
+        self._last_error: Optional[str] = None
+        self._retry_at: Optional[float] = None
         
         logger.info(f"Initialized MCP client for {self.transport_type} transport")
-    
+        
+    @property
+    def connected(self) -> bool:
+        """Whether the client holds an open connection to the MCP server."""
+        return self.state is ConnectionState.CONNECTED
+        
     async def connect(self) -> None:
-        """Connect to the MCP server."""
+        """
+        Connect to the MCP server.
+        
+        Concurrent callers share a single connection attempt instead of each
+        opening their own. After a round of failed attempts, callers fail fast
+        until the jittered backoff delay has passed.
+        
+        Raises:
+            MCPClientError: If the connection could not be established
+        """
+        if self.state is ConnectionState.CONNECTED:
+            return
+            
+        # No await between the check and the assignment, so only one
+        # connection attempt can be started
+        if self._connect_task is None:
+            if self.state is ConnectionState.FAILED and time.monotonic() < self._retry_at:
+                retry_in = self._retry_at - time.monotonic()
+                raise MCPClientError(
+                    f"MCP server unavailable, next connection attempt in {retry_in:.1f}s: "
+                    f"{self._last_error}"
+                )
+            self._connect_task = asyncio.create_task(self._establish())
+            
+        # Shielded so a cancelled caller does not abort the attempt for the others
+        await asyncio.shield(self._connect_task)
+        
+    async def _establish(self) -> None:
+        """
+        Open the connection, retrying with jittered exponential backoff.
+        
+        Raises:
+            MCPClientError: If every attempt failed
+        """
         try:
-            if self.connected:
-                logger.warning("Already connected to MCP server")
+            for attempt in range(self.retry_config.max_retries):
+                if attempt > 0:
+                    delay = self.retry_config.calculate_delay(attempt - 1)
+                    self._retry_at = time.monotonic() + delay
+                    self._set_state(ConnectionState.BACKOFF)
+                    logger.warning(f"Retrying MCP connection in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+                    
+                self._set_state(ConnectionState.CONNECTING)
+                try:
+                    self.pool = await self._open_pool()
+                except Exception as e:
+                    self._failures += 1
+                    self._last_error = str(e)
+                    logger.error(f"Failed to connect to MCP server: {str(e)}")
+                    continue
+                    
+                self._failures = 0
+                self._connects += 1
+                self._last_error = None
+                self._retry_at = None
+                self._set_state(ConnectionState.CONNECTED)
+                logger.info(f"Successfully connected to MCP server via {self.transport_type}")
+                
+                # Changes made while disconnected were not notified
+                self.cache.invalidate()
+                
+                # Log available tools and resources
+                await self._log_server_capabilities()
                 return
+                
+            # Consecutive failures keep growing the delay across rounds
+            delay = self.retry_config.calculate_delay(self._failures - 1)
+            self._retry_at = time.monotonic() + delay
+            self._set_state(ConnectionState.FAILED)
+            raise MCPClientError(f"Connection failed: {self._last_error}")
             
-            self.exit_stack = AsyncExitStack()
+        except asyncio.CancelledError:
+            self._set_state(ConnectionState.DISCONNECTED)
+            raise
             
-            if self.transport_type == "stdio":
-                await self._connect_stdio()
-            elif self.transport_type == "http":
-                await self._connect_http()
-            elif self.transport_type == "sse":
-                await self._connect_sse()
-            else:
-                raise MCPClientError(f"Unsupported transport type: {self.transport_type}")
+        finally:
+            self._connect_task = None
+            
+    async def _open_pool(self) -> Union[MCPSessionPool, MCPLoadBalancer]:
+        """
+        Open a pool of initialized sessions for the configured transport.
+        
+        With several server URLs configured, each gets its own pool behind
+        a load balancer.
+        
+        Returns:
+            Started session pool or load balancer
+        """
+        if self.transport_type == "stdio":
+            pool = self._new_pool(self._stdio_transport(), config.mcp_stdio_pool_size, "stdio")
+            await pool.start()
+            return pool
+        if self.transport_type not in ("http", "sse"):
+            raise MCPClientError(f"Unsupported transport type: {self.transport_type}")
             
-            # Initialize the session
-            await self.session.initialize()
-            self.connected = True
+        if len(self.server_urls) == 1:
+            transport = self._network_transport(self.server_urls[0])
+            pool = self._new_pool(transport, config.mcp_pool_size, self.transport_type)
+            await pool.start()
+            return pool
+            
+        backends = [
+            Backend(
+                url,
+                lambda url=url: self._new_pool(
+                    self._network_transport(url),
+                    config.mcp_pool_size,
+                    url,
+                    checkout_timeout=BACKEND_CHECKOUT_TIMEOUT
+                ),
+                CircuitBreaker(
+                    f"MCP backend {url}",
+                    failure_threshold=config.mcp_circuit_failure_threshold,
+                    reset_timeout=config.mcp_circuit_reset_timeout
+                )
+            )
+            for url in self.server_urls
+        ]
+        balancer = MCPLoadBalancer(backends)
+        await balancer.start()
+        return balancer
+        
+    def _new_pool(
+        self,
+        transport: Callable[[], Any],
+        size: int,
+        name: str,
+        checkout_timeout: float = 30.0
+    ) -> MCPSessionPool:
+        """Create a session pool; several sessions so concurrent requests do not share a single stream."""
+        return MCPSessionPool(
+            transport,
+            size=size,
+            strategy=config.mcp_pool_strategy,
+            name=name,
+            health_check_interval=config.mcp_health_check_interval,
+            checkout_timeout=checkout_timeout,
+            session_options={"message_handler": self._handle_message},
+            on_open=self._subscribe_to_changes
+        )
+        
+    async def _subscribe_to_changes(self, session: ClientSession) -> None:
+        """Subscribe a new session to change notifications for the database metadata."""
+        try:
+            await session.subscribe_resource(METADATA_URI)
+        except Exception as e:
+            # Servers without subscription support still expire entries by TTL
+            logger.debug(f"Could not subscribe to {METADATA_URI}: {str(e)}")
+            
+    async def _handle_message(self, message: Any) -> None:
+        """Drop cached entries when the server notifies a change."""
+        if not isinstance(message, types.ServerNotification):
+            return
+        notification = message.root
+        if isinstance(notification, types.ResourceUpdatedNotification):
+            self.cache.invalidate("metadata")
+            self.cache.invalidate("results")
+        elif isinstance(notification, types.ResourceListChangedNotification):
+            self.cache.invalidate("metadata")
+        elif isinstance(notification, types.ToolListChangedNotification):
+            self.cache.invalidate("tools")
+        else:
+            return
+        logger.debug(f"Cleared cached MCP responses after {notification.method}")
+        
+    def _network_transport(self, server_url: str) -> Callable[[], Any]:
+        """Get a transport factory for an HTTP or SSE server URL."""
+        if self.transport_type == "http":
+            return self._http_transport(server_url)
+        return self._sse_transport(server_url)
+        
+    def _set_state(self, state: ConnectionState) -> None:
+        """Record a connection state transition."""
+        if state is not self.state:
+            logger.debug(f"MCP connection state: {self.state.value} -> {state.value}")
+            self.state = state
+            self._state_since = time.monotonic()
+            
+    async def _call(self, operation: Callable[[Any], Awaitable[T]]) -> T:
+        """
+        Run an operation on a pooled session, connecting first if needed.
+        
+        The call, including any reconnect, must finish within the MCP call
+        timeout and whatever is left of the incoming request's budget.
+        Failures and timeouts count towards the circuit breaker; errors the
+        server answered with do not.
+        
+        Args:
+            operation: Coroutine function taking the session to use
             
-            logger.info(f"Successfully connected to MCP server via {self.transport_type}")
+        Returns:
+            The operation's result
             
-            # Log available tools and resources
-            await self._log_server_capabilities()
+        Raises:
+            CircuitOpenError: If the circuit breaker refuses the call
+            MCPClientError: If the call timed out or the connection failed
+        """
+        timeout = self._call_timeout()
+        if timeout <= 0:
+            raise MCPClientError("Request deadline passed before the MCP call was made")
             
+        self.breaker.before_call()
+        try:
+            result = await asyncio.wait_for(self._call_pool(operation), timeout)
+        except asyncio.TimeoutError:
+            self.breaker.record_failure()
+            raise MCPClientError(f"MCP call timed out after {timeout:.1f}s")
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
         except Exception as e:
-            logger.error(f"Failed to connect to MCP server: {str(e)}")
-            await self.disconnect()
-            raise MCPClientError(f"Connection failed: {str(e)}")
-    
-    async def _connect_stdio(self) -> None:
-        """Connect using stdio transport."""
-        # For stdio, we need to start the MCP server process
+            if is_server_error(e):
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+            raise
+            
+        self.breaker.record_success()
+        return result
+        
+    def _call_timeout(self) -> float:
+        """Get the timeout for the next call from the configured limit and request budget."""
+        timeout = config.mcp_call_timeout
+        remaining = remaining_budget()
+        if remaining is not None:
+            timeout = min(timeout, remaining)
+        return timeout
+        
+    async def _call_pool(self, operation: Callable[[Any], Awaitable[T]]) -> T:
+        """Connect if needed and run the operation on the session pool."""
+        await self.connect()
+        pool = self.pool
+        try:
+            return await pool.run(operation)
+        except MCPPoolError as e:
+            if pool.live_sessions:
+                # The pool has already retired the failed session; the others keep serving
+                raise MCPClientError(f"MCP session failed: {str(e)}")
+            self._connection_lost(pool, e)
+            raise MCPClientError(f"Lost connection to MCP server: {str(e)}")
+            
+    def _connection_lost(self, pool: Union[MCPSessionPool, MCPLoadBalancer], error: Exception) -> None:
+        """
+        Drop a pool that has no live sessions left.
+        
+        Only the first caller to notice acts on it; the next request then
+        starts a single shared reconnect. Failures of single sessions are
+        handled by the pool and do not disconnect the other requests.
+        """
+        if pool is not self.pool:
+            return
+        logger.warning(f"Lost connection to MCP server: {str(error)}")
+        self.pool = None
+        self._set_state(ConnectionState.DISCONNECTED)
+        task = asyncio.create_task(pool.close())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        
+    def connection_status(self) -> Dict[str, Any]:
+        """
+        Get the state of the connection to the MCP server.
+        
+        Returns:
+            Dictionary with the connection state and reconnect counters
+        """
+        now = time.monotonic()
+        status = {
+            "state": self.state.value,
+            "state_seconds": round(now - self._state_since, 3),
+            "connects": self._connects,
+            "consecutive_failures": self._failures,
+            "last_error": self._last_error
+        }
+        if self._retry_at is not None and self.state in (ConnectionState.BACKOFF, ConnectionState.FAILED):
+            status["retry_in_seconds"] = round(max(self._retry_at - now, 0.0), 3)
+        status["circuit"] = self.breaker.stats()
+        return status
+        
+    def _stdio_transport(self) -> Callable[[], Any]:
+        """Get a factory for stdio transports."""
+        # For stdio, every session starts its own MCP server process.
+        # Running the package loads the server from cached bytecode.
         server_params = StdioServerParameters(
-            command="python",
-            args=["-m", "talk_2_tables_mcp.server"],
+            command=sys.executable,
+            args=["-m", "talk_2_tables_mcp"],
             env=None
         )
+        return lambda: stdio_client(server_params)
         
-        stdio_transport = await self.exit_stack.enter_async_context(
-            stdio_client(server_params)
-        )
-        stdio, write = stdio_transport
-        self.session = await self.exit_stack.enter_async_context(
-            ClientSession(stdio, write)
-        )
-    
-    async def _connect_http(self) -> None:
-        """Connect using HTTP transport."""
+    def _http_transport(self, base_url: str) -> Callable[[], Any]:
+        """Get a factory for HTTP transports."""
         # For HTTP, connect to the running MCP server
         # The MCP server is configured to use streamable-http transport
-        if not self.server_url.endswith("/mcp"):
-            server_url = f"{self.server_url}/mcp"
+        if not base_url.endswith("/mcp"):
+            server_url = f"{base_url}/mcp"
         else:
-            server_url = self.server_url
-        
+            server_url = base_url
+            
         # Use streamable HTTP client for the connection
         # This matches the server's streamable-http transport
-        streamable_transport = await self.exit_stack.enter_async_context(
-            streamablehttp_client(server_url)
-        )
-        read, write, get_session_id = streamable_transport
-        self.session = await self.exit_stack.enter_async_context(
-            ClientSession(read, write)
-        )
-    
-    async def _connect_sse(self) -> None:
-        """Connect using SSE (Server-Sent Events) transport."""
+        return lambda: streamablehttp_client(server_url)
+        
+    def _sse_transport(self, base_url: str) -> Callable[[], Any]:
+        """Get a factory for SSE (Server-Sent Events) transports."""
         # For SSE, connect to the running MCP server with SSE endpoint
-        if not self.server_url.endswith("/sse"):
-            server_url = f"{self.server_url}/sse"
+        if not base_url.endswith("/sse"):
+            server_url = f"{base_url}/sse"
         else:
-            server_url = self.server_url
-        
+            server_url = base_url
+            
         # Use SSE client for the connection
         # This matches the server's sse transport
-        sse_transport = await self.exit_stack.enter_async_context(
-            sse_client(server_url)
-        )
-        read, write = sse_transport
-        self.session = await self.exit_stack.enter_async_context(
-            ClientSession(read, write)
-        )
-    
+        return lambda: sse_client(server_url)
+        
     async def _log_server_capabilities(self) -> None:
         """Log the server's capabilities."""
         try:
             # List tools
-            tools_response = await self.session.list_tools()
+            tools_response = await self.pool.run(lambda session: session.list_tools())
             tool_names = [tool.name for tool in tools_response.tools]
             logger.info(f"Available tools: {tool_names}")
             
             # List resources
-            resources_response = await self.session.list_resources()
+            resources_response = await self.pool.run(lambda session: session.list_resources())
             resource_names = [resource.name for resource in resources_response.resources]
             logger.info(f"Available resources: {resource_names}")
             
@@ -142,37 +497,53 @@ class MCPDatabaseClient:
     
     async def disconnect(self) -> None:
         """Disconnect from the MCP server."""
-        if self.exit_stack:
+        if self._connect_task is not None:
+            self._connect_task.cancel()
             try:
-                await self.exit_stack.aclose()
-                self.connected = False
+                await self._connect_task
+            except (asyncio.CancelledError, Exception):
+                pass
+                
+        if self.pool is not None:
+            try:
+                await self.pool.close()
                 logger.info("Disconnected from MCP server")
             except Exception as e:
                 logger.error(f"Error during disconnect: {str(e)}")
+            self.pool = None
+            
+        self._failures = 0
+        self._retry_at = None
+        self._set_state(ConnectionState.DISCONNECTED)
         
-        self.session = None
-        self.exit_stack = None
-    
     async def execute_query(self, query: str) -> MCPQueryResult:
         """
         Execute a SQL query via the MCP server.
         
+        When ``mcp_result_cache_ttl`` is set, successful results are cached
+        for that long, keyed by the query text, and dropped earlier only if
+        the server reports a newer data version or notifies a change, so a
+        write can go unnoticed until the entry expires. Results are treated
+        as read-only and shared with the cache rather than copied.
+        
         Args:
             query: SQL query to execute
             
         Returns:
             MCPQueryResult with query results or error
         """
-        if not self.connected or not self.session:
-            await self.connect()
-        
+        cache_key = " ".join(query.split())
+        cached = self.cache.get("results", cache_key)
+        if cached is not None:
+            logger.info(f"Returning cached result for query: {query[:100]}...")
+            return cached
+            
         try:
             logger.info(f"Executing query: {query[:100]}...")
             
             # Call the execute_query tool
-            result = await self.session.call_tool(
-                "execute_query",
-                {"query": query}
+            result = await self._call(
+                lambda session: call_trusted_tool(session, "execute_query", {"query": query})
             )
             
             if result.isError:
@@ -181,42 +552,16 @@ class MCPDatabaseClient:
                     success=False,
                     error=str(result.content)
                 )
+                
+            query_result, size = decode_query_result(result)
+            logger.info(f"Query executed successfully, returned {query_result.row_count} rows")
             
-            # Parse the result content
-            if isinstance(result.content, list) and len(result.content) > 0:
-                content = result.content[0]
-                if hasattr(content, 'text'):
-                    result_data = json.loads(content.text)
-                else:
-                    result_data = content
-            else:
-                result_data = result.content
-            
-            # Extract data from result
-            if isinstance(result_data, dict):
-                success = result_data.get("success", True)
-                # The MCP server returns data in "rows" field, not "data"
-                data = result_data.get("data", result_data.get("rows", []))
-                columns = result_data.get("columns", [])
-                error = result_data.get("error")
-                row_count = len(data) if data else 0
-            else:
-                # Fallback for simpler result format
-                success = True
-                data = result_data if isinstance(result_data, list) else []
-                columns = list(data[0].keys()) if data and isinstance(data[0], dict) else []
-                error = None
-                row_count = len(data)
-            
-            logger.info(f"Query executed successfully, returned {row_count} rows")
-            
-            return MCPQueryResult(
-                success=success,
-                data=data,
-                columns=columns,
-                error=error,
-                row_count=row_count
-            )
+            if query_result.success and size:
+                self.cache.put(
+                    "results", cache_key, query_result, size,
+                    ttl=config.mcp_result_cache_ttl, version=query_result.version
+                )
+            return query_result
             
         except Exception as e:
             logger.error(f"Error executing query: {str(e)}")
@@ -232,30 +577,14 @@ class MCPDatabaseClient:
         Returns:
             Database metadata or None if not available
         """
-        if not self.connected or not self.session:
-            await self.connect()
-        
         try:
             logger.info("Fetching database metadata")
             
             # Read the database metadata resource
-            result = await self.session.read_resource("database://metadata")
-            
-            # Check if result has an error - MCP SDK doesn't use isError attribute
-            if hasattr(result, 'isError') and result.isError:
-                logger.error(f"Failed to read metadata: {result.content}")
+            metadata = await self._read_json_resource("database://metadata")
+            if metadata is None:
                 return None
-            
-            # Parse the metadata content
-            if isinstance(result.contents, list) and len(result.contents) > 0:
-                content = result.contents[0]
-                if hasattr(content, 'text'):
-                    metadata = json.loads(content.text)
-                else:
-                    metadata = content
-            else:
-                metadata = result.contents
-            
+                
             # Ensure metadata is a dict, not a list
             if isinstance(metadata, list):
                 logger.warning("Metadata returned as list, converting to empty dict structure")
@@ -267,7 +596,66 @@ class MCPDatabaseClient:
         except Exception as e:
             logger.error(f"Error getting database metadata: {str(e)}")
             return None
-    
+            
+    async def get_table_metadata(self, table_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get metadata for a single table from the MCP server.
+        
+        Fetching individual tables keeps payloads small for large schemas.
+        
+        Args:
+            table_name: Name of the table
+            
+        Returns:
+            Table metadata or None if not available
+        """
+        try:
+            logger.info(f"Fetching metadata for table {table_name}")
+            return await self._read_json_resource(f"database://tables/{table_name}")
+            
+        except Exception as e:
+            logger.error(f"Error getting metadata for table {table_name}: {str(e)}")
+            return None
+            
+    async def _read_json_resource(self, uri: str) -> Optional[Any]:
+        """
+        Read a resource and decode its JSON content.
+        
+        Decoded documents are cached until their TTL expires, the server
+        notifies a change or a document with a newer version is read.
+        
+        Args:
+            uri: Resource URI
+            
+        Returns:
+            Decoded resource content or None if the read failed
+        """
+        cached = self.cache.get("metadata", uri)
+        if cached is not None:
+            return cached
+            
+        result = await self._call(lambda session: session.read_resource(uri))
+        
+        # Check if result has an error - MCP SDK doesn't use isError attribute
+        if hasattr(result, 'isError') and result.isError:
+            logger.error(f"Failed to read resource {uri}: {result.content}")
+            return None
+            
+        # Parse the resource content
+        if isinstance(result.contents, list) and len(result.contents) > 0:
+            content = result.contents[0]
+            if hasattr(content, 'text'):
+                document = json_codec.loads(content.text)
+                version = document.get("version") if isinstance(document, dict) else None
+                self.cache.put(
+                    "metadata", uri, document, len(content.text),
+                    ttl=config.mcp_metadata_cache_ttl, version=version
+                )
+                return document
+            return content
+            
+        return result.contents
+        
     async def list_tools(self) -> List[MCPTool]:
         """
         List available tools from the MCP server.
@@ -275,11 +663,12 @@ class MCPDatabaseClient:
         Returns:
             List of available tools
         """
-        if not self.connected or not self.session:
-            await self.connect()
-        
+        cached = self.cache.get("tools", "list")
+        if cached is not None:
+            return list(cached)
+            
         try:
-            tools_response = await self.session.list_tools()
+            tools_response = await self._call(lambda session: session.list_tools())
             tools = []
             
             for tool in tools_response.tools:
@@ -288,8 +677,12 @@ class MCPDatabaseClient:
                     description=tool.description,
                     input_schema=tool.inputSchema
                 ))
-            
-            return tools
+                
+            self.cache.put(
+                "tools", "list", tools, len(tools_response.model_dump_json()),
+                ttl=config.mcp_metadata_cache_ttl
+            )
+            return list(tools)
             
         except Exception as e:
             logger.error(f"Error listing tools: {str(e)}")
@@ -302,11 +695,12 @@ class MCPDatabaseClient:
         Returns:
             List of available resources
         """
-        if not self.connected or not self.session:
-            await self.connect()
-        
+        cached = self.cache.get("metadata", "resources/list")
+        if cached is not None:
+            return list(cached)
+            
         try:
-            resources_response = await self.session.list_resources()
+            resources_response = await self._call(lambda session: session.list_resources())
             resources = []
             
             for resource in resources_response.resources:
@@ -316,8 +710,12 @@ class MCPDatabaseClient:
                     uri=str(resource.uri),  # Convert AnyUrl to string
                     mime_type=getattr(resource, 'mimeType', None)
                 ))
-            
-            return resources
+                
+            self.cache.put(
+                "metadata", "resources/list", resources, len(resources_response.model_dump_json()),
+                ttl=config.mcp_metadata_cache_ttl
+            )
+            return list(resources)
             
         except Exception as e:
             logger.error(f"Error listing resources: {str(e)}")
@@ -0,0 +1,521 @@
+"""
+Pool of MCP client sessions.
+
+A single client session funnels every concurrent chat request through one
+stream, and when that stream breaks every request fails with it. The pool
+keeps several initialized sessions open against the MCP server (one server
+process each for stdio, one connection each for HTTP and SSE) and spreads
+requests across them, either to the session with the fewest requests in
+flight or round-robin.
+
+Sessions are pinged in the background when idle and after a request on them
+fails; sessions that do not answer are closed and replaced, and an operation
+that failed because its session died is retried once on another session.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, TypeVar
+
+from mcp import ClientSession
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Upper bound for the delay between attempts to replace a dead session
+MAX_RESPAWN_DELAY = 30.0
+
+# Supported session selection strategies
+STRATEGIES = ("least_outstanding", "round_robin")
+
+
+class MCPPoolError(Exception):
+    """Raised when the pool cannot provide a session."""
+    pass
+
+
+def is_server_error(error: BaseException) -> bool:
+    """
+    Check whether an error is an answer from a responsive server.
+    
+    Args:
+        error: Exception raised by a session call
+        
+    Returns:
+        True for JSON-RPC errors the server sent, False for transport failures
+    """
+    return isinstance(error, McpError) and error.error.code != CONNECTION_CLOSED
+
+
+class PooledSession:
+    """An MCP client session owned by a dedicated task.
+    
+    The transport and session contexts are entered and exited by the same
+    task, as anyio requires, so sessions can be opened and closed from the
+    background without tying them to the request that happened to create them.
+    """
+    
+    def __init__(
+        self,
+        transport: Callable[[], Any],
+        name: str,
+        session_options: Optional[Dict[str, Any]] = None,
+        on_open: Optional[Callable[[ClientSession], Awaitable[None]]] = None
+    ):
+        """
+        Initialize the pooled session.
+        
+        Args:
+            transport: Callable returning an async context manager that yields
+                the transport's read and write streams
+            name: Name used in log messages
+            session_options: Extra keyword arguments for ClientSession, such
+                as a message handler
+            on_open: Coroutine function called with the session after the
+                initialize handshake
+        """
+        self.name = name
+        self.session: Optional[ClientSession] = None
+        self.last_used = 0.0
+        self.suspect = False
+        self.outstanding = 0
+        self.requests = 0
+        self._transport = transport
+        self._session_options = session_options or {}
+        self._on_open = on_open
+        self._ready = asyncio.Event()
+        self._stopped = asyncio.Event()
+        self._close_requested = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._error: Optional[BaseException] = None
+        
+    @property
+    def alive(self) -> bool:
+        """Whether the session is open and its owner task is running."""
+        return self.session is not None and self._task is not None and not self._task.done()
+        
+    async def open(self, timeout: float) -> None:
+        """
+        Start the transport and complete the initialize handshake.
+        
+        Args:
+            timeout: Seconds to wait for the session to become ready
+            
+        Raises:
+            MCPPoolError: If the session could not be opened in time
+        """
+        self._task = asyncio.create_task(self._run(), name=f"mcp-session-{self.name}")
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            await self.close()
+            raise MCPPoolError(f"Session {self.name} did not start within {timeout:.0f}s")
+            
+        if self.session is None:
+            raise MCPPoolError(f"Session {self.name} failed to start: {self._error}")
+        self.last_used = time.monotonic()
+        
+    async def ping(self, timeout: float) -> bool:
+        """
+        Check that the server behind the session still responds.
+        
+        Args:
+            timeout: Seconds to wait for the ping response
+            
+        Returns:
+            True if the server answered in time
+        """
+        if not self.alive:
+            return False
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout)
+        except Exception as e:
+            logger.warning(f"Health check of session {self.name} failed: {e!r}")
+            return False
+        self.suspect = False
+        self.last_used = time.monotonic()
+        return True
+        
+    async def call(self, operation: Callable[[ClientSession], Awaitable[T]]) -> T:
+        """
+        Run an operation on the session.
+        
+        Some transports leave requests in flight waiting forever when the
+        connection drops, so the operation is cancelled if the session stops.
+        
+        Args:
+            operation: Coroutine function taking the session
+            
+        Returns:
+            The operation's result
+            
+        Raises:
+            MCPPoolError: If the session stopped before the operation finished
+        """
+        operation_task = asyncio.ensure_future(operation(self.session))
+        stopped = asyncio.ensure_future(self._stopped.wait())
+        try:
+            await asyncio.wait({operation_task, stopped}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stopped.cancel()
+            if not operation_task.done():
+                operation_task.cancel()
+                
+        if operation_task.done() and not operation_task.cancelled():
+            return operation_task.result()
+        raise MCPPoolError(f"Session {self.name} closed during the request")
+        
+    async def close(self, timeout: float = 5.0) -> None:
+        """
+        Close the session and stop its transport.
+        
+        Args:
+            timeout: Seconds to wait for a clean shutdown before cancelling
+        """
+        self._close_requested.set()
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            self._task.cancel()
+        except Exception:
+            pass
+            
+    async def _run(self) -> None:
+        try:
+            async with AsyncExitStack() as stack:
+                streams = await stack.enter_async_context(self._transport())
+                read, write = streams[0], streams[1]
+                session = await stack.enter_async_context(
+                    ClientSession(read, write, **self._session_options)
+                )
+                await session.initialize()
+                if self._on_open is not None:
+                    await self._on_open(session)
+                    
+                self.session = session
+                self._ready.set()
+                await self._close_requested.wait()
+        except Exception as e:
+            self._error = e
+            logger.debug(f"Session {self.name} stopped: {e!r}")
+        finally:
+            self.session = None
+            self._ready.set()
+            self._stopped.set()
+
+
+class MCPSessionPool:
+    """Pool of initialized MCP client sessions shared by concurrent requests."""
+    
+    def __init__(
+        self,
+        transport: Callable[[], Any],
+        size: int = 4,
+        strategy: str = "least_outstanding",
+        name: str = "mcp",
+        health_check_interval: float = 10.0,
+        health_check_timeout: float = 2.0,
+        start_timeout: float = 30.0,
+        checkout_timeout: float = 30.0,
+        session_options: Optional[Dict[str, Any]] = None,
+        on_open: Optional[Callable[[ClientSession], Awaitable[None]]] = None
+    ):
+        """
+        Initialize the pool.
+        
+        Args:
+            transport: Callable returning an async context manager that yields
+                the transport's read and write streams, called once per session
+            size: Number of sessions kept open
+            strategy: "least_outstanding" or "round_robin"
+            name: Prefix for session names in log messages
+            health_check_interval: Seconds a session may sit idle before it is
+                pinged, 0 to disable background health checks
+            health_check_timeout: Seconds to wait for a health check ping
+            start_timeout: Seconds to wait for a new session to initialize
+            checkout_timeout: Seconds a request waits for a live session
+            session_options: Extra keyword arguments for each ClientSession
+            on_open: Coroutine function called with each new session after
+                the initialize handshake
+                
+        Raises:
+            ValueError: If the strategy is unknown
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown session selection strategy: {strategy}")
+            
+        self.transport = transport
+        self.size = size
+        self.strategy = strategy
+        self.name = name
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.start_timeout = start_timeout
+        self.checkout_timeout = checkout_timeout
+        self.session_options = session_options
+        self.on_open = on_open
+        
+        self._sessions: List[PooledSession] = []
+        self._available = asyncio.Event()
+        self._background: Set[asyncio.Task] = set()
+        self._monitor: Optional[asyncio.Task] = None
+        self._respawning = 0
+        self._closed = False
+        self._counter = 0
+        self._next = 0
+        self._requests = 0
+        self._retried = 0
+        self._failed_checks = 0
+        self._replaced = 0
+        
+    async def start(self) -> None:
+        """
+        Open all sessions concurrently.
+        
+        Raises:
+            MCPPoolError: If no session could be opened
+        """
+        results = await asyncio.gather(
+            *(self._spawn() for _ in range(self.size)), return_exceptions=True
+        )
+        started = [result for result in results if isinstance(result, PooledSession)]
+        failures = [result for result in results if isinstance(result, BaseException)]
+        
+        if not started:
+            raise MCPPoolError(f"Could not open any {self.name} MCP session: {failures[0]}")
+            
+        for _ in failures:
+            self._schedule_respawn()
+        if self.health_check_interval > 0:
+            self._monitor = asyncio.create_task(self._health_check_loop())
+        logger.info(f"Opened {len(started)} of {self.size} {self.name} MCP sessions")
+        
+    async def run(self, operation: Callable[[ClientSession], Awaitable[T]]) -> T:
+        """
+        Run an operation on a pooled session.
+        
+        If the operation fails and the session turns out to be dead, the
+        session is replaced and the operation is retried once on another
+        session. Errors from a healthy session are raised unchanged.
+        
+        Args:
+            operation: Coroutine function taking the session to use
+            
+        Returns:
+            The operation's result
+            
+        Raises:
+            MCPPoolError: If the pool is closed, no session became available
+                or the sessions used both died during the operation
+        """
+        pooled = await self._acquire()
+        try:
+            return await self._use(pooled, operation)
+        except Exception as e:
+            if is_server_error(e) or await self._check(pooled):
+                raise
+            logger.warning(f"Retrying request from dead session {pooled.name}: {e!r}")
+            
+        self._retried += 1
+        pooled = await self._acquire()
+        try:
+            return await self._use(pooled, operation)
+        except Exception as e:
+            if not is_server_error(e):
+                pooled.suspect = True
+                self._in_background(self._check(pooled))
+            raise
+            
+    @property
+    def live_sessions(self) -> int:
+        """Number of open sessions that can take requests."""
+        return sum(1 for pooled in self._sessions if pooled.alive)
+        
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[ClientSession]:
+        """
+        Select a session for the duration of the block.
+        
+        The session is shared with other requests. Failures inside the block
+        trigger a health check of the session but are not retried.
+        
+        Yields:
+            Initialized client session
+            
+        Raises:
+            MCPPoolError: If the pool is closed or no session became available
+        """
+        pooled = await self._acquire()
+        self._begin(pooled)
+        try:
+            yield pooled.session
+        except Exception:
+            pooled.suspect = True
+            self._in_background(self._check(pooled))
+            raise
+        finally:
+            self._end(pooled)
+            
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pool counters.
+        
+        Returns:
+            Dictionary with pool size, load per session and replacement counts
+        """
+        return {
+            "size": self.size,
+            "strategy": self.strategy,
+            "alive": self.live_sessions,
+            "outstanding": sum(pooled.outstanding for pooled in self._sessions),
+            "respawning": self._respawning,
+            "requests": self._requests,
+            "retried": self._retried,
+            "failed_health_checks": self._failed_checks,
+            "replaced": self._replaced,
+            "sessions": [
+                {"name": pooled.name, "outstanding": pooled.outstanding, "requests": pooled.requests}
+                for pooled in self._sessions
+            ]
+        }
+        
+    async def close(self) -> None:
+        """Close all sessions and stop background health checks and replacements."""
+        self._closed = True
+        self._available.set()
+        if self._monitor is not None:
+            self._monitor.cancel()
+        for task in list(self._background):
+            task.cancel()
+        sessions, self._sessions = self._sessions, []
+        await asyncio.gather(*(pooled.close() for pooled in sessions), return_exceptions=True)
+        logger.info(f"Closed {self.name} MCP session pool")
+        
+    async def _acquire(self) -> PooledSession:
+        deadline = time.monotonic() + self.checkout_timeout
+        while True:
+            if self._closed:
+                raise MCPPoolError("Session pool is closed")
+                
+            for pooled in [pooled for pooled in self._sessions if not pooled.alive]:
+                logger.warning(f"{self.name} MCP session {pooled.name} died, replacing it")
+                self._retire(pooled)
+            if self._sessions:
+                return self._select()
+                
+            self._available.clear()
+            remaining = deadline - time.monotonic()
+            try:
+                await asyncio.wait_for(self._available.wait(), max(remaining, 0))
+            except asyncio.TimeoutError:
+                raise MCPPoolError(
+                    f"No MCP session became available within {self.checkout_timeout:.0f}s"
+                )
+                
+    def _select(self) -> PooledSession:
+        start = self._next % len(self._sessions)
+        self._next += 1
+        ordered = self._sessions[start:] + self._sessions[:start]
+        if self.strategy == "round_robin":
+            return ordered[0]
+        # Rotating the starting point spreads ties evenly across sessions
+        return min(ordered, key=lambda pooled: pooled.outstanding)
+        
+    async def _use(self, pooled: PooledSession, operation: Callable[[ClientSession], Awaitable[T]]) -> T:
+        self._begin(pooled)
+        try:
+            return await pooled.call(operation)
+        finally:
+            self._end(pooled)
+            
+    def _begin(self, pooled: PooledSession) -> None:
+        pooled.outstanding += 1
+        pooled.requests += 1
+        self._requests += 1
+        
+    def _end(self, pooled: PooledSession) -> None:
+        pooled.outstanding -= 1
+        pooled.last_used = time.monotonic()
+        
+    async def _check(self, pooled: PooledSession) -> bool:
+        if pooled not in self._sessions:
+            return False
+        if await pooled.ping(self.health_check_timeout):
+            return True
+        if pooled in self._sessions:
+            self._failed_checks += 1
+            logger.warning(f"Replacing unresponsive {self.name} MCP session {pooled.name}")
+            self._retire(pooled)
+        return False
+        
+    async def _health_check_loop(self) -> None:
+        while not self._closed:
+            await asyncio.sleep(self.health_check_interval)
+            now = time.monotonic()
+            due = [
+                pooled for pooled in self._sessions
+                if pooled.suspect or not pooled.alive or (
+                    pooled.outstanding == 0 and now - pooled.last_used >= self.health_check_interval
+                )
+            ]
+            await asyncio.gather(*(self._check(pooled) for pooled in due), return_exceptions=True)
+            
+    def _retire(self, pooled: PooledSession) -> None:
+        if pooled not in self._sessions:
+            return
+        self._sessions.remove(pooled)
+        self._in_background(pooled.close())
+        if not self._closed:
+            self._replaced += 1
+            self._schedule_respawn()
+            
+    async def _spawn(self) -> PooledSession:
+        self._counter += 1
+        pooled = PooledSession(
+            self.transport,
+            name=f"{self.name}-{self._counter}",
+            session_options=self.session_options,
+            on_open=self.on_open
+        )
+        await pooled.open(self.start_timeout)
+        self._sessions.append(pooled)
+        self._available.set()
+        return pooled
+        
+    def _schedule_respawn(self) -> None:
+        self._in_background(self._respawn())
+        
+    def _in_background(self, coro: Any) -> None:
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        
+    async def _respawn(self) -> None:
+        self._respawning += 1
+        try:
+            await self._respawn_until_started()
+        finally:
+            self._respawning -= 1
+            
+    async def _respawn_until_started(self) -> None:
+        delay = 1.0
+        while not self._closed:
+            try:
+                pooled = await self._spawn()
+            except Exception as e:
+                logger.warning(f"Could not open {self.name} MCP session, retrying in {delay:.0f}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RESPAWN_DELAY)
+                continue
+                
+            if self._closed:
+                self._sessions.remove(pooled)
+                await pooled.close()
+            return
@@ -92,6 +92,10 @@ class ChatCompletionResponse(BaseModel):
         default=None,
         description="Token usage information"
     )
+    timings: Optional[Dict[str, float]] = Field(
+        default=None,
+        description="Duration of each processing stage in milliseconds"
+    )
 
 
 class StreamChoice(BaseModel):
@@ -155,6 +159,10 @@ class MCPQueryResult(BaseModel):
         default=None,
         description="Number of rows returned"
     )
+    version: Optional[str] = Field(
+        default=None,
+        description="Database version the result was computed from"
+    )
 
 
 class MCPResource(BaseModel):
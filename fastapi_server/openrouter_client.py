@@ -10,6 +10,7 @@ from openai.types.chat import ChatCompletion, ChatCompletionChunk
 
 from .config import config
 from .models import ChatMessage, ChatCompletionResponse, ChatCompletionStreamResponse, Choice, StreamChoice, Usage
+from .prompt_templates import prompt_templates, render_database_context
 from .retry_utils import RetryConfig, retry_with_backoff, is_retryable_error
 
 logger = logging.getLogger(__name__)
@@ -278,26 +279,10 @@ class OpenRouterClient:
         context_parts = []
         
         if "database_metadata" in mcp_context:
-            metadata = mcp_context["database_metadata"]
-            context_parts.append("Available database information:")
-            context_parts.append(f"Database: {metadata.get('database_path', 'Unknown')}")
-            
-            if "tables" in metadata:
-                context_parts.append("Tables and their structure:")
-                for table_name, table_info in metadata["tables"].items():
-                    context_parts.append(f"- {table_name}:")
-                    if "columns" in table_info:
-                        columns_data = table_info["columns"]
-                        if isinstance(columns_data, dict):
-                            columns = ", ".join(columns_data.keys())
-                        elif isinstance(columns_data, list):
-                            # Ensure all items in the list are strings
-                            columns = ", ".join([str(col) for col in columns_data])
-                        else:
-                            columns = "Unknown"
-                        context_parts.append(f"  Columns: {columns}")
-                    if "row_count" in table_info:
-                        context_parts.append(f"  Rows: {table_info['row_count']}")
+            # Rendered once per metadata version
+            context_parts.append(prompt_templates.get(
+                mcp_context["database_metadata"], "database_context", render_database_context
+            ))
         
         if "query_results" in mcp_context:
             results = mcp_context["query_results"]
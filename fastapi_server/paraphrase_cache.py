@@ -0,0 +1,195 @@
+"""
+Cache of SQL generated for paraphrased questions.
+
+The exact SQL translation cache misses rephrasings such as "how many
+customers do we have" and "count of customers". This cache normalizes a
+question further before looking it up: common phrasings of the same intent
+are mapped onto one canonical word, filler words are dropped and plurals are
+folded, and the remaining content words, in order, together with the numbers
+and quoted values the question mentions form the key. It is an exact-match
+cache on that normalized key, not a similarity search: "western region" and
+"eastern region", or "cancelled orders" and "not cancelled orders", keep
+different keys, because negation, direction and time words count as content.
+
+Entries are scoped to a schema version and model, and the least recently used
+entry is evicted once the cache is full.
+"""
+
+import logging
+import re
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Phrasings of the same intent mapped onto one token
+_CANONICAL = [
+    (re.compile(r'\b(?:how many|number of|count of|total number of)\b'), 'count'),
+    (re.compile(r'\b(?:average|mean)\b'), 'avg'),
+    (re.compile(r'\b(?:total|sum of)\b'), 'sum'),
+    (re.compile(r'\b(?:highest|largest|biggest|most)\b'), 'max'),
+    (re.compile(r'\b(?:lowest|smallest|least|fewest)\b'), 'min'),
+]
+
+# Filler words that never change the SQL. Negations ("not", "no",
+# "without"), directions ("ascending", "before", "from", "to") and deictic
+# time words ("this", "last") are deliberately not listed.
+_STOPWORDS = frozenset(
+    "a an the of in on at for by per with do does did we i you they is are was were be been "
+    "have has had me my our us there here please can could would will what which who show list "
+    "give get find tell display".split()
+)
+
+_NEGATION = re.compile(r"n't\b")
+
+_WORD = re.compile(r"[a-z0-9_]+")
+_LITERAL = re.compile(r"'[^']*'|\"[^\"]*\"|\b\d+(?:\.\d+)?\b")
+
+QuestionKey = Tuple[Tuple[str, ...], Tuple[str, ...]]
+
+
+def content_words(question: str) -> Tuple[str, ...]:
+    """
+    Get the canonical content words of a question, in order.
+    
+    Two questions may share SQL only if their content words are identical.
+    Word order is kept so "orders per customer" and "customers per order"
+    stay apart.
+    
+    Args:
+        question: The user's question
+        
+    Returns:
+        Content words after synonym mapping and stemming
+    """
+    text = _NEGATION.sub(" not", question.lower())
+    for pattern, replacement in _CANONICAL:
+        text = pattern.sub(replacement, text)
+    words = [word for word in _WORD.findall(text) if word not in _STOPWORDS]
+    # Light stemming so singular and plural forms share a key
+    return tuple(word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+                 for word in words)
+
+
+def literals(question: str) -> Tuple[str, ...]:
+    """
+    Get the numbers and quoted values mentioned in a question.
+    
+    Args:
+        question: The user's question
+        
+    Returns:
+        Sorted literal values
+    """
+    return tuple(sorted(_LITERAL.findall(question.lower())))
+
+
+def question_key(question: str) -> QuestionKey:
+    """
+    Get the normalized key under which a question's SQL is cached.
+    
+    Args:
+        question: The user's question
+        
+    Returns:
+        Content words and literal values of the question
+    """
+    return content_words(question), literals(question)
+
+
+class ParaphraseCache:
+    """LRU cache from normalized questions to generated SQL."""
+    
+    def __init__(self, capacity: int = 1000):
+        """
+        Initialize the cache.
+        
+        Args:
+            capacity: Maximum number of cached questions
+        """
+        self.capacity = capacity
+        
+        self._entries: "OrderedDict[Tuple[str, str, QuestionKey], str]" = OrderedDict()
+        self._schema_version: Optional[str] = None
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        
+    def lookup(self, question: str, schema: str, model: str) -> Optional[str]:
+        """
+        Find the SQL of an earlier question with the same normalized key.
+        
+        Args:
+            question: The user's question
+            schema: Current schema version
+            model: Model that would generate the SQL
+            
+        Returns:
+            SQL of a paraphrase of the question, or None
+        """
+        key = (schema, model, question_key(question))
+        sql = self._entries.get(key)
+        if sql is None:
+            self._misses += 1
+            return None
+            
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return sql
+        
+    def add(self, question: str, schema: str, model: str, sql: str) -> None:
+        """
+        Cache the SQL generated for a question.
+        
+        Args:
+            question: The user's question
+            schema: Schema version the SQL was generated for
+            model: Model that generated the SQL
+            sql: Generated SQL that ran successfully
+        """
+        self._observe_schema(schema)
+        key = (schema, model, question_key(question))
+        self._entries[key] = sql
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+            
+    def remove(self, sql: str, schema: str, model: str) -> None:
+        """
+        Drop every entry that maps to the given SQL, for example because it failed.
+        
+        Args:
+            sql: SQL to drop
+            schema: Schema version of the entries
+            model: Model of the entries
+        """
+        stale = [key for key, cached in self._entries.items() if cached == sql and key[:2] == (schema, model)]
+        for key in stale:
+            del self._entries[key]
+            
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+        
+        Returns:
+            Dictionary with size and hit counters
+        """
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "capacity": self.capacity,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+            "evictions": self._evictions,
+            "schema_version": self._schema_version
+        }
+        
+    def _observe_schema(self, schema: str) -> None:
+        """Drop entries for other schema versions once a new one is seen."""
+        if schema == self._schema_version:
+            return
+        self._schema_version = schema
+        for key in [key for key in self._entries if key[0] != schema]:
+            del self._entries[key]
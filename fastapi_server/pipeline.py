@@ -0,0 +1,76 @@
+"""
+Stage timing for the chat completion pipeline.
+
+A chat completion goes through several stages (metadata fetch, SQL
+generation, query execution, tool listing and the final LLM call). Stages
+that do not depend on each other run concurrently, so the request takes as
+long as its critical path. Each stage runs under its own timeout and its
+duration is recorded, so slow stages show up in the response and the logs.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Dict, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class StageTimeoutError(asyncio.TimeoutError):
+    """Raised when a pipeline stage exceeds its timeout."""
+    
+    def __init__(self, stage: str, timeout: float):
+        """
+        Initialize the error.
+        
+        Args:
+            stage: Name of the stage
+            timeout: Timeout the stage exceeded, in seconds
+        """
+        super().__init__(f"Stage {stage} exceeded its timeout of {timeout:.1f}s")
+        self.stage = stage
+        self.timeout = timeout
+
+
+class StageTimer:
+    """Runs pipeline stages under timeouts and records their durations."""
+    
+    def __init__(self):
+        """Initialize the timer; the pipeline's total time starts now."""
+        self.timings: Dict[str, float] = {}
+        self._started = time.perf_counter()
+        
+    async def run(self, stage: str, awaitable: Awaitable[T], timeout: float) -> T:
+        """
+        Run one stage.
+        
+        Args:
+            stage: Name of the stage, used as key in the timings
+            awaitable: Work of the stage
+            timeout: Seconds the stage may take
+            
+        Returns:
+            The stage's result
+            
+        Raises:
+            StageTimeoutError: If the stage did not finish within its timeout
+        """
+        started = time.perf_counter()
+        try:
+            return await asyncio.wait_for(awaitable, timeout)
+        except asyncio.TimeoutError:
+            raise StageTimeoutError(stage, timeout)
+        finally:
+            self.timings[stage] = round((time.perf_counter() - started) * 1000, 2)
+            
+    def finish(self) -> Dict[str, float]:
+        """
+        Record the pipeline's total time.
+        
+        Returns:
+            Stage durations in milliseconds, including "total"
+        """
+        self.timings["total"] = round((time.perf_counter() - self._started) * 1000, 2)
+        return self.timings
@@ -0,0 +1,188 @@
+"""
+Prompt sections rendered once per schema version.
+
+The SQL generation prompt and the MCP context message both describe the
+database schema, and rebuilding that description from the metadata dict on
+every request costs a loop over every table and column. The template cache
+renders each schema section once per metadata version and hands out the
+same string until the version changes; the per-request parts, such as the
+question, query results and tools, are composed around it.
+
+Metadata documents without a version are keyed by a hash of their content,
+computed once per metadata object, since the MCP client returns the same
+cached object until the metadata changes.
+"""
+
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SQL_GENERATION_HEADER = "\n".join([
+    "You are a SQL expert. Generate appropriate SELECT queries for the given database.",
+    "Database information:",
+])
+
+SQL_GENERATION_RULES = "\n".join([
+    "",
+    "Rules:",
+    "- Only generate SELECT statements",
+    "- Use proper SQL syntax",
+    "- Include only the SQL query in your response",
+    "- Do not include explanations or markdown formatting",
+    "- Limit results with LIMIT clause when appropriate"
+])
+
+TOOL_CALLING_HEADER = "\n".join([
+    "You are a data assistant with access to a SQLite database.",
+    "Use the execute_query tool to run SELECT queries when the question needs data, "
+    "then answer from the results. Independent queries can be requested together.",
+    "Database information:",
+])
+
+
+def _column_names(columns_data: Any) -> Optional[list]:
+    """Get the column names of a table entry, or None for an unknown format."""
+    if isinstance(columns_data, dict):
+        return list(columns_data.keys())
+    if isinstance(columns_data, list):
+        # Ensure all items in the list are strings
+        return [str(col) for col in columns_data]
+    return None
+
+
+def render_table_list(metadata: Dict[str, Any]) -> str:
+    """
+    Render every table and its columns for the SQL generation prompt.
+    
+    Args:
+        metadata: Database metadata document from the MCP server
+        
+    Returns:
+        Table listing, empty when the metadata has no tables
+    """
+    if "tables" not in metadata:
+        return ""
+    parts = ["Available tables:"]
+    for table_name, table_info in metadata["tables"].items():
+        parts.append(f"- {table_name}")
+        if "columns" in table_info:
+            parts.append(f"  Columns: {', '.join(_column_names(table_info['columns']) or [])}")
+    return "\n".join(parts)
+
+
+def render_database_context(metadata: Dict[str, Any]) -> str:
+    """
+    Render the database section of the MCP context message.
+    
+    Args:
+        metadata: Database metadata document from the MCP server
+        
+    Returns:
+        Database path, tables, columns and row counts
+    """
+    parts = [
+        "Available database information:",
+        f"Database: {metadata.get('database_path', 'Unknown')}"
+    ]
+    if "tables" in metadata:
+        parts.append("Tables and their structure:")
+        for table_name, table_info in metadata["tables"].items():
+            parts.append(f"- {table_name}:")
+            if "columns" in table_info:
+                columns = _column_names(table_info["columns"])
+                parts.append(f"  Columns: {', '.join(columns) if columns is not None else 'Unknown'}")
+            if "row_count" in table_info:
+                parts.append(f"  Rows: {table_info['row_count']}")
+    return "\n".join(parts)
+
+
+class PromptTemplateCache:
+    """Schema-derived prompt sections cached per metadata version."""
+    
+    def __init__(self, max_versions: int = 4):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_versions: Number of metadata versions to keep sections for
+        """
+        self.max_versions = max_versions
+        
+        self._sections: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._last: Optional[Tuple[Dict[str, Any], str]] = None
+        self._hits = 0
+        self._misses = 0
+        
+    def get(self, metadata: Dict[str, Any], name: str, build: Callable[[Dict[str, Any]], Any]) -> Any:
+        """
+        Get a section for the metadata, building it on first use.
+        
+        Args:
+            metadata: Database metadata document from the MCP server
+            name: Name of the section, unique per build function
+            build: Function rendering the section from the metadata
+            
+        Returns:
+            The section built for this metadata version
+        """
+        version = self.version_key(metadata)
+        sections = self._sections.get(version)
+        if sections is None:
+            sections = self._sections[version] = {}
+            while len(self._sections) > self.max_versions:
+                self._sections.popitem(last=False)
+        self._sections.move_to_end(version)
+        
+        if name in sections:
+            self._hits += 1
+            return sections[name]
+        self._misses += 1
+        section = sections[name] = build(metadata)
+        logger.debug(f"Rendered prompt section {name} for metadata version {version}")
+        return section
+        
+    def version_key(self, metadata: Dict[str, Any]) -> str:
+        """
+        Get the key sections of the metadata are cached under.
+        
+        Args:
+            metadata: Database metadata document from the MCP server
+            
+        Returns:
+            The server's metadata version, or a hash of the document
+        """
+        if self._last is not None and self._last[0] is metadata:
+            return self._last[1]
+        version = metadata.get("version")
+        if not isinstance(version, str):
+            content = json.dumps(metadata, sort_keys=True, default=str)
+            version = "h" + hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+        self._last = (metadata, version)
+        return version
+        
+    def clear(self) -> None:
+        """Drop all cached sections."""
+        self._sections.clear()
+        self._last = None
+        
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+        
+        Returns:
+            Dictionary with cached versions and hit counters
+        """
+        return {
+            "versions": len(self._sections),
+            "sections": sum(len(sections) for sections in self._sections.values()),
+            "hits": self._hits,
+            "misses": self._misses
+        }
+
+
+# Shared by the chat handler and the LLM clients
+prompt_templates = PromptTemplateCache()
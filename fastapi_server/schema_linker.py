@@ -0,0 +1,309 @@
+"""
+Schema linking for the SQL generation prompt.
+
+Listing every table and column in the SQL generation prompt makes the prompt
+grow with the schema. The linker indexes table and column names and their
+descriptions, scores tables against the words of a question, adds the
+tables needed to join the matches together and renders only those under a
+token budget, so the prompt stays roughly the same size as the schema grows.
+"""
+
+import logging
+import math
+import re
+from collections import deque
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset(
+    "a an and the of in on at for to by per with from or is are was were be been do does did we i you "
+    "have has had me my our us there here please can could would will what which who how many much "
+    "show list give get find tell all any some each that this these those it its as than then".split()
+)
+
+# Weights of a match by where the word was found
+NAME_WEIGHT = 3.0
+COLUMN_WEIGHT = 2.0
+DESCRIPTION_WEIGHT = 1.0
+
+# Tables scoring below this fraction of the best match are only shown when
+# they are needed to join the matches
+RELATIVE_CUTOFF = 0.3
+
+# Most matched tables considered; more would not fit a prompt budget anyway
+# and the join path search grows with their square
+MAX_LINKED_TABLES = 25
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase words, also splitting identifiers on underscores.
+    
+    Args:
+        text: Question, identifier or description
+        
+    Returns:
+        Words other than stopwords, with a trailing plural "s" removed
+    """
+    return [
+        word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+        for word in _WORD.findall(text.lower()) if word not in _STOPWORDS
+    ]
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the LLM token count of text, at roughly four characters per token."""
+    return len(text) // 4 + 1
+
+
+class Column(NamedTuple):
+    """A column as shown in the prompt."""
+    
+    name: str
+    type: Optional[str]
+    primary_key: bool
+    description: Optional[str]
+
+
+class Join(NamedTuple):
+    """A join condition between two tables."""
+    
+    from_table: str
+    from_column: str
+    to_table: str
+    to_column: str
+    
+    def render(self) -> str:
+        """Render the join as a SQL condition."""
+        return f"{self.from_table}.{self.from_column} = {self.to_table}.{self.to_column}"
+
+
+class SchemaLinker:
+    """Inverted index over a database schema for selecting prompt content."""
+    
+    def __init__(self, metadata: Dict[str, Any]):
+        """
+        Index the tables, columns and relationships of the metadata.
+        
+        Args:
+            metadata: Database metadata document from the MCP server
+        """
+        self.metadata = metadata
+        self.tables: Dict[str, List[Column]] = {}
+        self.descriptions: Dict[str, Optional[str]] = {}
+        self.joins: List[Join] = []
+        
+        # word -> [(table, column or None, weight)]
+        self._index: Dict[str, List[Tuple[str, Optional[str], float]]] = {}
+        
+        tables = metadata.get("tables") if isinstance(metadata.get("tables"), dict) else {}
+        for table_name, table_info in tables.items():
+            info = table_info if isinstance(table_info, dict) else {}
+            self.tables[table_name] = self._read_columns(info.get("columns"))
+            self.descriptions[table_name] = info.get("description")
+            self._index_table(table_name)
+            
+        self.joins = self._read_joins(metadata.get("relationships"))
+        self._neighbours: Dict[str, List[Tuple[str, Join]]] = {name: [] for name in self.tables}
+        for join in self.joins:
+            self._neighbours[join.from_table].append((join.to_table, join))
+            self._neighbours[join.to_table].append((join.from_table, join))
+            
+        # Words found in many tables say little about which table is meant
+        document_frequency: Dict[str, int] = {
+            word: len({table for table, _, _ in postings}) for word, postings in self._index.items()
+        }
+        self._idf = {
+            word: math.log(1 + len(self.tables) / count) for word, count in document_frequency.items()
+        }
+        
+    def link(self, question: str, token_budget: int) -> str:
+        """
+        Render the part of the schema relevant to a question.
+        
+        Args:
+            question: The user's question
+            token_budget: Approximate token limit for the rendered schema
+            
+        Returns:
+            Prompt text listing the selected tables, columns and joins
+        """
+        table_scores, column_hits = self._score(question)
+        ranked = sorted(table_scores, key=lambda table: -table_scores[table])
+        if ranked:
+            cutoff = table_scores[ranked[0]] * RELATIVE_CUTOFF
+            ranked = [table for table in ranked if table_scores[table] >= cutoff][:MAX_LINKED_TABLES]
+        else:
+            # Nothing matched; show as much of the schema as fits
+            ranked = list(self.tables)[:MAX_LINKED_TABLES]
+            
+        selected, joins = self._connect(ranked)
+        order = ranked + [table for table in selected if table not in ranked]
+        return self._render([table for table in order if table in selected], joins, column_hits, token_budget)
+        
+    def _read_columns(self, columns: Any) -> List[Column]:
+        """Normalize the column formats found in metadata documents."""
+        if isinstance(columns, dict):
+            return [
+                Column(
+                    name,
+                    info.get("type") if isinstance(info, dict) else str(info),
+                    bool(info.get("primary_key")) if isinstance(info, dict) else False,
+                    info.get("description") if isinstance(info, dict) else None
+                )
+                for name, info in columns.items()
+            ]
+        if isinstance(columns, list):
+            return [
+                Column(column.get("name", ""), column.get("type"), bool(column.get("primary_key")),
+                       column.get("description"))
+                if isinstance(column, dict) else Column(str(column), None, False, None)
+                for column in columns
+            ]
+        return []
+        
+    def _index_table(self, table_name: str) -> None:
+        """Add a table's names and descriptions to the inverted index."""
+        def add(text: Optional[str], column: Optional[str], weight: float) -> None:
+            for word in set(tokenize(text or "")):
+                self._index.setdefault(word, []).append((table_name, column, weight))
+                
+        add(table_name, None, NAME_WEIGHT)
+        add(self.descriptions[table_name], None, DESCRIPTION_WEIGHT)
+        for column in self.tables[table_name]:
+            add(column.name, column.name, COLUMN_WEIGHT)
+            add(column.description, column.name, DESCRIPTION_WEIGHT)
+            
+    def _read_joins(self, relationships: Any) -> List[Join]:
+        """Read declared relationships, or infer them from ``<table>_id`` columns."""
+        joins = []
+        if isinstance(relationships, list):
+            for relationship in relationships:
+                if not isinstance(relationship, dict):
+                    continue
+                join = Join(
+                    relationship.get("from_table"), relationship.get("from_column"),
+                    relationship.get("to_table"), relationship.get("to_column")
+                )
+                if join.from_table in self.tables and join.to_table in self.tables:
+                    joins.append(join)
+        if joins:
+            return joins
+            
+        primary_keys = {
+            column.name: table for table, columns in self.tables.items() for column in columns if column.primary_key
+        }
+        for table, columns in self.tables.items():
+            for column in columns:
+                target = primary_keys.get(column.name)
+                if target and target != table and column.name.endswith("_id"):
+                    joins.append(Join(table, column.name, target, column.name))
+        return joins
+        
+    def _score(self, question: str) -> Tuple[Dict[str, float], Dict[str, Set[str]]]:
+        """Score tables by the question's words and collect the matched columns."""
+        table_scores: Dict[str, float] = {}
+        column_hits: Dict[str, Set[str]] = {}
+        for word in set(tokenize(question)):
+            for table, column, weight in self._index.get(word, ()):
+                table_scores[table] = table_scores.get(table, 0.0) + weight * self._idf[word]
+                if column is not None:
+                    column_hits.setdefault(table, set()).add(column)
+        return table_scores, column_hits
+        
+    def _connect(self, ranked: List[str]) -> Tuple[Set[str], List[Join]]:
+        """Add the tables on the shortest join paths from the best match to the others."""
+        selected = set(ranked[:1])
+        joins: List[Join] = []
+        for table in ranked[1:]:
+            if table in selected:
+                continue
+            path = self._path(selected, table)
+            if path is None:
+                selected.add(table)
+                continue
+            for step_table, join in path:
+                selected.add(step_table)
+                if join not in joins:
+                    joins.append(join)
+        return selected, joins
+        
+    def _path(self, sources: Set[str], target: str) -> Optional[List[Tuple[str, Join]]]:
+        """Breadth-first search for the shortest join path from any source to the target."""
+        previous: Dict[str, Optional[Tuple[str, Join]]] = {source: None for source in sources}
+        queue = deque(sources)
+        while queue:
+            table = queue.popleft()
+            if table == target:
+                path = []
+                while previous[table] is not None:
+                    parent, join = previous[table]
+                    path.append((table, join))
+                    table = parent
+                return list(reversed(path))
+            for neighbour, join in self._neighbours.get(table, ()):
+                if neighbour not in previous:
+                    previous[neighbour] = (table, join)
+                    queue.append(neighbour)
+        return None
+        
+    def _render(
+        self,
+        tables: List[str],
+        joins: List[Join],
+        column_hits: Dict[str, Set[str]],
+        token_budget: int
+    ) -> str:
+        """Render tables in priority order until the token budget is used up."""
+        join_columns = {(join.from_table, join.from_column) for join in joins}
+        join_columns |= {(join.to_table, join.to_column) for join in joins}
+        join_lines = [f"- {join.render()}" for join in joins]
+        used = estimate_tokens("\n".join(["Available tables:", "Joins:", *join_lines]))
+        
+        lines = ["Available tables:"]
+        rendered: Set[str] = set()
+        omitted = 0
+        for table in tables:
+            columns = self.tables[table]
+            # Keys and matched columns first, then the rest while the budget allows
+            essential = [
+                column for column in columns
+                if column.primary_key or (table, column.name) in join_columns
+                or column.name in column_hits.get(table, ())
+            ]
+            header = f"- {table}" + (f": {self.descriptions[table]}" if self.descriptions.get(table) else "")
+            block = [header, "  Columns: " + ", ".join(self._render_column(column) for column in essential)]
+            cost = estimate_tokens("\n".join(block))
+            if used + cost > token_budget and len(lines) > 1:
+                omitted += 1
+                continue
+            used += cost
+            
+            for column in columns:
+                if column in essential:
+                    continue
+                text = ", " + self._render_column(column)
+                if used + estimate_tokens(text) > token_budget:
+                    break
+                block[1] += text
+                used += estimate_tokens(text)
+            lines.extend(block)
+            rendered.add(table)
+            
+        if omitted:
+            logger.debug(f"Schema linking left out {omitted} tables to stay within {token_budget} tokens")
+        join_lines = [
+            f"- {join.render()}" for join in joins if join.from_table in rendered and join.to_table in rendered
+        ]
+        if join_lines:
+            lines.append("Joins:")
+            lines.extend(join_lines)
+        return "\n".join(lines)
+        
+    @staticmethod
+    def _render_column(column: Column) -> str:
+        details = [detail for detail in (column.type, "primary key" if column.primary_key else None) if detail]
+        return f"{column.name} ({', '.join(details)})" if details else column.name
@@ -0,0 +1,255 @@
+"""
+Cache of SQL generated for natural-language questions.
+
+Generating SQL is a full LLM round trip, yet many questions are asked over
+and over. Translations are cached by normalized question, schema version and
+model, in an LRU kept in memory and written through to a SQLite file so the
+cache survives restarts. A translation is only cached once its query ran
+successfully, and entries for an older schema are dropped as soon as a
+newer schema version is seen. Cache hits only update the in-memory LRU; their
+last-used times are written to the file with the next put and on close.
+"""
+
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_TRAILING_PUNCTUATION = re.compile(r'[\s?.!]+$')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    question TEXT NOT NULL,
+    schema_version TEXT NOT NULL,
+    model TEXT NOT NULL,
+    sql TEXT NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (question, schema_version, model)
+)
+"""
+
+_KEY = "question = ? AND schema_version = ? AND model = ?"
+
+
+def normalize_question(question: str) -> str:
+    """
+    Normalize a question so trivially different phrasings share an entry.
+    
+    Args:
+        question: The user's question
+        
+    Returns:
+        Lowercased question with collapsed whitespace and no trailing punctuation
+    """
+    return _TRAILING_PUNCTUATION.sub('', ' '.join(question.lower().split()))
+
+
+def schema_version(metadata: Dict[str, Any], schema_text: str) -> str:
+    """
+    Get the version of the schema a SQL translation depends on.
+    
+    The server's metadata version combines the schema version (``s``), the
+    data fingerprint (``d``), the metadata file (``m``) and column statistics
+    (``t``). Only the schema and metadata file parts change what the LLM is
+    shown, so data changes keep cached translations valid.
+    
+    Args:
+        metadata: Database metadata document from the MCP server
+        schema_text: Text describing the schema, hashed when the metadata has no version
+        
+    Returns:
+        Schema version string
+    """
+    version = metadata.get("version")
+    if isinstance(version, str):
+        parts = [part for part in version.split("-") if part[:1] in ("s", "m")]
+        if parts:
+            return "-".join(parts)
+    return "p" + hashlib.sha256(schema_text.encode("utf-8")).hexdigest()[:16]
+
+
+class SQLTranslationCache:
+    """LRU cache of generated SQL, persisted in SQLite."""
+    
+    def __init__(self, path: Optional[str] = None, max_entries: int = 10000):
+        """
+        Initialize the cache.
+        
+        Args:
+            path: Path of the SQLite file, or None to keep the cache in memory only
+            max_entries: Maximum number of cached translations
+        """
+        self.path = Path(path) if path else None
+        self.max_entries = max_entries
+        
+        self._entries: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+        self._used: Dict[Tuple[str, str, str], float] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._schema_version: Optional[str] = None
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        
+    def get(self, question: str, schema: str, model: str) -> Optional[str]:
+        """
+        Look up the SQL for a question.
+        
+        Args:
+            question: The user's question
+            schema: Current schema version
+            model: Model that would generate the SQL
+            
+        Returns:
+            Cached SQL, or None on a miss
+        """
+        key = (normalize_question(question), schema, model)
+        with self._lock:
+            self._load()
+            sql = self._entries.get(key)
+            if sql is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            self._used[key] = time.time()
+            return sql
+            
+    def put(self, question: str, schema: str, model: str, sql: str) -> None:
+        """
+        Cache the SQL generated for a question.
+        
+        Args:
+            question: The user's question
+            schema: Schema version the SQL was generated for
+            model: Model that generated the SQL
+            sql: Generated SQL that ran successfully
+        """
+        key = (normalize_question(question), schema, model)
+        with self._lock:
+            self._load()
+            self._observe_schema(schema)
+            self._write_used()
+            self._used.pop(key, None)
+            self._entries[key] = sql
+            self._entries.move_to_end(key)
+            self._execute("INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)", (*key, sql, time.time()))
+            while len(self._entries) > self.max_entries:
+                oldest, _ = self._entries.popitem(last=False)
+                self._used.pop(oldest, None)
+                self._evictions += 1
+                self._execute(f"DELETE FROM translations WHERE {_KEY}", oldest)
+                
+    def discard(self, question: str, schema: str, model: str) -> None:
+        """
+        Drop a cached translation, for example because its query failed.
+        
+        Args:
+            question: The user's question
+            schema: Schema version of the entry
+            model: Model of the entry
+        """
+        key = (normalize_question(question), schema, model)
+        with self._lock:
+            self._load()
+            self._used.pop(key, None)
+            if self._entries.pop(key, None) is not None:
+                self._execute(f"DELETE FROM translations WHERE {_KEY}", key)
+                
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+        
+        Returns:
+            Dictionary with size and hit counters
+        """
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+            "evictions": self._evictions,
+            "schema_version": self._schema_version,
+            "path": str(self.path) if self.path else None
+        }
+        
+    def close(self) -> None:
+        """Write pending last-used times and close the SQLite file."""
+        with self._lock:
+            self._write_used()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._loaded = False
+            
+    def _load(self) -> None:
+        """Open the SQLite file and load the most recently used entries, once."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.path is None:
+            return
+            
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(_SCHEMA)
+            rows = self._conn.execute(
+                "SELECT question, schema_version, model, sql FROM translations ORDER BY last_used DESC LIMIT ?",
+                (self.max_entries,)
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not open SQL cache {self.path}, caching in memory only: {e}")
+            self._conn = None
+            return
+            
+        for question, schema, model, sql in reversed(rows):
+            self._entries[(question, schema, model)] = sql
+        logger.info(f"Loaded {len(rows)} cached SQL translations from {self.path}")
+        
+    def _observe_schema(self, schema: str) -> None:
+        """Drop translations for other schema versions once a new one is seen."""
+        if schema == self._schema_version:
+            return
+        self._schema_version = schema
+        stale = [key for key in self._entries if key[1] != schema]
+        for key in stale:
+            del self._entries[key]
+            self._used.pop(key, None)
+        if stale:
+            logger.info(f"Schema version changed to {schema}, dropped {len(stale)} cached SQL translations")
+        self._execute("DELETE FROM translations WHERE schema_version != ?", (schema,))
+        
+    def _write_used(self) -> None:
+        """Write the last-used times of the hits since the previous write."""
+        used, self._used = self._used, {}
+        if used:
+            self._execute(
+                f"UPDATE translations SET last_used = ? WHERE {_KEY}",
+                [(last_used, *key) for key, last_used in used.items()],
+                many=True
+            )
+            
+    def _execute(self, statement: str, parameters: Any, many: bool = False) -> None:
+        """Run a write against the SQLite file, if one is open."""
+        if self._conn is None:
+            return
+        try:
+            if many:
+                self._conn.executemany(statement, parameters)
+            else:
+                self._conn.execute(statement, parameters)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not update SQL cache {self.path}: {e}")
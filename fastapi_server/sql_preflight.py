@@ -0,0 +1,378 @@
+"""
+Local pre-flight check and repair of generated SQL.
+
+SQL written by the LLM is often almost right: wrapped in prose or code
+fences, a misspelled column or table, or an aggregate without its GROUP BY.
+Sending it to the MCP server only to get an error back costs a full round
+trip. The pre-flight stage compiles the query with SQLite against an empty
+in-memory copy of the schema from the cached metadata, which reports syntax
+errors and unknown identifiers exactly as the server would, and applies
+deterministic repairs until the query compiles:
+
+- prose around the statement and trailing prose after it are dropped
+- unknown tables are replaced by the schema table they differ from only in
+  separators, case, plural form or a one-character typo; unknown columns likewise,
+  but only by columns of the tables the query reads from. Anything less
+  certain, such as ``customer`` for ``customer_id``, is rejected so the
+  model is asked again rather than the query silently changing meaning
+- a GROUP BY is added for plain columns selected next to COUNT, SUM, AVG,
+  TOTAL or GROUP_CONCAT
+- a LIMIT is added when the query has none
+
+Queries that still do not compile are rejected without a round trip.
+"""
+
+import logging
+import re
+import sqlite3
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Most repair attempts per query, each fixing one reported error
+MAX_REPAIRS = 5
+
+# Shortest identifier, ignoring separators, for which a one-character typo
+# (a wrong, missing, extra or swapped character) is repaired
+MIN_TYPO_LENGTH = 5
+
+_FENCED = re.compile(r"```(?:sql|sqlite)?\s*\n(.*?)```", re.IGNORECASE | re.DOTALL)
+_UNKNOWN_COLUMN = re.compile(r"no such column: (?:(\w+)\.)?(\w+)")
+_UNKNOWN_TABLE = re.compile(r"no such table: (?:main\.)?(\w+)")
+_STRING_LITERAL = re.compile(r"('(?:[^']|'')*')")
+_TRAILING_COMMENTS = re.compile(r"(?:\s*(?:--[^\n]*|/\*.*?\*/))+\s*$", re.DOTALL)
+_TABLE_REF = re.compile(r'(?:\bfrom|\bjoin|,)\s+("[^"]+"|\w+)', re.IGNORECASE)
+_SEPARATORS = re.compile(r"[\s_-]+")
+_AGGREGATE = re.compile(r"\b(count|sum|avg|total|group_concat|min|max)\s*\(", re.IGNORECASE)
+# A lone MIN or MAX next to plain columns is SQLite's way of selecting the row
+# holding the extreme value, so only these make a missing GROUP BY a mistake
+_GROUPING_AGGREGATE = re.compile(r"\b(count|sum|avg|total|group_concat)\s*\(", re.IGNORECASE)
+_COLUMN_REF = re.compile(
+    r'^\s*((?:[A-Za-z_]\w*\.)?(?:[A-Za-z_]\w*|"[^"]+"))(?:\s+(?:as\s+)?[A-Za-z_]\w*)?\s*$', re.IGNORECASE
+)
+_PROSE = re.compile(r"^[A-Za-z][\w\s,.:;!?'-]*$")
+_SQL_KEYWORDS = frozenset(
+    "and or not where group order by having limit offset join inner left right cross on as from "
+    "select union except intersect asc desc case when then else end in is like between null".split()
+)
+
+
+class PreflightResult(NamedTuple):
+    """Outcome of a pre-flight check."""
+    
+    sql: Optional[str]
+    repairs: List[str]
+    error: Optional[str]
+    
+    @property
+    def ok(self) -> bool:
+        """Whether the query can be sent to the server."""
+        return self.sql is not None
+
+
+def extract_statement(text: str) -> Optional[str]:
+    """
+    Extract the SELECT statement from an LLM response.
+    
+    Args:
+        text: Response that contains a SQL query, possibly with prose or code fences
+        
+    Returns:
+        The statement without a trailing semicolon, or None if there is no SELECT
+    """
+    fenced = _FENCED.search(text)
+    if fenced:
+        text = fenced.group(1)
+    text = text.strip().strip("`").strip()
+    
+    # Prefer a SELECT written as a keyword over the word "select" in prose
+    start = re.search(r"\bSELECT\b", text) or re.search(r"(?im)^\s*select\b", text)
+    if start is None:
+        if not re.match(r"select\b", text, re.IGNORECASE):
+            return None
+        start_index = 0
+    else:
+        start_index = start.start()
+    statement = text[start_index:]
+    
+    semicolon = _mask(statement).find(";")
+    if semicolon != -1:
+        statement = statement[:semicolon]
+    return statement.strip() or None
+
+
+def _mask(sql: str) -> str:
+    """Blank out string literals and everything inside parentheses, keeping offsets."""
+    masked = []
+    depth = 0
+    quote: Optional[str] = None
+    for char in sql:
+        if quote:
+            masked.append(char if char == quote else " ")
+            if char == quote:
+                quote = None
+        elif char in ("'", '"'):
+            quote = char
+            masked.append(char)
+        elif char == "(":
+            depth += 1
+            masked.append(char if depth == 1 else " ")
+        elif char == ")":
+            masked.append(char if depth == 1 else " ")
+            depth = max(depth - 1, 0)
+        else:
+            masked.append(char if depth == 0 else " ")
+    return "".join(masked)
+
+
+def _replace_outside_strings(sql: str, pattern: str, replacement: str) -> str:
+    """Replace a pattern everywhere except inside string literals."""
+    parts = _STRING_LITERAL.split(sql)
+    return "".join(
+        part if index % 2 else re.sub(pattern, replacement, part, flags=re.IGNORECASE)
+        for index, part in enumerate(parts)
+    )
+
+
+def _is_typo(first: str, second: str) -> bool:
+    """Whether two strings differ by one wrong, missing, extra or swapped character."""
+    if first == second or abs(len(first) - len(second)) > 1:
+        return False
+    if len(first) > len(second):
+        first, second = second, first
+    prefix = 0
+    while prefix < len(first) and first[prefix] == second[prefix]:
+        prefix += 1
+    if len(first) < len(second):
+        return first[prefix:] == second[prefix + 1:]
+    if first[prefix + 1:] == second[prefix + 1:]:
+        return True
+    return first[prefix:prefix + 2] == second[prefix:prefix + 2][::-1] and first[prefix + 2:] == second[prefix + 2:]
+
+
+class SQLPreflight:
+    """Compiles and repairs SQL against an in-memory copy of the schema."""
+    
+    def __init__(self, metadata: Dict[str, Any], row_limit: int = 1000):
+        """
+        Create the empty schema from the metadata.
+        
+        Args:
+            metadata: Database metadata document from the MCP server
+            row_limit: LIMIT added to queries that have none
+        """
+        self.row_limit = row_limit
+        self.columns: Dict[str, List[str]] = {}
+        
+        # Without columns for every table, unknown identifiers cannot be told apart from gaps in the metadata
+        self.complete = True
+        self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        tables = metadata.get("tables") if isinstance(metadata.get("tables"), dict) else {}
+        for table_name, table_info in tables.items():
+            columns = self._read_columns(table_info.get("columns") if isinstance(table_info, dict) else None)
+            if not columns:
+                self.complete = False
+                continue
+            definition = ", ".join(f"{self._quote(name)} {column_type or ''}".strip() for name, column_type in columns)
+            try:
+                self._conn.execute(f"CREATE TABLE {self._quote(table_name)} ({definition})")
+                self.columns[table_name] = [name for name, _ in columns]
+            except sqlite3.Error as e:
+                logger.debug(f"Could not mirror table {table_name} for SQL pre-flight: {e}")
+                self.complete = False
+        if not tables:
+            self.complete = False
+            
+    def check(self, text: str) -> PreflightResult:
+        """
+        Check a query and repair what can be repaired.
+        
+        Args:
+            text: SQL query or LLM response containing one
+            
+        Returns:
+            The query to run with the repairs applied, or the error that made it unusable
+        """
+        sql = extract_statement(text)
+        if sql is None:
+            return PreflightResult(None, [], "No SELECT statement found")
+        repairs = []
+        if sql != text.strip().rstrip(";").strip():
+            repairs.append("extracted statement")
+            
+        for _ in range(MAX_REPAIRS):
+            error = self._compile(sql)
+            if error is None:
+                break
+            repaired = self._repair(sql, error)
+            if repaired is None:
+                if self._is_unverifiable(error):
+                    # The server may know what the metadata does not
+                    logger.debug(f"SQL pre-flight could not verify the query: {error}")
+                    return PreflightResult(self._add_limit(sql, repairs), repairs, None)
+                return PreflightResult(None, repairs, error)
+            sql, repair = repaired
+            repairs.append(repair)
+        else:
+            error = self._compile(sql)
+            if error is not None:
+                return PreflightResult(None, repairs, error)
+                
+        grouped = self._add_group_by(sql)
+        if grouped is not None and self._compile(grouped) is None:
+            sql = grouped
+            repairs.append("added GROUP BY")
+            
+        return PreflightResult(self._add_limit(sql, repairs), repairs, None)
+        
+    def close(self) -> None:
+        """Close the in-memory database."""
+        self._conn.close()
+        
+    def _compile(self, sql: str) -> Optional[str]:
+        """Compile a query without running it, returning SQLite's error message if it fails."""
+        if not re.match(r"\s*select\b", sql, re.IGNORECASE):
+            return "Only SELECT queries are allowed"
+        try:
+            self._conn.execute(f"EXPLAIN {sql}")
+            return None
+        except sqlite3.Error as e:
+            return str(e)
+            
+    def _repair(self, sql: str, error: str) -> Optional[Tuple[str, str]]:
+        """Fix the reported error, returning the new query and a description of the repair."""
+        column = _UNKNOWN_COLUMN.search(error)
+        if column and self.complete:
+            qualifier, name = column.groups()
+            match = self._closest(name, self._referenced_columns(sql))
+            if match:
+                prefix = rf"{re.escape(qualifier)}\." if qualifier else r"(?<![\w.])"
+                replacement = f"{qualifier}.{match}" if qualifier else match
+                return (
+                    _replace_outside_strings(sql, rf"{prefix}{re.escape(name)}(?!\w)", replacement),
+                    f"column {name} -> {match}"
+                )
+                
+        table = _UNKNOWN_TABLE.search(error)
+        if table and self.complete:
+            name = table.group(1)
+            match = self._closest(name, list(self.columns))
+            if match:
+                return (
+                    _replace_outside_strings(sql, rf"(?<![\w.]){re.escape(name)}(?!\w)", match),
+                    f"table {name} -> {match}"
+                )
+                
+        if "syntax error" in error or "incomplete input" in error:
+            trimmed = self._trim_trailing_prose(sql)
+            if trimmed:
+                return trimmed, "removed trailing prose"
+        return None
+        
+    def _add_limit(self, sql: str, repairs: List[str]) -> str:
+        """Append the row limit if the query has no LIMIT, after dropping trailing comments."""
+        without_strings = _STRING_LITERAL.sub(lambda literal: "'" + " " * (len(literal.group(1)) - 2) + "'", sql)
+        comments = _TRAILING_COMMENTS.search(without_strings)
+        statement = sql[:comments.start()] if comments else sql
+        if re.search(r"\blimit\b", _mask(statement), re.IGNORECASE):
+            return sql
+        repairs.append("added LIMIT")
+        return f"{statement} LIMIT {self.row_limit}"
+        
+    def _referenced_columns(self, sql: str) -> List[str]:
+        """Get the columns of the schema tables named after FROM, JOIN or a comma."""
+        tables = {table.lower(): table for table in self.columns}
+        without_strings = _STRING_LITERAL.sub("''", sql)
+        referenced = {
+            tables[name.strip('"').lower()] for name in _TABLE_REF.findall(without_strings)
+            if name.strip('"').lower() in tables
+        }
+        return [column for table in sorted(referenced) for column in self.columns[table]]
+        
+    def _is_unverifiable(self, error: str) -> bool:
+        """Whether an error may come from the local copy rather than the query."""
+        if error.startswith("no such function"):
+            return True
+        return not self.complete and ("no such column" in error or "no such table" in error)
+        
+    def _trim_trailing_prose(self, sql: str) -> Optional[str]:
+        """Cut off prose after the statement, preferring line breaks and the longest prefix."""
+        lines = [match.start() for match in re.finditer(r"\s*\n\s*", sql)]
+        words = [match.start() for match in re.finditer(r"\s+", sql)]
+        for cut in list(reversed(lines)) + list(reversed(words)):
+            suffix = sql[cut:].strip()
+            first_word = suffix.split()[0].lower()
+            if not _PROSE.match(suffix) or first_word in _SQL_KEYWORDS:
+                continue
+            prefix = sql[:cut].rstrip().rstrip(";.").rstrip()
+            if self._compile(prefix) is None:
+                return prefix
+        return None
+        
+    def _add_group_by(self, sql: str) -> Optional[str]:
+        """Group by the plain columns selected next to aggregates, if the query has no GROUP BY."""
+        masked = _mask(sql)
+        if re.search(r"\b(group\s+by|union|intersect|except|over|distinct)\b", masked, re.IGNORECASE):
+            return None
+        select_list = re.match(r"\s*select\s+(.*?)\s+from\s", masked, re.IGNORECASE | re.DOTALL)
+        if not select_list:
+            return None
+            
+        # Aggregates are only looked for outside parentheses, so one inside a
+        # scalar subquery does not turn the outer query into a grouping
+        items, masked_items, start = [], [], select_list.start(1)
+        for part in re.finditer(r"[^,]+", masked[start:select_list.end(1)]):
+            items.append(sql[start + part.start():start + part.end()])
+            masked_items.append(part.group(0))
+        plain = [item for item, masked_item in zip(items, masked_items) if not _AGGREGATE.search(masked_item)]
+        if not plain or not any(_GROUPING_AGGREGATE.search(masked_item) for masked_item in masked_items):
+            return None
+        columns = [_COLUMN_REF.match(item) for item in plain]
+        if not all(columns):
+            return None
+            
+        group_by = "GROUP BY " + ", ".join(column.group(1) for column in columns)
+        tail = re.search(r"\b(having|order\s+by|limit|window)\b", masked, re.IGNORECASE)
+        if tail:
+            return f"{sql[:tail.start()].rstrip()} {group_by} {sql[tail.start():]}"
+        return f"{sql.rstrip()} {group_by}"
+        
+    @staticmethod
+    def _closest(name: str, candidates: List[str]) -> Optional[str]:
+        """Find the one candidate that is unmistakably the identifier that was meant."""
+        def normalize(identifier: str) -> str:
+            identifier = _SEPARATORS.sub("", identifier.lower())
+            return identifier[:-1] if identifier.endswith("s") else identifier
+            
+        by_normalized: Dict[str, List[str]] = {}
+        for candidate in dict.fromkeys(candidates):
+            by_normalized.setdefault(normalize(candidate), []).append(candidate)
+            
+        wanted = normalize(name)
+        exact = by_normalized.get(wanted, [])
+        if exact:
+            return exact[0] if len(exact) == 1 else None
+            
+        if len(wanted) < MIN_TYPO_LENGTH:
+            return None
+        close = [normalized for normalized in by_normalized if _is_typo(wanted, normalized)]
+        if len(close) != 1 or len(by_normalized[close[0]]) != 1:
+            return None
+        return by_normalized[close[0]][0]
+        
+    @staticmethod
+    def _read_columns(columns: Any) -> List[Tuple[str, Optional[str]]]:
+        """Read column names and types from the metadata column formats."""
+        if isinstance(columns, dict):
+            return [(name, info if isinstance(info, str) else None) for name, info in columns.items()]
+        if isinstance(columns, list):
+            return [
+                (column["name"], column.get("type")) if isinstance(column, dict) and column.get("name")
+                else (str(column), None)
+                for column in columns
+            ]
+        return []
+        
+    @staticmethod
+    def _quote(identifier: str) -> str:
+        return '"' + identifier.replace('"', '""') + '"'
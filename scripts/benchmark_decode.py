@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Benchmark decoding of large execute_query results in the FastAPI client.
+
+Builds the JSON-RPC response the MCP server sends for a result with many
+rows, then times the client's work on it: the old path (SDK output schema
+validation, json.loads of the text content and a validated MCPQueryResult)
+against the current one (structured content used as is and an unvalidated
+MCPQueryResult). Decoding the JSON-RPC message itself is common to both and
+reported separately.
+
+Usage:
+    python scripts/benchmark_decode.py --rows 10000 --repeat 20
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from jsonschema import validate  # noqa: E402
+from mcp import types  # noqa: E402
+
+from fastapi_server import json_codec  # noqa: E402
+from fastapi_server.mcp_client import decode_query_result  # noqa: E402
+from fastapi_server.models import MCPQueryResult  # noqa: E402
+from talk_2_tables_mcp.server import QueryResult  # noqa: E402
+
+
+def build_message(rows: int) -> str:
+    """Build the JSON-RPC response line for a result with the given row count."""
+    result = QueryResult(
+        columns=["id", "customer", "region", "amount", "created_at"],
+        rows=[
+            {
+                "id": i,
+                "customer": f"customer-{i % 977}",
+                "region": ("north", "south", "east", "west")[i % 4],
+                "amount": round((i * 7919) % 100000 / 100, 2),
+                "created_at": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}"
+            }
+            for i in range(rows)
+        ],
+        row_count=rows,
+        query="SELECT * FROM orders",
+        version="s1-g1"
+    )
+    structured = result.model_dump()
+    tool_result = types.CallToolResult(
+        content=[types.TextContent(type="text", text=json.dumps(structured, indent=2))],
+        structuredContent=structured
+    )
+    return types.JSONRPCMessage(
+        types.JSONRPCResponse(jsonrpc="2.0", id=1, result=tool_result.model_dump(by_alias=True, exclude_none=True))
+    ).model_dump_json(by_alias=True, exclude_none=True)
+
+
+def decode_message(message: str) -> types.CallToolResult:
+    """Decode a JSON-RPC response the way the MCP client session does."""
+    response = types.JSONRPCMessage.model_validate_json(message).root
+    return types.CallToolResult.model_validate(response.result)
+
+
+def old_path(result: types.CallToolResult) -> MCPQueryResult:
+    """Decode the way the client did before: validated twice, parsed twice."""
+    validate(result.structuredContent, QueryResult.model_json_schema())
+    data = json.loads(result.content[0].text)
+    return MCPQueryResult(
+        success=True,
+        data=data["rows"],
+        columns=data["columns"],
+        row_count=len(data["rows"]),
+        version=data.get("version")
+    )
+
+
+def new_path(result: types.CallToolResult) -> MCPQueryResult:
+    """Decode the way the client does now."""
+    return decode_query_result(result)[0]
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """Return the best time of several runs in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> None:
+    """Run the benchmark and print per-stage timings."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000, help="Rows in the benchmark result")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per measurement, the best one is reported")
+    args = parser.parse_args()
+    
+    message = build_message(args.rows)
+    result = decode_message(message)
+    text = result.content[0].text
+    print(f"rows={args.rows}  message={len(message) / 1e6:.1f} MB  json backend={json_codec.backend()}")
+    
+    timings = {
+        "JSON-RPC message (both paths)": measure(lambda: decode_message(message), args.repeat),
+        "text decode, json": measure(lambda: json.loads(text), args.repeat),
+        "text decode, json_codec": measure(lambda: json_codec.loads(text), args.repeat),
+        "old client path": measure(lambda: old_path(result), args.repeat),
+        "new client path": measure(lambda: new_path(result), args.repeat),
+    }
+    for name, ms in timings.items():
+        print(f"{name:<32} {ms:9.2f} ms")
+        
+    common = timings["JSON-RPC message (both paths)"]
+    old_total = common + timings["old client path"]
+    new_total = common + timings["new client path"]
+    print(f"end to end: {old_total:.2f} ms -> {new_total:.2f} ms ({old_total / new_total:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Benchmark building the schema parts of LLM prompts on a large schema.
+
+Generates metadata for a schema with many tables and times building the SQL
+generation prompt and the MCP context message per request: rendering the
+schema from the metadata dict every time, as the FastAPI server did before,
+against taking the section from the prompt template cache.
+
+Usage:
+    python scripts/benchmark_prompts.py --tables 500 --repeat 200
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from fastapi_server.prompt_templates import (  # noqa: E402
+    SQL_GENERATION_HEADER, SQL_GENERATION_RULES, PromptTemplateCache, render_database_context, render_table_list
+)
+from fastapi_server.schema_linker import SchemaLinker  # noqa: E402
+
+
+def build_metadata(tables: int, columns: int) -> Dict[str, Any]:
+    """Build a metadata document with the given number of tables and columns per table."""
+    return {
+        "version": "s1-g1-m1-t1",
+        "database_path": "benchmark.db",
+        "tables": {
+            f"table_{i}": {
+                "description": f"Records of kind {i}",
+                "columns": [{"name": f"table_{i}_id", "type": "INTEGER", "primary_key": True}] + [
+                    {"name": f"field_{j}", "type": "TEXT"} for j in range(columns - 1)
+                ],
+                "row_count": i * 10
+            }
+            for i in range(tables)
+        }
+    }
+
+
+def sql_prompt(schema: str) -> str:
+    """Compose the SQL generation prompt around a schema section."""
+    return "\n".join((SQL_GENERATION_HEADER, schema, SQL_GENERATION_RULES))
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """Return the mean time of several runs in milliseconds."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main() -> None:
+    """Run the benchmark and print per-request timings."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tables", type=int, default=500, help="Tables in the benchmark schema")
+    parser.add_argument("--columns", type=int, default=12, help="Columns per table")
+    parser.add_argument("--repeat", type=int, default=200, help="Prompt builds per measurement")
+    args = parser.parse_args()
+    
+    metadata = build_metadata(args.tables, args.columns)
+    cache = PromptTemplateCache()
+    question = "How many records of kind 42 have field_3 set?"
+    print(f"tables={args.tables}  columns per table={args.columns}  "
+          f"full schema section={len(render_table_list(metadata)) / 1e3:.0f} kB")
+          
+    timings = {
+        "SQL prompt, rendered": measure(lambda: sql_prompt(render_table_list(metadata)), args.repeat),
+        "SQL prompt, cached": measure(
+            lambda: sql_prompt(cache.get(metadata, "sql_table_list", render_table_list)), args.repeat
+        ),
+        "MCP context, rendered": measure(lambda: render_database_context(metadata), args.repeat),
+        "MCP context, cached": measure(
+            lambda: cache.get(metadata, "database_context", render_database_context), args.repeat
+        ),
+        "linked SQL prompt, index rebuilt": measure(
+            lambda: sql_prompt(SchemaLinker(metadata).link(question, 1500)), max(1, args.repeat // 20)
+        ),
+        "linked SQL prompt, cached index": measure(
+            lambda: sql_prompt(cache.get(metadata, "schema_linker", SchemaLinker).link(question, 1500)), args.repeat
+        ),
+    }
+    for name, ms in timings.items():
+        print(f"{name:<34} {ms:9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Benchmark throughput of the MCP server with different worker counts.
+
+Starts the server in stateless streamable-http mode once per worker count,
+drives it with concurrent ``execute_query`` tool calls and reports requests
+per second, so scaling across cores can be compared.
+
+Usage:
+    python scripts/benchmark_workers.py --workers 1 2 4 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+QUERY = (
+    "SELECT category, COUNT(*) AS n, AVG(price) AS avg_price "
+    "FROM items GROUP BY category ORDER BY n DESC"
+)
+
+
+def create_database(path: Path, rows: int) -> None:
+    """Create a benchmark database with one moderately sized table."""
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, category TEXT, price REAL)")
+        conn.executemany(
+            "INSERT INTO items (category, price) VALUES (?, ?)",
+            ((f"category-{i % 50}", (i * 7919) % 1000 / 10) for i in range(rows))
+        )
+        conn.commit()
+
+
+def free_port() -> int:
+    """Find an unused TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(database: Path, port: int, workers: int) -> subprocess.Popen:
+    """Start the server in a subprocess."""
+    env = dict(os.environ, PYTHONPATH=str(PROJECT_ROOT / "src"))
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "talk_2_tables_mcp.server",
+            "--transport", "streamable-http", "--stateless", "--json-response",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--database", str(database), "--workers", str(workers),
+            "--log-level", "WARNING"
+        ],
+        env=env
+    )
+
+
+def tool_call(request_id: int) -> dict:
+    """Build a JSON-RPC execute_query tool call."""
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "tools/call",
+        "params": {"name": "execute_query", "arguments": {"query": QUERY}}
+    }
+
+
+async def wait_until_ready(client: httpx.AsyncClient, url: str, timeout: float = 30.0) -> None:
+    """Poll the server until it answers a tool call."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            response = await client.post(url, json=tool_call(0))
+            if response.status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("Server did not become ready")
+
+
+async def drive(url: str, concurrency: int, duration: float) -> float:
+    """Send tool calls from concurrent clients and return requests per second."""
+    headers = {"Accept": "application/json, text/event-stream"}
+    limits = httpx.Limits(max_connections=concurrency)
+    completed = 0
+    errors = 0
+    
+    async with httpx.AsyncClient(headers=headers, limits=limits, timeout=30.0) as client:
+        await wait_until_ready(client, url)
+        deadline = time.monotonic() + duration
+        
+        async def client_loop(client_id: int) -> None:
+            nonlocal completed, errors
+            request_id = client_id * 1_000_000
+            while time.monotonic() < deadline:
+                request_id += 1
+                response = await client.post(url, json=tool_call(request_id))
+                if response.status_code == 200 and "error" not in response.json():
+                    completed += 1
+                else:
+                    errors += 1
+                    
+        started = time.monotonic()
+        await asyncio.gather(*(client_loop(i) for i in range(concurrency)))
+        elapsed = time.monotonic() - started
+        
+    if errors:
+        print(f"    {errors} requests failed")
+    return completed / elapsed
+
+
+def main() -> None:
+    """Run the benchmark for each requested worker count."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Worker counts to compare")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent client requests")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to measure per worker count")
+    parser.add_argument("--rows", type=int, default=100_000, help="Rows in the benchmark table")
+    args = parser.parse_args()
+    
+    print(f"CPU cores: {os.cpu_count()}")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        database = Path(tmp) / "benchmark.db"
+        create_database(database, args.rows)
+        
+        baseline = None
+        for workers in args.workers:
+            port = free_port()
+            process = start_server(database, port, workers)
+            try:
+                throughput = asyncio.run(drive(f"http://127.0.0.1:{port}/mcp", args.concurrency, args.duration))
+            finally:
+                process.terminate()
+                process.wait(timeout=30)
+                
+            baseline = baseline or throughput
+            print(f"workers={workers:<3} {throughput:8.1f} req/s  ({throughput / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
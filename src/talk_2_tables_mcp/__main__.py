@@ -0,0 +1,12 @@
+"""Entry point for ``python -m talk_2_tables_mcp``.
+
+Running the package instead of ``python -m talk_2_tables_mcp.server`` loads
+the server module from its cached bytecode rather than compiling it as
+``__main__`` on every start, which matters for stdio clients that spawn a
+server per connection.
+"""
+
+from .server import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""Admission control for query execution.
+
+Limits how many queries run at once. Requests beyond the limit wait in a
+bounded queue that is served round-robin across clients, so one busy client
+cannot starve the others. When the queue is full, or a request waits too
+long, it is rejected straight away with a retryable error instead of piling
+more work onto an overloaded server.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """Raised when the server is too busy to accept a query."""
+    
+    def __init__(self, message: str, retry_after: float):
+        """Initialize the error.
+        
+        Args:
+            message: Reason for the rejection
+            retry_after: Suggested seconds to wait before retrying
+        """
+        super().__init__(f"{message}; retry after {retry_after:.1f}s")
+        self.retry_after = retry_after
+        self.retryable = True
+
+
+class AdmissionController:
+    """Concurrency limiter with a bounded, per-client fair wait queue."""
+    
+    def __init__(self, max_concurrent: int, max_queued: int, queue_timeout: float):
+        """Initialize the controller.
+        
+        Args:
+            max_concurrent: Maximum number of queries executing at once
+            max_queued: Maximum number of queries waiting for a slot
+            queue_timeout: Maximum seconds a query waits for a slot
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        
+        self._active = 0
+        self._queued = 0
+        self._waiters: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        
+        self._admitted = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        
+    @asynccontextmanager
+    async def admit(self, client_id: str) -> AsyncIterator[None]:
+        """Hold an execution slot for the duration of the block.
+        
+        Args:
+            client_id: Identifier used to share queue capacity fairly
+            
+        Raises:
+            AdmissionRejected: If no slot becomes available in time
+        """
+        await self.acquire(client_id)
+        try:
+            yield
+        finally:
+            self.release()
+            
+    async def acquire(self, client_id: str) -> None:
+        """Wait for an execution slot.
+        
+        Args:
+            client_id: Identifier used to share queue capacity fairly
+            
+        Raises:
+            AdmissionRejected: If the queue is full or the wait times out
+        """
+        if self._active < self.max_concurrent and self._queued == 0:
+            self._active += 1
+            self._admitted += 1
+            return
+            
+        if self._queued >= self.max_queued:
+            self._rejected += 1
+            raise AdmissionRejected(
+                f"Server busy: {self._active} queries running and {self._queued} queued",
+                retry_after=self._retry_after()
+            )
+            
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(client_id, deque()).append(waiter)
+        self._queued += 1
+        started = time.perf_counter()
+        
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._remove_waiter(client_id, waiter)
+            self._timed_out += 1
+            raise AdmissionRejected(
+                f"Server busy: waited {self.queue_timeout:.1f}s for a query slot",
+                retry_after=self._retry_after()
+            )
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the caller went away
+                self.release()
+            else:
+                self._remove_waiter(client_id, waiter)
+            raise
+            
+        waited = time.perf_counter() - started
+        self._admitted += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+        
+    def release(self) -> None:
+        """Release a slot, handing it to the next waiting client if any."""
+        while self._waiters:
+            client_id, waiters = next(iter(self._waiters.items()))
+            waiter = waiters.popleft()
+            self._queued -= 1
+            
+            # Rotate clients so the next slot goes to someone else
+            if waiters:
+                self._waiters.move_to_end(client_id)
+            else:
+                del self._waiters[client_id]
+                
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+                
+        self._active -= 1
+        
+    def stats(self) -> Dict[str, Any]:
+        """Get admission counters.
+        
+        Returns:
+            Dictionary with current load and cumulative counters
+        """
+        return {
+            "active": self._active,
+            "queued": self._queued,
+            "max_concurrent": self.max_concurrent,
+            "max_queued": self.max_queued,
+            "admitted": self._admitted,
+            "rejected": self._rejected,
+            "timed_out": self._timed_out,
+            "wait_seconds_total": round(self._total_wait, 6),
+            "wait_seconds_max": round(self._max_wait, 6)
+        }
+        
+    def _remove_waiter(self, client_id: str, waiter: asyncio.Future) -> None:
+        waiters = self._waiters.get(client_id)
+        if waiters is None or waiter not in waiters:
+            return
+        waiters.remove(waiter)
+        self._queued -= 1
+        if not waiters:
+            del self._waiters[client_id]
+            
+    def _retry_after(self) -> float:
+        # Rough time for the backlog to drain, assuming sub-second queries
+        return min(self.queue_timeout, 0.1 * (1 + self._queued / max(self.max_concurrent, 1)))
+
+
+def client_key(ctx: Any) -> str:
+    """Derive a fairness key for the client behind an MCP request.
+    
+    Args:
+        ctx: FastMCP request context
+        
+    Returns:
+        Client identifier, remote address or session identifier
+    """
+    try:
+        if ctx.client_id:
+            return str(ctx.client_id)
+        request = ctx.request_context.request
+    except (ValueError, AttributeError):
+        return "anonymous"
+        
+    client = getattr(request, "client", None)
+    if client is not None and client.host:
+        return client.host
+    return f"session-{id(ctx.session)}"
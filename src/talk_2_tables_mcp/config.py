@@ -69,6 +69,41 @@ class ServerConfig(BaseModel):
         description="Use JSON responses instead of SSE streams (for streamable-http)"
     )
     
+    max_concurrent_queries: int = Field(
+        default=4,
+        description="Maximum number of queries executing at once"
+    )
+    
+    max_queued_queries: int = Field(
+        default=32,
+        description="Maximum number of queries waiting for an execution slot before new ones are rejected"
+    )
+    
+    queue_timeout: float = Field(
+        default=10.0,
+        description="Maximum seconds a query waits for an execution slot"
+    )
+    
+    change_poll_interval: float = Field(
+        default=2.0,
+        description="Seconds between database change checks that refresh versions and notify subscribers"
+    )
+    
+    enable_metrics: bool = Field(
+        default=True,
+        description="Serve Prometheus metrics at /metrics on the HTTP transports"
+    )
+    
+    drain_timeout: float = Field(
+        default=30.0,
+        description="Seconds in-flight queries may run after a shutdown signal before they are interrupted"
+    )
+    
+    workers: int = Field(
+        default=1,
+        description="Number of worker processes sharing the listening socket (streamable-http only)"
+    )
+    
     # Logging configuration
     log_level: str = Field(
         default="INFO",
@@ -80,6 +115,11 @@ class ServerConfig(BaseModel):
         description="Log message format"
     )
     
+    log_notifications: str = Field(
+        default="errors",
+        description="MCP log notifications sent to clients: off, errors, summary or verbose"
+    )
+    
     # Query limits
     max_query_length: int = Field(
         default=10000,
@@ -91,6 +131,59 @@ class ServerConfig(BaseModel):
         description="Maximum number of rows to return in query results"
     )
     
+    db_pool_size: int = Field(
+        default=4,
+        description="Maximum number of pooled SQLite connections used for queries"
+    )
+    
+    # Warm start configuration
+    warm_start: bool = Field(
+        default=False,
+        description="Open the pool and precompute metadata before the server reports ready"
+    )
+    
+    warm_start_prime_mb: int = Field(
+        default=64,
+        description="Megabytes of the database file read into the page cache during warm start"
+    )
+    
+    warm_start_replay_queries: int = Field(
+        default=0,
+        description="Number of top query fingerprints from the query log replayed during warm start"
+    )
+    
+    query_log_path: Optional[str] = Field(
+        default=None,
+        description="Path of a JSON file counting executed query shapes, used for warm-start replay"
+    )
+    
+    # Resource configuration
+    table_sample_rows: int = Field(
+        default=5,
+        description="Number of rows returned by the per-table sample resource"
+    )
+    
+    # Column statistics configuration
+    enable_column_stats: bool = Field(
+        default=False,
+        description="Profile tables in the background and include column statistics in metadata"
+    )
+    
+    stats_sample_rows: int = Field(
+        default=10000,
+        description="Approximate number of rows sampled per table by the statistics profiler"
+    )
+    
+    stats_top_k: int = Field(
+        default=5,
+        description="Number of most common values reported per column"
+    )
+    
+    stats_refresh_interval: float = Field(
+        default=300.0,
+        description="Seconds between checks for database changes by the statistics profiler"
+    )
+    
     @field_validator("log_level")
     @classmethod
     def validate_log_level(cls, v):
@@ -100,6 +193,15 @@ class ServerConfig(BaseModel):
             raise ValueError(f"log_level must be one of {valid_levels}")
         return v.upper()
     
+    @field_validator("log_notifications")
+    @classmethod
+    def validate_log_notifications(cls, v):
+        """Validate log notification policy."""
+        valid_policies = ["off", "errors", "summary", "verbose"]
+        if v.lower() not in valid_policies:
+            raise ValueError(f"log_notifications must be one of {valid_policies}")
+        return v.lower()
+    
     @field_validator("database_path")
     @classmethod
     def validate_database_path(cls, v):
@@ -132,6 +234,94 @@ class ServerConfig(BaseModel):
             raise ValueError("max_result_rows must be positive")
         return v
     
+    @field_validator("table_sample_rows")
+    @classmethod
+    def validate_table_sample_rows(cls, v):
+        """Validate table sample row count."""
+        if v <= 0:
+            raise ValueError("table_sample_rows must be positive")
+        return v
+    
+    @field_validator("db_pool_size")
+    @classmethod
+    def validate_db_pool_size(cls, v):
+        """Validate connection pool size."""
+        if v <= 0:
+            raise ValueError("db_pool_size must be positive")
+        return v
+    
+    @field_validator("max_concurrent_queries")
+    @classmethod
+    def validate_max_concurrent_queries(cls, v):
+        """Validate query concurrency limit."""
+        if v <= 0:
+            raise ValueError("max_concurrent_queries must be positive")
+        return v
+    
+    @field_validator("max_queued_queries")
+    @classmethod
+    def validate_max_queued_queries(cls, v):
+        """Validate query queue bound."""
+        if v < 0:
+            raise ValueError("max_queued_queries cannot be negative")
+        return v
+    
+    @field_validator("queue_timeout")
+    @classmethod
+    def validate_queue_timeout(cls, v):
+        """Validate query queue timeout."""
+        if v <= 0:
+            raise ValueError("queue_timeout must be positive")
+        return v
+    
+    @field_validator("change_poll_interval")
+    @classmethod
+    def validate_change_poll_interval(cls, v):
+        """Validate change polling interval."""
+        if v <= 0:
+            raise ValueError("change_poll_interval must be positive")
+        return v
+    
+    @field_validator("drain_timeout")
+    @classmethod
+    def validate_drain_timeout(cls, v):
+        """Validate shutdown drain timeout."""
+        if v < 0:
+            raise ValueError("drain_timeout must not be negative")
+        return v
+    
+    @field_validator("workers")
+    @classmethod
+    def validate_workers(cls, v):
+        """Validate worker process count."""
+        if v <= 0:
+            raise ValueError("workers must be positive")
+        return v
+    
+    @field_validator("warm_start_prime_mb", "warm_start_replay_queries")
+    @classmethod
+    def validate_warm_start_counts(cls, v):
+        """Validate warm start sizes."""
+        if v < 0:
+            raise ValueError("warm start sizes cannot be negative")
+        return v
+    
+    @field_validator("stats_sample_rows", "stats_top_k")
+    @classmethod
+    def validate_stats_counts(cls, v):
+        """Validate statistics profiler counts."""
+        if v <= 0:
+            raise ValueError("statistics profiler counts must be positive")
+        return v
+    
+    @field_validator("stats_refresh_interval")
+    @classmethod
+    def validate_stats_refresh_interval(cls, v):
+        """Validate statistics refresh interval."""
+        if v <= 0:
+            raise ValueError("stats_refresh_interval must be positive")
+        return v
+    
     @field_validator("transport")
     @classmethod
     def validate_transport(cls, v):
@@ -206,10 +396,28 @@ def load_config() -> ServerConfig:
         "STATELESS_HTTP": "stateless_http",
         "ALLOW_CORS": "allow_cors",
         "JSON_RESPONSE": "json_response",
+        "WORKERS": "workers",
+        "DRAIN_TIMEOUT": "drain_timeout",
+        "ENABLE_METRICS": "enable_metrics",
+        "CHANGE_POLL_INTERVAL": "change_poll_interval",
         "LOG_LEVEL": "log_level",
         "LOG_FORMAT": "log_format",
+        "LOG_NOTIFICATIONS": "log_notifications",
         "MAX_QUERY_LENGTH": "max_query_length",
         "MAX_RESULT_ROWS": "max_result_rows",
+        "DB_POOL_SIZE": "db_pool_size",
+        "MAX_CONCURRENT_QUERIES": "max_concurrent_queries",
+        "MAX_QUEUED_QUERIES": "max_queued_queries",
+        "QUEUE_TIMEOUT": "queue_timeout",
+        "WARM_START": "warm_start",
+        "WARM_START_PRIME_MB": "warm_start_prime_mb",
+        "WARM_START_REPLAY_QUERIES": "warm_start_replay_queries",
+        "QUERY_LOG_PATH": "query_log_path",
+        "TABLE_SAMPLE_ROWS": "table_sample_rows",
+        "ENABLE_COLUMN_STATS": "enable_column_stats",
+        "STATS_SAMPLE_ROWS": "stats_sample_rows",
+        "STATS_TOP_K": "stats_top_k",
+        "STATS_REFRESH_INTERVAL": "stats_refresh_interval",
     }
     
     # Load values from environment
@@ -217,15 +425,28 @@ def load_config() -> ServerConfig:
         value = os.getenv(env_var)
         if value is not None:
             # Convert numeric values
-            if config_field in ["max_query_length", "max_result_rows", "port"]:
+            if config_field in ["max_query_length", "max_result_rows", "port", "table_sample_rows",
+                                "stats_sample_rows", "stats_top_k", "db_pool_size",
+                                "warm_start_prime_mb", "warm_start_replay_queries", "workers",
+                                "max_concurrent_queries", "max_queued_queries"]:
                 try:
                     value = int(value)
                 except ValueError:
                     logging.warning(f"Invalid numeric value for {env_var}: {value}")
                     continue
             
+            # Convert float values
+            elif config_field in ["stats_refresh_interval", "queue_timeout", "change_poll_interval",
+                                  "drain_timeout"]:
+                try:
+                    value = float(value)
+                except ValueError:
+                    logging.warning(f"Invalid numeric value for {env_var}: {value}")
+                    continue
+            
             # Convert boolean values
-            elif config_field in ["stateless_http", "allow_cors", "json_response"]:
+            elif config_field in ["stateless_http", "allow_cors", "json_response", "enable_column_stats",
+                                  "warm_start", "enable_metrics"]:
                 value = value.lower() in ("true", "1", "yes", "on")
             
             config_dict[config_field] = value
@@ -4,10 +4,14 @@ This module provides secure SQLite database operations with SELECT-only query su
 """
 
 import logging
+import queue
 import re
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -17,20 +21,160 @@ class DatabaseError(Exception):
     pass
 
 
+class ConnectionPool:
+    """Thread-safe pool of reusable SQLite connections.
+    
+    Connections are opened lazily up to ``size`` and handed out one at a time,
+    so query execution skips the per-call connect and cache warm-up cost.
+    """
+    
+    def __init__(self, database_path: Path, size: int = 4):
+        """Initialize the connection pool.
+        
+        Args:
+            database_path: Path to the SQLite database file
+            size: Maximum number of open connections
+        """
+        self.database_path = database_path
+        self.size = size
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._in_use = 0
+        self._checked_out: Set[sqlite3.Connection] = set()
+        self._closed = False
+    
+    @property
+    def in_use(self) -> int:
+        """Number of connections currently checked out."""
+        return self._in_use
+    
+    @property
+    def opened(self) -> int:
+        """Number of connections currently open."""
+        return self._opened
+    
+    def _open_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.database_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        return conn
+    
+    def warm(self) -> int:
+        """Open all connections up front.
+        
+        Returns:
+            Number of connections opened by this call
+        """
+        opened = []
+        with self._lock:
+            while self._opened < self.size:
+                opened.append(self._open_connection())
+                self._opened += 1
+        
+        for conn in opened:
+            # Touch the schema so each connection has it parsed and cached
+            conn.execute("SELECT count(*) FROM sqlite_master").fetchone()
+            self._idle.put(conn)
+        
+        return len(opened)
+    
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[sqlite3.Connection]:
+        """Check out a connection for the duration of the block.
+        
+        Args:
+            timeout: Seconds to wait for a free connection (None waits forever)
+            
+        Yields:
+            An open SQLite connection
+            
+        Raises:
+            DatabaseError: If the pool is closed or no connection became free in time
+        """
+        if self._closed:
+            raise DatabaseError("Connection pool is closed")
+        
+        conn = None
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                if self._opened < self.size:
+                    conn = self._open_connection()
+                    self._opened += 1
+            if conn is None:
+                try:
+                    conn = self._idle.get(timeout=timeout)
+                except queue.Empty:
+                    raise DatabaseError("Timed out waiting for a database connection")
+        
+        with self._lock:
+            self._in_use += 1
+            self._checked_out.add(conn)
+        try:
+            yield conn
+        finally:
+            with self._lock:
+                self._in_use -= 1
+                self._checked_out.discard(conn)
+                # Decided under the lock so close() never misses a returned connection
+                retire = self._closed
+                if retire:
+                    self._opened -= 1
+                else:
+                    self._idle.put(conn)
+            if retire:
+                conn.close()
+    
+    def interrupt(self) -> int:
+        """Abort the statements running on checked-out connections.
+        
+        The interrupted statements fail with ``sqlite3.OperationalError``
+        and their connections return to the pool as usual.
+        
+        Returns:
+            Number of connections interrupted
+        """
+        with self._lock:
+            busy = list(self._checked_out)
+        for conn in busy:
+            conn.interrupt()
+        return len(busy)
+    
+    def close(self) -> None:
+        """Close all idle connections and refuse new checkouts.
+        
+        Checked-out connections are closed when they are returned.
+        """
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+
+
 class DatabaseHandler:
     """Handles SQLite database operations with security restrictions."""
     
-    def __init__(self, database_path: str):
+    def __init__(self, database_path: str, pool_size: int = 4):
         """Initialize the database handler.
         
         Args:
             database_path: Path to the SQLite database file
+            pool_size: Maximum number of pooled connections used for queries
             
         Raises:
             DatabaseError: If database file doesn't exist or can't be accessed
         """
         self.database_path = Path(database_path)
         self._validate_database_file()
+        self.pool = ConnectionPool(self.database_path, size=pool_size)
+        self._table_names: Optional[Tuple[int, Set[str]]] = None
         
     def _validate_database_file(self) -> None:
         """Validate that the database file exists and is accessible.
@@ -82,11 +226,13 @@ class DatabaseHandler:
             if re.search(rf'\b{keyword}\b', clean_query, re.IGNORECASE):
                 raise DatabaseError(f"Keyword '{keyword}' is not allowed in queries")
     
-    def execute_query(self, query: str) -> Dict[str, Any]:
+    def execute_query(self, query: str, timings: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
         """Execute a SELECT query and return results.
         
         Args:
             query: SQL SELECT query to execute
+            timings: Optional dictionary that receives 'validation' and
+                'execution' durations in seconds
             
         Returns:
             Dictionary containing query results with 'columns' and 'rows' keys
@@ -96,11 +242,12 @@ class DatabaseHandler:
         """
         logger.info(f"Executing query: {query[:100]}...")
         
+        started = time.perf_counter()
         self._validate_select_query(query)
+        validated = time.perf_counter()
         
         try:
-            with sqlite3.connect(self.database_path) as conn:
-                conn.row_factory = sqlite3.Row  # Enable column access by name
+            with self.pool.connection() as conn:
                 cursor = conn.execute(query)
                 
                 # Get column names
@@ -116,6 +263,10 @@ class DatabaseHandler:
                 }
                 
                 logger.info(f"Query executed successfully, returned {len(rows)} rows")
+                
+                if timings is not None:
+                    timings["validation"] = validated - started
+                    timings["execution"] = time.perf_counter() - validated
                 return result
                 
         except sqlite3.Error as e:
@@ -150,27 +301,7 @@ class DatabaseHandler:
                 # Get column information for each table
                 for table_name in tables:
                     try:
-                        pragma_query = f"PRAGMA table_info({table_name})"
-                        columns = []
-                        
-                        for row in conn.execute(pragma_query):
-                            column_info = {
-                                "name": row["name"],
-                                "type": row["type"],
-                                "not_null": bool(row["notnull"]),
-                                "default_value": row["dflt_value"],
-                                "primary_key": bool(row["pk"])
-                            }
-                            columns.append(column_info)
-                        
-                        # Get row count
-                        count_query = f"SELECT COUNT(*) as count FROM {table_name}"
-                        row_count = conn.execute(count_query).fetchone()["count"]
-                        
-                        schema_info["tables"][table_name] = {
-                            "columns": columns,
-                            "row_count": row_count
-                        }
+                        schema_info["tables"][table_name] = self._read_table_info(conn, table_name)
                         
                     except sqlite3.Error as e:
                         logger.warning(f"Could not get info for table {table_name}: {e}")
@@ -184,6 +315,199 @@ class DatabaseHandler:
             logger.error(error_msg)
             raise DatabaseError(error_msg)
     
+    def get_table_names(self) -> List[str]:
+        """Get the names of all user tables in the database.
+        
+        Returns:
+            Sorted list of table names
+            
+        Raises:
+            DatabaseError: If the table list cannot be retrieved
+        """
+        try:
+            with sqlite3.connect(self.database_path) as conn:
+                tables_query = "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+                return [row[0] for row in conn.execute(tables_query)]
+        except sqlite3.Error as e:
+            error_msg = f"Failed to list tables: {e}"
+            logger.error(error_msg)
+            raise DatabaseError(error_msg)
+    
+    def get_table_info(self, table_name: str) -> Dict[str, Any]:
+        """Get schema information for a single table.
+        
+        Args:
+            table_name: Name of the table
+            
+        Returns:
+            Dictionary with 'columns' and 'row_count' keys
+            
+        Raises:
+            DatabaseError: If the table doesn't exist or can't be inspected
+        """
+        self._validate_table_name(table_name)
+        
+        try:
+            with sqlite3.connect(self.database_path) as conn:
+                conn.row_factory = sqlite3.Row
+                return self._read_table_info(conn, table_name)
+        except sqlite3.Error as e:
+            error_msg = f"Failed to retrieve table information for {table_name}: {e}"
+            logger.error(error_msg)
+            raise DatabaseError(error_msg)
+    
+    def get_table_sample(self, table_name: str, limit: int = 5) -> Dict[str, Any]:
+        """Get a small sample of rows from a table.
+        
+        Args:
+            table_name: Name of the table
+            limit: Maximum number of rows to return
+            
+        Returns:
+            Dictionary containing sample results with 'columns' and 'rows' keys
+            
+        Raises:
+            DatabaseError: If the table doesn't exist or sampling fails
+        """
+        self._validate_table_name(table_name)
+        
+        try:
+            with self.pool.connection() as conn:
+                cursor = conn.execute(
+                    f"SELECT * FROM {self._quote_identifier(table_name)} LIMIT ?",
+                    (limit,)
+                )
+                columns = [description[0] for description in cursor.description] if cursor.description else []
+                rows = [dict(row) for row in cursor.fetchall()]
+                
+                return {
+                    "columns": columns,
+                    "rows": rows,
+                    "row_count": len(rows)
+                }
+        except sqlite3.Error as e:
+            error_msg = f"Failed to sample table {table_name}: {e}"
+            logger.error(error_msg)
+            raise DatabaseError(error_msg)
+    
+    def get_schema_version(self) -> int:
+        """Get the SQLite schema version counter.
+        
+        The counter is incremented by SQLite on every schema change, which
+        makes it a cheap cache key for schema-derived data.
+        
+        Returns:
+            Current value of PRAGMA schema_version
+            
+        Raises:
+            DatabaseError: If the version cannot be read
+        """
+        try:
+            with sqlite3.connect(self.database_path) as conn:
+                return conn.execute("PRAGMA schema_version").fetchone()[0]
+        except sqlite3.Error as e:
+            error_msg = f"Failed to read schema version: {e}"
+            logger.error(error_msg)
+            raise DatabaseError(error_msg)
+    
+    def prime_page_cache(self, max_bytes: int) -> int:
+        """Read the database file so its pages are in the OS page cache.
+        
+        Args:
+            max_bytes: Maximum number of bytes to read
+            
+        Returns:
+            Number of bytes read
+        """
+        chunk_size = 1024 * 1024
+        read = 0
+        
+        try:
+            with open(self.database_path, 'rb') as f:
+                while read < max_bytes:
+                    chunk = f.read(min(chunk_size, max_bytes - read))
+                    if not chunk:
+                        break
+                    read += len(chunk)
+        except OSError as e:
+            logger.warning(f"Could not prime page cache for {self.database_path}: {e}")
+        
+        return read
+    
+    def interrupt(self) -> int:
+        """Abort all running queries.
+        
+        Returns:
+            Number of queries interrupted
+        """
+        return self.pool.interrupt()
+    
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.pool.close()
+    
+    def _validate_table_name(self, table_name: str) -> None:
+        """Validate that a table name refers to an existing user table.
+        
+        Args:
+            table_name: Table name to validate
+            
+        Raises:
+            DatabaseError: If the table doesn't exist
+        """
+        try:
+            with self.pool.connection() as conn:
+                # The table list only changes with the schema version
+                version = conn.execute("PRAGMA schema_version").fetchone()[0]
+                if self._table_names is None or self._table_names[0] != version:
+                    tables_query = "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
+                    self._table_names = (version, {row[0] for row in conn.execute(tables_query)})
+                table_names = self._table_names[1]
+        except sqlite3.Error as e:
+            error_msg = f"Failed to retrieve table names: {e}"
+            logger.error(error_msg)
+            raise DatabaseError(error_msg)
+            
+        if table_name not in table_names:
+            raise DatabaseError(f"Table not found: {table_name}")
+    
+    @staticmethod
+    def _quote_identifier(identifier: str) -> str:
+        """Quote an SQL identifier for safe interpolation."""
+        return '"' + identifier.replace('"', '""') + '"'
+    
+    def _read_table_info(self, conn: sqlite3.Connection, table_name: str) -> Dict[str, Any]:
+        """Read column information and row count for a table.
+        
+        Args:
+            conn: Open connection with sqlite3.Row row factory
+            table_name: Name of an existing table
+            
+        Returns:
+            Dictionary with 'columns' and 'row_count' keys
+        """
+        quoted_name = self._quote_identifier(table_name)
+        columns = []
+        
+        for row in conn.execute(f"PRAGMA table_info({quoted_name})"):
+            column_info = {
+                "name": row["name"],
+                "type": row["type"],
+                "not_null": bool(row["notnull"]),
+                "default_value": row["dflt_value"],
+                "primary_key": bool(row["pk"])
+            }
+            columns.append(column_info)
+        
+        # Get row count
+        count_query = f"SELECT COUNT(*) as count FROM {quoted_name}"
+        row_count = conn.execute(count_query).fetchone()["count"]
+        
+        return {
+            "columns": columns,
+            "row_count": row_count
+        }
+    
     def test_connection(self) -> bool:
         """Test database connection.
         
@@ -0,0 +1,266 @@
+"""Graceful drain on shutdown.
+
+When the server is asked to stop, it first stops accepting new MCP sessions
+and new queries, and lets the ``execute_query`` calls already running finish.
+Calls still running when the drain deadline passes have their SQLite
+statements interrupted, and only then does the HTTP server close its
+connections. New work arriving during the drain is refused with a retryable
+error, so clients and load balancers can move it to another instance.
+
+Drain progress is logged and published in the ``drain`` section of the
+server statistics.
+"""
+
+import asyncio
+import logging
+import signal
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional
+
+import uvicorn
+
+from .admission import AdmissionRejected
+
+logger = logging.getLogger(__name__)
+
+# Suggested client back-off while the server drains
+DRAIN_RETRY_AFTER = 1.0
+
+# Seconds interrupted statements get to unwind before the drain gives up
+INTERRUPT_GRACE = 2.0
+
+# Seconds idle connections (such as SSE streams) get to close after draining
+SHUTDOWN_GRACE = 5.0
+
+
+class ServerDraining(AdmissionRejected):
+    """Raised for work that arrives while the server is shutting down."""
+    
+    def __init__(self, message: str = "Server is shutting down"):
+        """Initialize the error.
+        
+        Args:
+            message: Reason for the rejection
+        """
+        super().__init__(message, retry_after=DRAIN_RETRY_AFTER)
+
+
+class DrainController:
+    """Tracks in-flight queries and coordinates the shutdown drain."""
+    
+    def __init__(self):
+        """Initialize the controller in the accepting state."""
+        self._draining = False
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._rejected = 0
+        self._interrupted = 0
+        
+    @property
+    def draining(self) -> bool:
+        """Whether the server has stopped accepting new work."""
+        return self._draining
+        
+    @property
+    def in_flight(self) -> int:
+        """Number of queries currently running."""
+        return self._in_flight
+        
+    @asynccontextmanager
+    async def track(self) -> AsyncIterator[None]:
+        """Count the enclosed query as in flight.
+        
+        Raises:
+            ServerDraining: If the server is draining
+        """
+        if self._draining:
+            self._rejected += 1
+            raise ServerDraining()
+            
+        self._in_flight += 1
+        self._idle.clear()
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self._idle.set()
+                
+    def reject(self) -> None:
+        """Count a request refused because of the drain."""
+        self._rejected += 1
+        
+    async def drain(
+        self,
+        timeout: float,
+        interrupt: Optional[Callable[[], int]] = None,
+        progress_interval: float = 1.0
+    ) -> Dict[str, Any]:
+        """Stop accepting work and wait for in-flight queries.
+        
+        Args:
+            timeout: Seconds to wait before interrupting the remaining queries
+            interrupt: Callable that aborts running statements and returns
+                how many it aborted
+            progress_interval: Seconds between progress log messages
+            
+        Returns:
+            Drain statistics once the drain has finished
+        """
+        if not self._draining:
+            self._draining = True
+            self._started_at = time.monotonic()
+            logger.info(f"Draining: {self._in_flight} queries in flight, deadline {timeout:.1f}s")
+            
+        deadline = self._started_at + timeout
+        while self._in_flight:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if await self._wait_idle(min(progress_interval, remaining)):
+                break
+            remaining = deadline - time.monotonic()
+            if remaining > 0:
+                logger.info(
+                    f"Draining: {self._in_flight} queries in flight, "
+                    f"{remaining:.1f}s until they are interrupted"
+                )
+            
+        if self._in_flight and interrupt is not None:
+            logger.warning(f"Drain deadline reached, interrupting {self._in_flight} queries")
+            self._interrupted += interrupt()
+            await self._wait_idle(INTERRUPT_GRACE)
+            
+        self._finished_at = time.monotonic()
+        stats = self.stats()
+        logger.info(
+            f"Drain finished in {stats['elapsed_seconds']:.2f}s: "
+            f"{stats['interrupted']} interrupted, {stats['in_flight']} still running"
+        )
+        return stats
+        
+    def stats(self) -> Dict[str, Any]:
+        """Get drain progress.
+        
+        Returns:
+            Dictionary with the drain state and counters
+        """
+        elapsed = 0.0
+        if self._started_at is not None:
+            elapsed = (self._finished_at or time.monotonic()) - self._started_at
+        return {
+            "draining": self._draining,
+            "finished": self._finished_at is not None,
+            "in_flight": self._in_flight,
+            "elapsed_seconds": round(elapsed, 3),
+            "rejected": self._rejected,
+            "interrupted": self._interrupted
+        }
+        
+    async def _wait_idle(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+class DrainMiddleware:
+    """ASGI middleware that refuses new MCP sessions while draining.
+    
+    Requests that belong to an existing session (``mcp-session-id`` header or
+    SSE ``session_id`` parameter) pass through; anything else on the MCP
+    endpoints gets ``503 Service Unavailable`` with a ``Retry-After`` header.
+    Other routes, such as ``/metrics``, stay available during the drain.
+    """
+    
+    def __init__(self, app: Any, controller: DrainController, paths: Iterable[str]):
+        """Initialize the middleware.
+        
+        Args:
+            app: ASGI application to wrap
+            controller: Drain state
+            paths: Path prefixes of the MCP endpoints
+        """
+        self.app = app
+        self.controller = controller
+        self.paths = tuple(path.rstrip("/") for path in paths)
+        
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] == "http" and self.controller.draining and self._opens_session(scope):
+            self.controller.reject()
+            await send({
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"retry-after", str(int(DRAIN_RETRY_AFTER)).encode()),
+                    (b"connection", b"close"),
+                    (b"content-type", b"text/plain; charset=utf-8")
+                ]
+            })
+            await send({"type": "http.response.body", "body": b"Server is shutting down"})
+            return
+            
+        await self.app(scope, receive, send)
+        
+    def _opens_session(self, scope: Dict[str, Any]) -> bool:
+        path = scope.get("path", "").rstrip("/")
+        if not any(path == prefix or path.startswith(prefix + "/") for prefix in self.paths):
+            return False
+        if any(name == b"mcp-session-id" for name, _ in scope.get("headers", [])):
+            return False
+        return b"session_id=" not in scope.get("query_string", b"")
+
+
+class DrainingServer(uvicorn.Server):
+    """Uvicorn server that drains in-flight work before shutting down.
+    
+    The first SIGINT or SIGTERM starts the drain; uvicorn's normal shutdown
+    follows once it has finished. A second SIGINT skips the rest of the
+    drain and shuts down straight away; further SIGTERMs are ignored, so a
+    supervisor forwarding the signal does not cut the drain short.
+    """
+    
+    def __init__(self, config: uvicorn.Config, drain: Callable[[], Awaitable[Any]]):
+        """Initialize the server.
+        
+        Args:
+            config: Uvicorn configuration
+            drain: Coroutine function that drains the application
+        """
+        super().__init__(config)
+        self._drain = drain
+        self._drain_task: Optional[asyncio.Task] = None
+        
+    def handle_exit(self, sig: int, frame: Any) -> None:
+        """Start draining on the first shutdown signal."""
+        if self.should_exit or not self.started:
+            super().handle_exit(sig, frame)
+        elif self._drain_task is None:
+            logger.info(f"Received signal {sig}, draining before shutdown")
+            self.begin_drain()
+        elif sig == signal.SIGINT:
+            logger.warning("Interrupted again, shutting down without finishing the drain")
+            super().handle_exit(sig, frame)
+            
+    def begin_drain(self) -> "asyncio.Task":
+        """Drain the application, then shut the server down.
+        
+        Returns:
+            Task running the drain
+        """
+        if self._drain_task is None:
+            self._drain_task = asyncio.get_running_loop().create_task(self._drain_then_exit())
+        return self._drain_task
+        
+    async def _drain_then_exit(self) -> None:
+        try:
+            await self._drain()
+        except Exception as e:
+            logger.error(f"Drain failed: {e}")
+        finally:
+            self.should_exit = True
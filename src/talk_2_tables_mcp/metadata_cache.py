@@ -0,0 +1,93 @@
+"""Versioned cache for serialized metadata resources.
+
+Metadata resources are derived from the metadata file and the database
+schema, both of which change rarely. This module keeps the serialized
+documents in memory and drops them all whenever the version key changes.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class MetadataCache:
+    """In-memory cache of metadata documents keyed by resource and version."""
+    
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._version: Optional[str] = None
+        self._entries: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        
+    @property
+    def version(self) -> Optional[str]:
+        """Version the cached entries belong to."""
+        return self._version
+        
+    def get(self, key: str, version: str) -> Optional[str]:
+        """Look up a cached document.
+        
+        All entries are discarded when ``version`` differs from the version
+        the cache currently holds.
+        
+        Args:
+            key: Resource key, typically the resource URI
+            version: Current version of the underlying metadata
+            
+        Returns:
+            Serialized document, or None on a miss
+        """
+        with self._lock:
+            if version != self._version:
+                if self._entries:
+                    logger.info(f"Metadata version changed to {version}, dropping {len(self._entries)} cached entries")
+                self._entries.clear()
+                self._version = version
+                
+            cached = self._entries.get(key)
+            if cached is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return cached
+            
+    def put(self, key: str, version: str, value: str) -> None:
+        """Store a document built for the given version.
+        
+        Documents built for a version that has since been superseded are
+        silently dropped.
+        
+        Args:
+            key: Resource key, typically the resource URI
+            version: Version the document was built from
+            value: Serialized document
+        """
+        with self._lock:
+            if version == self._version:
+                self._entries[key] = value
+                
+    def invalidate(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+            
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+        
+        Returns:
+            Dictionary with entry count, hits, misses and hit ratio
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "version": self._version,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0
+            }
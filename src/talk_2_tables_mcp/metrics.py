@@ -0,0 +1,336 @@
+"""Prometheus metrics for the MCP server.
+
+A small, dependency-free metrics registry that renders the Prometheus text
+exposition format. The server records tool latency, per-stage query timings,
+rows and bytes returned and event-loop lag; runtime counters from
+``server_stats`` are rendered alongside as gauges and counters.
+"""
+
+import abc
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.exceptions import ToolError
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10_000, 100_000)
+SIZE_BUCKETS = (256, 1024, 4096, 16_384, 65_536, 262_144, 1_048_576, 4_194_304, 16_777_216)
+
+# Runtime stats that only ever increase are exposed as counters
+_COUNTER_STATS = {"admitted", "rejected", "timed_out", "executions", "coalesced", "hits", "misses",
+                  "interrupted"}
+
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    parts = []
+    for name, value in labels:
+        escaped = str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+        parts.append(f'{name}="{escaped}"')
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(abc.ABC):
+    """Base class for labelled metrics."""
+    
+    metric_type = "untyped"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+        
+    def render(self) -> List[str]:
+        """Render the metric in Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        lines.extend(self._samples())
+        return lines
+        
+    @abc.abstractmethod
+    def _samples(self) -> List[str]:
+        """Render the samples of every label set."""
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+    
+    metric_type = "counter"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increase the counter.
+        
+        Args:
+            amount: Amount to add
+            **labels: Label values
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+            
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            f"{self.name}{_format_labels(zip(self.labelnames, key))} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed buckets."""
+    
+    metric_type = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        
+    def observe(self, value: float, **labels: str) -> None:
+        """Record an observation.
+        
+        Args:
+            value: Observed value
+            **labels: Label values
+        """
+        key = self._key(labels)
+        with self._lock:
+            # Per-bucket counts followed by sum and count
+            series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+            
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(series)) for key, series in self._series.items()]
+            
+        lines = []
+        for key, series in items:
+            labels = list(zip(self.labelnames, key))
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                bucket_labels = _format_labels(labels + [("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{bucket_labels} {_format_value(cumulative)}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {_format_value(series[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together."""
+    
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics: List[_Metric] = []
+        
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Create and register a counter."""
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+        
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        """Create and register a histogram."""
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+        
+    def render(self) -> str:
+        """Render all registered metrics in Prometheus text format."""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def render_stats(stats: Dict[str, Dict[str, Any]], prefix: str = "talk2tables") -> str:
+    """Render nested runtime stats as Prometheus gauges and counters.
+    
+    Args:
+        stats: Mapping of component name to its numeric counters
+        prefix: Metric name prefix
+        
+    Returns:
+        Prometheus text for every numeric value
+    """
+    lines: List[str] = []
+    for component, values in stats.items():
+        for key, value in values.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            if key.endswith("_total"):
+                name, metric_type = f"{prefix}_{component}_{key}", "counter"
+            elif key in _COUNTER_STATS:
+                name, metric_type = f"{prefix}_{component}_{key}_total", "counter"
+            else:
+                name, metric_type = f"{prefix}_{component}_{key}", "gauge"
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.append(f"{name} {_format_value(value)}")
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+class EventLoopLagMonitor:
+    """Measures how late the event loop wakes up from a fixed sleep."""
+    
+    def __init__(self, histogram: Histogram, interval: float = 0.5):
+        """Initialize the monitor.
+        
+        Args:
+            histogram: Histogram receiving lag observations
+            interval: Seconds between measurements
+        """
+        self.histogram = histogram
+        self.interval = interval
+        self.last_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+        
+    def ensure_running(self) -> None:
+        """Start measuring on the running event loop if not already doing so."""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        
+    def stop(self) -> None:
+        """Stop measuring."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+            
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.last_lag = max(0.0, loop.time() - started - self.interval)
+            self.histogram.observe(self.last_lag)
+
+
+class ServerMetrics:
+    """Metrics recorded by the MCP server."""
+    
+    def __init__(self):
+        """Create the server's metrics."""
+        self.registry = MetricsRegistry()
+        self.tool_duration = self.registry.histogram(
+            "talk2tables_tool_duration_seconds",
+            "Tool call latency including result serialization",
+            ["tool", "status"]
+        )
+        self.stage_duration = self.registry.histogram(
+            "talk2tables_query_stage_seconds",
+            "Time spent per query stage (validation, execution, serialization)",
+            ["stage"]
+        )
+        self.rows_returned = self.registry.histogram(
+            "talk2tables_query_rows",
+            "Rows returned per execute_query call",
+            buckets=ROW_BUCKETS
+        )
+        self.response_bytes = self.registry.histogram(
+            "talk2tables_tool_response_bytes",
+            "Size of serialized tool responses",
+            ["tool"],
+            buckets=SIZE_BUCKETS
+        )
+        self.loop_lag = self.registry.histogram(
+            "talk2tables_event_loop_lag_seconds",
+            "Delay of event loop wake-ups beyond the scheduled time"
+        )
+        self.loop_monitor = EventLoopLagMonitor(self.loop_lag)
+        
+    def render(self, stats: Dict[str, Dict[str, Any]]) -> str:
+        """Render recorded metrics together with runtime stats.
+        
+        Args:
+            stats: Runtime counters from ``collect_server_stats``
+            
+        Returns:
+            Prometheus text exposition
+        """
+        return self.registry.render() + render_stats(stats)
+
+
+def _content_bytes(converted: Any) -> int:
+    content = converted[0] if isinstance(converted, tuple) else converted
+    return sum(len(block.text.encode("utf-8")) for block in content if hasattr(block, "text"))
+
+
+class InstrumentedFastMCP(FastMCP):
+    """FastMCP server that records tool latency, serialization time and response size.
+    
+    Timing serialization apart from the handler needs FastMCP's tool manager
+    and ``convert_result``, which are not public API; the ``mcp`` requirement
+    is pinned to the release range this was verified against.
+    """
+    
+    def __init__(self, *args: Any, metrics: ServerMetrics, **kwargs: Any):
+        """Initialize the server.
+        
+        Args:
+            *args: Positional arguments for FastMCP
+            metrics: Metrics to record into
+            **kwargs: Keyword arguments for FastMCP
+        """
+        super().__init__(*args, **kwargs)
+        self.metrics = metrics
+        
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
+        """Call a tool, timing the handler and the result conversion separately."""
+        self.metrics.loop_monitor.ensure_running()
+        tool = self._tool_manager.get_tool(name)
+        tool_label = name if tool is not None else "unknown"
+        started = time.perf_counter()
+        status = "error"
+        
+        try:
+            result = await self._tool_manager.call_tool(
+                name, arguments, context=self.get_context(), convert_result=False
+            )
+            
+            serialization_started = time.perf_counter()
+            try:
+                converted = tool.fn_metadata.convert_result(result)
+            except Exception as e:
+                raise ToolError(f"Error executing tool {name}: {e}") from e
+            self.metrics.stage_duration.observe(time.perf_counter() - serialization_started, stage="serialization")
+            self.metrics.response_bytes.observe(_content_bytes(converted), tool=tool_label)
+            
+            status = "ok"
+            return converted
+        finally:
+            self.metrics.tool_duration.observe(time.perf_counter() - started, tool=tool_label, status=status)
@@ -0,0 +1,102 @@
+"""Policy-driven MCP log notifications.
+
+Every ``ctx.info`` call in a tool becomes a separate notification message
+on the SSE or streamable-http stream. ``ContextNotifier`` wraps the request
+context and applies a server-wide policy:
+
+- ``off``: send nothing
+- ``errors``: send only errors
+- ``summary``: collect messages and send one notification when the call ends
+- ``verbose``: send every message as it happens
+
+Messages take ``%``-style arguments that are only formatted when the message
+will actually be sent, so filtered messages cost almost nothing.
+"""
+
+import logging
+from typing import Any, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_POLICIES = ("off", "errors", "summary", "verbose")
+
+_LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+_THRESHOLDS = {"off": None, "errors": 40, "summary": 20, "verbose": 10}
+
+
+class ContextNotifier:
+    """Sends MCP log notifications for one tool call according to a policy."""
+    
+    def __init__(self, ctx: Any, policy: str = "errors"):
+        """Initialize the notifier.
+        
+        Args:
+            ctx: FastMCP request context used to send notifications
+            policy: One of ``NOTIFICATION_POLICIES``
+            
+        Raises:
+            ValueError: If the policy is unknown
+        """
+        if policy not in _THRESHOLDS:
+            raise ValueError(f"Unknown notification policy: {policy}")
+            
+        self.ctx = ctx
+        self.policy = policy
+        self._threshold = _THRESHOLDS[policy]
+        self._pending: List[Tuple[str, str, tuple]] = []
+        
+    def enabled_for(self, level: str) -> bool:
+        """Check whether messages of a level would be sent.
+        
+        Args:
+            level: Level name (debug, info, warning or error)
+            
+        Returns:
+            True if the policy lets the level through
+        """
+        return self._threshold is not None and _LEVELS[level] >= self._threshold
+        
+    async def debug(self, message: str, *args: Any) -> None:
+        """Send or collect a debug message."""
+        await self._log("debug", message, args)
+        
+    async def info(self, message: str, *args: Any) -> None:
+        """Send or collect an info message."""
+        await self._log("info", message, args)
+        
+    async def warning(self, message: str, *args: Any) -> None:
+        """Send or collect a warning message."""
+        await self._log("warning", message, args)
+        
+    async def error(self, message: str, *args: Any) -> None:
+        """Send or collect an error message."""
+        await self._log("error", message, args)
+        
+    async def flush(self) -> None:
+        """Send collected messages as a single notification (summary policy)."""
+        if not self._pending:
+            return
+            
+        level = max((entry[0] for entry in self._pending), key=_LEVELS.__getitem__)
+        text = "; ".join(_format(message, args) for _, message, args in self._pending)
+        self._pending.clear()
+        await self._send(level, text)
+        
+    async def _log(self, level: str, message: str, args: tuple) -> None:
+        if not self.enabled_for(level):
+            return
+        if self.policy == "summary":
+            self._pending.append((level, message, args))
+            return
+        await self._send(level, _format(message, args))
+        
+    async def _send(self, level: str, text: str) -> None:
+        try:
+            await getattr(self.ctx, level)(text)
+        except Exception as e:
+            # A client that went away must not turn a successful call into an error
+            logger.debug(f"Could not send {level} notification: {e}")
+
+
+def _format(message: str, args: tuple) -> str:
+    return message % args if args else message
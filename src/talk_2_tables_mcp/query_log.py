@@ -0,0 +1,228 @@
+"""Query log for warm-start replay.
+
+Successful queries are counted per fingerprint, the query shape with its
+literal values stripped, so the log never holds the values users queried
+for. Counting happens in memory; a background task adds the new counts to
+a JSON file every few seconds, off the event loop, so worker processes
+sharing the file all contribute, and only the most frequent fingerprints
+are kept so the file stays small.
+
+On startup the most frequent fingerprints can be replayed so their
+statements and pages are warm before the first user request arrives. A
+fingerprint alone matches no rows, so one recent query per fingerprint is
+kept as its representative in a separate sample file, readable only by the
+server's user. The counts file can be shared or inspected without exposing
+query values; the sample file is never exported.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_LINE_COMMENT = re.compile(r'--[^\n]*')
+_BLOCK_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+
+# Fingerprints kept in the log file, the most frequent first
+MAX_FINGERPRINTS = 1000
+
+# Seconds between writes of the counts to the log file
+FLUSH_INTERVAL = 10.0
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query's formatting without changing its meaning.
+    
+    Comments are removed, whitespace is collapsed and a trailing semicolon is
+    dropped. Literal values are preserved.
+    
+    Args:
+        query: SQL query text
+        
+    Returns:
+        Normalized query text
+    """
+    query = _BLOCK_COMMENT.sub(' ', _LINE_COMMENT.sub(' ', query))
+    return ' '.join(query.split()).rstrip(';').strip()
+
+
+def fingerprint_query(query: str) -> str:
+    """Compute a literal-insensitive fingerprint of a query.
+    
+    Args:
+        query: SQL query text
+        
+    Returns:
+        Lowercased query shape with literals replaced by ``?``
+    """
+    shape = _STRING_LITERAL.sub('?', normalize_query(query))
+    shape = _NUMBER_LITERAL.sub('?', shape)
+    shape = _IN_LIST.sub('(?)', shape)
+    return shape.lower()
+
+
+class QueryLog:
+    """Counts of executed query shapes, written to a file in the background."""
+    
+    def __init__(
+        self,
+        path: str,
+        max_fingerprints: int = MAX_FINGERPRINTS,
+        flush_interval: float = FLUSH_INTERVAL
+    ):
+        """Initialize the query log and load the counts written so far.
+        
+        Args:
+            path: Path of the JSON file holding the counts
+            max_fingerprints: Most fingerprints kept in the file
+            flush_interval: Seconds between writes of the counts
+        """
+        self.path = Path(path)
+        self._samples_path = self.path.with_name(f"{self.path.name}.samples")
+        self.max_fingerprints = max_fingerprints
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._counts: Counter = self._load()
+        self._pending: Counter = Counter()
+        self._samples: Dict[str, str] = self._load_samples()
+        self._pending_samples: Dict[str, str] = {}
+        self._task: Optional[asyncio.Task] = None
+        
+    def record(self, query: str) -> None:
+        """Count a successfully executed query.
+        
+        Only updates the in-memory counts; see ``flush``.
+        
+        Args:
+            query: SQL query text
+        """
+        fingerprint = fingerprint_query(query)
+        with self._lock:
+            self._pending[fingerprint] += 1
+            self._pending_samples[fingerprint] = normalize_query(query)
+            
+    def ensure_running(self) -> None:
+        """Start writing the counts periodically on the running event loop if not already doing so."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            
+    def close(self) -> None:
+        """Stop the periodic writes and write any pending counts."""
+        if self._task is not None:
+            try:
+                self._task.cancel()
+            except RuntimeError:
+                # The task's event loop has already been closed
+                pass
+            self._task = None
+        self.flush()
+        
+    def flush(self) -> None:
+        """Add the counts recorded since the last flush to the log file.
+        
+        The file is re-read first so counts written by other processes are
+        kept, the least frequent fingerprints beyond ``max_fingerprints`` are
+        dropped, and the file is replaced atomically. The sample file is
+        updated the same way and keeps samples only for the kept fingerprints.
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, Counter()
+                pending_samples, self._pending_samples = self._pending_samples, {}
+            if not pending:
+                return
+                
+            merged = self._load() + pending
+            merged = Counter(dict(merged.most_common(self.max_fingerprints)))
+            samples = {**self._load_samples(), **pending_samples}
+            samples = {fingerprint: samples[fingerprint] for fingerprint in merged if fingerprint in samples}
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._write(self._samples_path, samples, 0o600)
+                self._write(self.path, dict(merged), 0o666)
+            except OSError as e:
+                logger.warning(f"Could not write query log {self.path}: {e}")
+                with self._lock:
+                    self._pending.update(pending)
+                    self._pending_samples = {**pending_samples, **self._pending_samples}
+                return
+                
+            with self._lock:
+                self._counts = merged
+                self._samples = samples
+                
+    def top_queries(self, limit: int) -> List[str]:
+        """Get the representative query of each of the most frequent fingerprints.
+        
+        Fingerprints without a sample, for example from a lost sample file,
+        are skipped.
+        
+        Args:
+            limit: Maximum number of queries to return
+            
+        Returns:
+            Recently executed queries of the top fingerprints, most frequent first
+        """
+        if limit <= 0:
+            return []
+        with self._lock:
+            ranked = (self._counts + self._pending).most_common()
+            samples = {**self._samples, **self._pending_samples}
+        queries = [samples[fingerprint] for fingerprint, _ in ranked if fingerprint in samples]
+        return queries[:limit]
+        
+    def _load(self) -> Counter:
+        """Read the counts written by earlier runs."""
+        document = self._read(self.path)
+        return Counter({
+            fingerprint: count for fingerprint, count in document.items()
+            if isinstance(fingerprint, str) and isinstance(count, int)
+        })
+        
+    def _load_samples(self) -> Dict[str, str]:
+        """Read the representative queries written by earlier runs."""
+        document = self._read(self._samples_path)
+        return {
+            fingerprint: query for fingerprint, query in document.items()
+            if isinstance(fingerprint, str) and isinstance(query, str) and fingerprint_query(query) == fingerprint
+        }
+        
+    @staticmethod
+    def _read(path: Path) -> dict:
+        """Read a JSON object from a log file, or an empty one if it is missing or unreadable."""
+        if not path.exists():
+            return {}
+        try:
+            document = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable query log {path}: {e}")
+            return {}
+        if not isinstance(document, dict):
+            logger.warning(f"Ignoring query log {path} in an unknown format")
+            return {}
+        return document
+        
+    @staticmethod
+    def _write(path: Path, document: dict, mode: int) -> None:
+        """Replace a log file atomically, creating it with the given permissions."""
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        descriptor = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as handle:
+            handle.write(json.dumps(document))
+        os.replace(temporary, path)
+        
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await asyncio.to_thread(self.flush)
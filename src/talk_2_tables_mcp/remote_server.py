@@ -7,12 +7,12 @@ in remote mode with sensible defaults for network deployment.
 
 import asyncio
 import logging
-import signal
 import sys
 from typing import Optional
 
 from .config import ServerConfig, setup_logging
 from .server import Talk2TablesMCP
+from .workers import run_workers
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +28,6 @@ class RemoteServerManager:
         """
         self.config = config
         self.server: Optional[Talk2TablesMCP] = None
-        self._shutdown_event = asyncio.Event()
     
     async def start(self) -> None:
         """Start the remote MCP server."""
@@ -37,6 +36,7 @@ class RemoteServerManager:
         logger.info(f"Transport: {self.config.transport}")
         logger.info(f"Address: {self.config.host}:{self.config.port}")
         logger.info(f"Database: {self.config.database_path}")
+        logger.info(f"Shutdown drain timeout: {self.config.drain_timeout:.0f}s")
         
         if self.config.stateless_http:
             logger.info("Mode: Stateless HTTP")
@@ -54,9 +54,6 @@ class RemoteServerManager:
             # Validate database connection
             await self._validate_database()
             
-            # Setup signal handlers for graceful shutdown
-            self._setup_signal_handlers()
-            
             logger.info("Starting server...")
             
             # Start the server
@@ -79,59 +76,27 @@ class RemoteServerManager:
             raise
     
     async def _run_server(self) -> None:
-        """Run the server with graceful shutdown support."""
-        # Create a task for the server
-        server_task = asyncio.create_task(self._server_runner())
-        
-        # Wait for either the server to complete or shutdown signal
-        shutdown_task = asyncio.create_task(self._shutdown_event.wait())
+        """Run the server until it has drained and shut down.
         
-        try:
-            done, pending = await asyncio.wait(
-                [server_task, shutdown_task],
-                return_when=asyncio.FIRST_COMPLETED
-            )
-            
-            # Cancel any pending tasks
-            for task in pending:
-                task.cancel()
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    pass
-            
-        except Exception as e:
-            logger.error(f"Server error: {e}")
-            raise
-        finally:
-            logger.info("Server shutdown complete")
-    
-    async def _server_runner(self) -> None:
-        """Run the actual MCP server."""
+        SIGINT and SIGTERM start a drain: new sessions and queries are
+        refused, running queries get ``drain_timeout`` seconds to finish and
+        are interrupted after that, then the server closes its connections.
+        A second SIGINT stops the server without waiting for the drain.
+        """
         try:
             # Use the async run method for proper asyncio handling
             await self.server.run_async()
         except Exception as e:
             logger.error(f"Server runtime error: {e}")
             raise
-    
-    def _setup_signal_handlers(self) -> None:
-        """Setup signal handlers for graceful shutdown."""
-        def signal_handler(signum, frame):
-            logger.info(f"Received signal {signum}, initiating graceful shutdown...")
-            asyncio.create_task(self._shutdown())
-        
-        # Handle common shutdown signals
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
-        
-        if hasattr(signal, 'SIGHUP'):
-            signal.signal(signal.SIGHUP, signal_handler)
+        finally:
+            logger.info("Server shutdown complete")
     
     async def _shutdown(self) -> None:
-        """Initiate graceful shutdown."""
+        """Initiate graceful shutdown and wait for the drain to finish."""
         logger.info("Shutting down server...")
-        self._shutdown_event.set()
+        if self.server is not None and self.server.http_server is not None:
+            await self.server.http_server.begin_drain()
 
 
 def create_remote_config() -> ServerConfig:
@@ -154,14 +119,22 @@ def create_remote_config() -> ServerConfig:
     # Enable features useful for remote deployment
     config.allow_cors = True
     
+    # Worker processes don't share sessions, so multi-worker deployments run stateless
+    if config.workers > 1 and config.transport == "streamable-http":
+        config.stateless_http = True
+    
     return config
 
 
-async def main() -> None:
-    """Main entry point for the remote server."""
+async def main(config: Optional[ServerConfig] = None) -> None:
+    """Main entry point for the remote server.
+    
+    Args:
+        config: Configuration to use instead of the remote defaults
+    """
     try:
         # Create remote-optimized configuration
-        config = create_remote_config()
+        config = config or create_remote_config()
         
         # Setup logging
         setup_logging(config)
@@ -181,7 +154,14 @@ async def main() -> None:
 def run_remote_server() -> None:
     """Synchronous entry point for the remote server."""
     try:
-        asyncio.run(main())
+        config = create_remote_config()
+        
+        if config.workers > 1:
+            # Workers run their own event loops, so the supervisor stays synchronous
+            setup_logging(config)
+            run_workers(config)
+        else:
+            asyncio.run(main(config))
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
     except Exception as e:
@@ -0,0 +1,172 @@
+"""Database resources exposed by the MCP server.
+
+Every document carries the ``version`` it was built from and is cached in
+the server's metadata cache under that version, so clients can compare
+versions instead of refetching and the server rebuilds documents only after
+the database, metadata file or column statistics change.
+"""
+
+import json
+import logging
+from typing import TYPE_CHECKING
+
+from .database import DatabaseError
+
+if TYPE_CHECKING:
+    from .server import Talk2TablesMCP
+
+logger = logging.getLogger(__name__)
+
+
+def register_database_resources(server: "Talk2TablesMCP") -> None:
+    """Register the ``database://`` resources on a server.
+    
+    Args:
+        server: Server to register the resources on
+    """
+    
+    @server.mcp.resource("database://metadata")
+    async def get_database_metadata() -> str:
+        """Get database metadata and schema information.
+        
+        Returns:
+            JSON string containing database metadata
+            
+        Raises:
+            ValueError: If metadata cannot be retrieved
+        """
+        
+        try:
+            version = await server._get_metadata_version()
+            cached = server.metadata_cache.get("database://metadata", version)
+            if cached is not None:
+                return cached
+            
+            metadata = await server._load_metadata()
+            document = json.dumps({**metadata, "version": version}, indent=2)
+            server.metadata_cache.put("database://metadata", version, document)
+            return document
+            
+        except DatabaseError as e:
+            error_msg = f"Database error retrieving metadata: {e}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        except Exception as e:
+            error_msg = f"Unexpected error retrieving metadata: {e}"
+            logger.error(error_msg)
+            logger.exception("Unexpected error in get_database_metadata")
+            raise ValueError(error_msg)
+    
+    @server.mcp.resource("database://tables")
+    async def list_database_tables() -> str:
+        """List the tables available in the database.
+        
+        Returns:
+            JSON string with table names and descriptions
+            
+        Raises:
+            ValueError: If the table list cannot be retrieved
+        """
+        try:
+            version = await server._get_metadata_version()
+            cached = server.metadata_cache.get("database://tables", version)
+            if cached is not None:
+                return cached
+            
+            metadata = await server._load_metadata()
+            tables = [
+                {
+                    "name": table_name,
+                    "description": table_info.get("description", ""),
+                    "uri": f"database://tables/{table_name}"
+                }
+                for table_name, table_info in metadata.get("tables", {}).items()
+            ]
+            document = json.dumps({"tables": tables, "version": version}, indent=2)
+            server.metadata_cache.put("database://tables", version, document)
+            return document
+            
+        except DatabaseError as e:
+            error_msg = f"Database error listing tables: {e}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+    
+    @server.mcp.resource("database://tables/{name}")
+    async def get_table_metadata(name: str) -> str:
+        """Get schema information for a single table.
+        
+        Args:
+            name: Table name
+            
+        Returns:
+            JSON string containing the table's metadata
+            
+        Raises:
+            ValueError: If the table is unknown or metadata cannot be retrieved
+        """
+        uri = f"database://tables/{name}"
+        
+        try:
+            version = await server._get_metadata_version()
+            cached = server.metadata_cache.get(uri, version)
+            if cached is not None:
+                return cached
+            
+            metadata = await server._load_metadata()
+            table_info = metadata.get("tables", {}).get(name)
+            if table_info is None:
+                raise ValueError(f"Table not found: {name}")
+            
+            relationships = [
+                relationship for relationship in metadata.get("relationships", [])
+                if name in (relationship.get("from_table"), relationship.get("to_table"))
+            ]
+            
+            table_metadata = {
+                "name": name,
+                **table_info,
+                "relationships": relationships,
+                "version": version
+            }
+            document = json.dumps(table_metadata, indent=2)
+            server.metadata_cache.put(uri, version, document)
+            return document
+            
+        except DatabaseError as e:
+            error_msg = f"Database error retrieving table metadata: {e}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+    
+    @server.mcp.resource("database://tables/{name}/sample")
+    async def get_table_sample(name: str) -> str:
+        """Get a small sample of rows from a table.
+        
+        Args:
+            name: Table name
+            
+        Returns:
+            JSON string containing sample rows
+            
+        Raises:
+            ValueError: If the table is unknown or cannot be sampled
+        """
+        uri = f"database://tables/{name}/sample"
+        
+        try:
+            version = await server._get_metadata_version()
+            cached = server.metadata_cache.get(uri, version)
+            if cached is not None:
+                return cached
+            
+            if server.db_handler is None:
+                await server._initialize_database_handler_simple()
+            
+            sample = server.db_handler.get_table_sample(name, server.config.table_sample_rows)
+            document = json.dumps({"name": name, **sample, "version": version}, indent=2, default=str)
+            server.metadata_cache.put(uri, version, document)
+            return document
+            
+        except DatabaseError as e:
+            error_msg = f"Database error sampling table: {e}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
@@ -8,14 +8,28 @@ import argparse
 import asyncio
 import json
 import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 
+import uvicorn
 from mcp.server.fastmcp import Context, FastMCP
 from pydantic import BaseModel, Field
 
+from .admission import AdmissionController, AdmissionRejected, client_key
 from .config import ServerConfig, load_config, setup_logging
 from .database import DatabaseError, DatabaseHandler
+from .drain import SHUTDOWN_GRACE, DrainController, DrainMiddleware, DrainingServer, ServerDraining
+from .metadata_cache import MetadataCache
+from .metrics import InstrumentedFastMCP, ServerMetrics
+from .notifications import ContextNotifier
+from .query_log import QueryLog, normalize_query
+from .resources import register_database_resources
+from .server_stats import register_metrics_route, register_stats_resource
+from .singleflight import SingleFlight
+from .versioning import ChangeNotifier, DatabaseVersionTracker, register_subscriptions
+from .stats import BackgroundStatsProfiler, ColumnStatsProfiler, StatsCache, merge_stats_into_tables
+from .warm_start import warm_up
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +52,7 @@ class QueryResult(BaseModel):
     rows: List[Dict[str, Any]] = Field(description="Result rows as dictionaries")
     row_count: int = Field(description="Number of rows returned")
     query: str = Field(description="The executed query")
+    version: Optional[str] = Field(default=None, description="Database version the result was computed from")
 
 
 class DatabaseMetadata(BaseModel):
@@ -62,11 +77,34 @@ class Talk2TablesMCP:
         """
         self.config = config
         self.db_handler: DatabaseHandler = None
-        self.mcp = FastMCP(name=config.server_name)
+        self.metadata_cache = MetadataCache()
+        self.stats_cache = StatsCache()
+        self.stats_profiler: Optional[BackgroundStatsProfiler] = None
+        self.query_log: Optional[QueryLog] = QueryLog(config.query_log_path) if config.query_log_path else None
+        self.admission = AdmissionController(
+            config.max_concurrent_queries,
+            config.max_queued_queries,
+            config.queue_timeout
+        )
+        self.singleflight = SingleFlight()
+        self.drain = DrainController()
+        self.http_server: Optional[DrainingServer] = None
+        self.metrics = ServerMetrics()
+        self.version_tracker = DatabaseVersionTracker(
+            config.get_absolute_database_path(),
+            config.get_absolute_metadata_path()
+        )
+        self.change_notifier = ChangeNotifier(self.version_tracker, config.change_poll_interval)
+        self._warm_start_task: Optional[asyncio.Task] = None
+        self.mcp = InstrumentedFastMCP(name=config.server_name, metrics=self.metrics, lifespan=self._lifespan)
         
         # Register tools and resources
         self._register_tools()
-        self._register_resources()
+        register_database_resources(self)
+        register_stats_resource(self)
+        register_subscriptions(self.mcp, self.change_notifier)
+        if config.enable_metrics:
+            register_metrics_route(self)
         
         logger.info(f"Initialized {config.server_name} v{config.server_version}")
     
@@ -87,7 +125,8 @@ class Talk2TablesMCP:
             Raises:
                 ValueError: If query is invalid or execution fails
             """
-            await ctx.info(f"Executing query: {query[:100]}...")
+            notifier = ContextNotifier(ctx, self.config.log_notifications)
+            await notifier.info("Executing query: %.100s...", query)
             
             try:
                 # Validate query length
@@ -96,96 +135,252 @@ class Talk2TablesMCP:
                 
                 # Initialize database handler if needed
                 if self.db_handler is None:
-                    await self._initialize_database_handler(ctx)
+                    await self._initialize_database_handler(notifier)
                 
-                # Execute query
-                result = self.db_handler.execute_query(query)
+                # Identical concurrent queries share one execution and result
+                self.change_notifier.ensure_running()
+                version = self._get_database_version()
+                result, truncated = await self.singleflight.do(
+                    (normalize_query(query), version),
+                    lambda: self._run_query(query, client_key(ctx), version)
+                )
                 
-                # Apply row limit
-                if result["row_count"] > self.config.max_result_rows:
-                    await ctx.warning(f"Result truncated to {self.config.max_result_rows} rows")
-                    result["rows"] = result["rows"][:self.config.max_result_rows]
-                    result["row_count"] = len(result["rows"])
+                if truncated:
+                    await notifier.warning("Result truncated to %d rows", self.config.max_result_rows)
+                if result.query != query:
+                    result = result.model_copy(update={"query": query})
                 
-                await ctx.info(f"Query completed successfully, returned {result['row_count']} rows")
+                if self.query_log is not None:
+                    self.query_log.record(query)
+                    self.query_log.ensure_running()
                 
-                return QueryResult(
-                    columns=result["columns"],
-                    rows=result["rows"],
-                    row_count=result["row_count"],
-                    query=query
-                )
+                self.metrics.rows_returned.observe(result.row_count)
+                await notifier.info("Query completed successfully, returned %d rows", result.row_count)
+                
+                return result
                 
+            except AdmissionRejected as e:
+                # Surface the retry hint unchanged so clients can back off
+                await notifier.warning("%s", e)
+                raise
             except DatabaseError as e:
+                if self.drain.draining:
+                    # Interrupted by the shutdown drain; another instance can take the retry
+                    await notifier.warning("Query interrupted by server shutdown")
+                    raise ServerDraining("Query interrupted by server shutdown") from e
                 error_msg = f"Database error: {e}"
-                await ctx.error(error_msg)
+                await notifier.error(error_msg)
                 raise ValueError(error_msg)
             except Exception as e:
                 error_msg = f"Unexpected error executing query: {e}"
-                await ctx.error(error_msg)
+                await notifier.error(error_msg)
                 logger.exception("Unexpected error in execute_query")
                 raise ValueError(error_msg)
+            finally:
+                await notifier.flush()
     
-    def _register_resources(self) -> None:
-        """Register MCP resources."""
+    async def _load_metadata(self) -> Dict[str, Any]:
+        """Load metadata from the metadata file or generate it from the database.
         
-        @self.mcp.resource("database://metadata")
-        async def get_database_metadata() -> str:
-            """Get database metadata and schema information.
+        Returns:
+            Metadata dictionary
             
-            Returns:
-                JSON string containing database metadata
-                
-            Raises:
-                ValueError: If metadata cannot be retrieved
-            """
+        Raises:
+            DatabaseError: If metadata has to be generated and the database fails
+        """
+        # Try to load metadata from file first
+        metadata_path = self.config.get_absolute_metadata_path()
+        
+        if metadata_path.exists():
+            logger.debug(f"Loading metadata from file: {metadata_path}")
+            with open(metadata_path, 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+            return self._attach_column_stats(metadata)
+        
+        # Generate metadata from database if file doesn't exist
+        logger.info("Metadata file not found, generating from database")
+        
+        # Initialize database handler if needed
+        if self.db_handler is None:
+            await self._initialize_database_handler_simple()
+        
+        # Get schema information
+        schema_info = self.db_handler.get_schema_info()
+        
+        # Create metadata structure
+        metadata = {
+            "server_name": self.config.server_name,
+            "database_path": str(schema_info["database_path"]),
+            "description": "SQLite database accessible via MCP server",
+            "business_use_cases": [
+                "Data analysis and reporting",
+                "Business intelligence queries",
+                "Data exploration and discovery"
+            ],
+            "tables": schema_info["tables"],
+            "last_updated": "Generated dynamically"
+        }
+        
+        logger.info("Database metadata generated successfully")
+        return self._attach_column_stats(metadata)
+    
+    def _attach_column_stats(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge profiled column statistics into the metadata tables.
+        
+        Args:
+            metadata: Metadata dictionary
             
-            try:
-                # Try to load metadata from file first
-                metadata_path = self.config.get_absolute_metadata_path()
-                
-                if metadata_path.exists():
-                    logger.debug(f"Loading metadata from file: {metadata_path}")
-                    with open(metadata_path, 'r', encoding='utf-8') as f:
-                        metadata = json.load(f)
-                    return json.dumps(metadata, indent=2)
-                
-                # Generate metadata from database if file doesn't exist
-                logger.info("Metadata file not found, generating from database")
-                
-                # Initialize database handler if needed
-                if self.db_handler is None:
-                    await self._initialize_database_handler_simple()
-                
-                # Get schema information
-                schema_info = self.db_handler.get_schema_info()
-                
-                # Create metadata structure
-                metadata = {
-                    "server_name": self.config.server_name,
-                    "database_path": str(schema_info["database_path"]),
-                    "description": "SQLite database accessible via MCP server",
-                    "business_use_cases": [
-                        "Data analysis and reporting",
-                        "Business intelligence queries",
-                        "Data exploration and discovery"
-                    ],
-                    "tables": schema_info["tables"],
-                    "last_updated": "Generated dynamically"
-                }
-                
-                logger.info("Database metadata generated successfully")
-                return json.dumps(metadata, indent=2)
-                
-            except DatabaseError as e:
-                error_msg = f"Database error retrieving metadata: {e}"
-                logger.error(error_msg)
-                raise ValueError(error_msg)
-            except Exception as e:
-                error_msg = f"Unexpected error retrieving metadata: {e}"
-                logger.error(error_msg)
-                logger.exception("Unexpected error in get_database_metadata")
-                raise ValueError(error_msg)
+        Returns:
+            Metadata with ``column_stats`` added to profiled tables
+        """
+        if self.stats_cache.version == 0 or not isinstance(metadata.get("tables"), dict):
+            return metadata
+        
+        return {**metadata, "tables": merge_stats_into_tables(metadata["tables"], self.stats_cache)}
+    
+    async def _get_metadata_version(self) -> str:
+        """Compute the version key for metadata-derived resources.
+        
+        The version combines the database version, the metadata file's
+        modification time and the column statistics version, so any of them
+        changing invalidates cached resources.
+        
+        Returns:
+            Version string
+        """
+        parts = []
+        
+        database_path = self.config.get_absolute_database_path()
+        if database_path.exists():
+            if self.db_handler is None:
+                await self._initialize_database_handler_simple()
+            self.change_notifier.ensure_running()
+            parts.append(self._get_database_version())
+        
+        metadata_path = self.config.get_absolute_metadata_path()
+        if metadata_path.exists():
+            parts.append(f"m{metadata_path.stat().st_mtime_ns}")
+        
+        if self.stats_cache.version:
+            parts.append(f"t{self.stats_cache.version}")
+        
+        return "-".join(parts) or "empty"
+    
+    async def _run_query(self, query: str, client: str, version: Optional[str] = None) -> Tuple[QueryResult, bool]:
+        """Execute a query under admission control and apply the row limit.
+        
+        Args:
+            query: SQL SELECT statement to execute
+            client: Fairness key of the requesting client
+            version: Database version stamped on the result
+            
+        Returns:
+            Query result and whether it was truncated
+        """
+        # Wait for an execution slot, then run the query off the event loop
+        timings: Dict[str, float] = {}
+        async with self.drain.track(), self.admission.admit(client):
+            result = await asyncio.to_thread(self.db_handler.execute_query, query, timings)
+        
+        for stage, seconds in timings.items():
+            self.metrics.stage_duration.observe(seconds, stage=stage)
+        
+        truncated = result["row_count"] > self.config.max_result_rows
+        rows = result["rows"][:self.config.max_result_rows] if truncated else result["rows"]
+        
+        query_result = QueryResult(
+            columns=result["columns"], rows=rows, row_count=len(rows), query=query, version=version
+        )
+        return query_result, truncated
+    
+    def _get_database_version(self) -> str:
+        """Get the version key for the database contents.
+        
+        The change notifier refreshes the version in the background, so
+        this does not read the database.
+        
+        Returns:
+            Version string combining the schema version and data fingerprint
+        """
+        return self.version_tracker.database_version
+    
+    def start_background_tasks(self) -> None:
+        """Start optional background workers such as the statistics profiler."""
+        if self.config.enable_column_stats and self.stats_profiler is None:
+            if not ColumnStatsProfiler.is_available():
+                logger.warning("Column statistics require NumPy; install talk-2-tables-mcp[stats]")
+                return
+            
+            profiler = ColumnStatsProfiler(
+                str(self.config.get_absolute_database_path()),
+                sample_rows=self.config.stats_sample_rows,
+                top_k=self.config.stats_top_k
+            )
+            self.stats_profiler = BackgroundStatsProfiler(
+                profiler,
+                self.stats_cache,
+                self._get_database_version,
+                refresh_interval=self.config.stats_refresh_interval
+            )
+            self.stats_profiler.start()
+    
+    async def warm_up(self) -> Dict[str, Any]:
+        """Prepare connections and caches before the server reports ready.
+        
+        Returns:
+            Summary of the warm-up work
+        """
+        return await warm_up(self)
+    
+    async def _warm_start(self) -> None:
+        """Warm the server up once; later callers wait for the same run."""
+        if self._warm_start_task is None:
+            self._warm_start_task = asyncio.ensure_future(self.warm_up())
+        await asyncio.shield(self._warm_start_task)
+    
+    @asynccontextmanager
+    async def _lifespan(self, app: FastMCP) -> AsyncIterator[Dict[str, Any]]:
+        """Warm the server up on the serving event loop before a session starts."""
+        if self.config.warm_start:
+            await self._warm_start()
+        yield {}
+    
+    def stop_background_tasks(self) -> None:
+        """Stop background workers and write the query log counts still pending."""
+        if self.stats_profiler is not None:
+            self.stats_profiler.stop(timeout=5.0)
+            self.stats_profiler = None
+        if self.query_log is not None:
+            self.query_log.close()
+    
+    async def drain_queries(self) -> Dict[str, Any]:
+        """Stop accepting queries and let running ones finish.
+        
+        Queries still running after ``drain_timeout`` seconds are interrupted.
+        
+        Returns:
+            Drain statistics
+        """
+        return await self.drain.drain(self.config.drain_timeout, interrupt=self._interrupt_queries)
+    
+    def _interrupt_queries(self) -> int:
+        """Abort the SQLite statements that are still running.
+        
+        Returns:
+            Number of statements interrupted
+        """
+        if self.db_handler is None:
+            return 0
+        return self.db_handler.interrupt()
+    
+    def close(self) -> None:
+        """Stop background work and close all database connections."""
+        self.stop_background_tasks()
+        self.change_notifier.stop()
+        self.metrics.loop_monitor.stop()
+        self.version_tracker.close()
+        if self.db_handler is not None:
+            self.db_handler.close()
     
     async def _initialize_database_handler_simple(self) -> None:
         """Initialize the database handler without context."""
@@ -195,7 +390,7 @@ class Talk2TablesMCP:
         logger.debug(f"Database path: {database_path}")
         
         try:
-            self.db_handler = DatabaseHandler(str(database_path))
+            self.db_handler = DatabaseHandler(str(database_path), pool_size=self.config.db_pool_size)
             
             # Test connection
             if self.db_handler.test_connection():
@@ -208,11 +403,11 @@ class Talk2TablesMCP:
             logger.error(error_msg)
             raise DatabaseError(error_msg)
     
-    async def _initialize_database_handler(self, ctx: Context) -> None:
+    async def _initialize_database_handler(self, ctx: Union[Context, ContextNotifier]) -> None:
         """Initialize the database handler.
         
         Args:
-            ctx: MCP context for logging
+            ctx: MCP context or notifier for logging
             
         Raises:
             DatabaseError: If database initialization fails
@@ -223,7 +418,7 @@ class Talk2TablesMCP:
         await ctx.debug(f"Database path: {database_path}")
         
         try:
-            self.db_handler = DatabaseHandler(str(database_path))
+            self.db_handler = DatabaseHandler(str(database_path), pool_size=self.config.db_pool_size)
             
             # Test connection
             if self.db_handler.test_connection():
@@ -236,21 +431,16 @@ class Talk2TablesMCP:
             await ctx.error(error_msg)
             raise DatabaseError(error_msg)
     
-    def run(self, **kwargs) -> None:
-        """Run the MCP server.
-        
-        Args:
-            **kwargs: Additional arguments to pass to FastMCP.run()
-        """
-        logger.info(f"Starting {self.config.server_name} server")
-        
-        # Configure server settings before running
+    def _configure_transport(self) -> None:
+        """Apply host, port and HTTP options to the FastMCP settings."""
         if self.config.transport in ["sse", "streamable-http"]:
             # Set host and port in server settings
             if hasattr(self.mcp.settings, 'host'):
                 self.mcp.settings.host = self.config.host
             if hasattr(self.mcp.settings, 'port'):
                 self.mcp.settings.port = self.config.port
+            if hasattr(self.mcp.settings, 'log_level'):
+                self.mcp.settings.log_level = self.config.log_level
                 
             # Configure stateless mode if enabled
             if self.config.stateless_http and hasattr(self.mcp.settings, 'stateless_http'):
@@ -260,6 +450,70 @@ class Talk2TablesMCP:
             if self.config.json_response and hasattr(self.mcp.settings, 'json_response'):
                 self.mcp.settings.json_response = True
         
+        # Log server startup information
+        if self.config.transport != "stdio":
+            logger.info(f"Server will be accessible at http://{self.config.host}:{self.config.port}")
+            if self.config.stateless_http:
+                logger.info("Running in stateless HTTP mode")
+            if self.config.json_response:
+                logger.info("Using JSON responses instead of SSE streams")
+    
+    def http_app(self):
+        """Build the ASGI application for the configured HTTP transport.
+        
+        Returns:
+            Starlette application serving the MCP endpoint
+            
+        Raises:
+            ValueError: If the transport is not HTTP based
+        """
+        self._configure_transport()
+        if self.config.transport == "sse":
+            app = self.mcp.sse_app()
+        elif self.config.transport == "streamable-http":
+            app = self.mcp.streamable_http_app()
+        else:
+            raise ValueError(f"No HTTP application for transport: {self.config.transport}")
+        
+        # Refuse new sessions while draining for shutdown
+        settings = self.mcp.settings
+        app.add_middleware(
+            DrainMiddleware,
+            controller=self.drain,
+            paths=[settings.streamable_http_path, settings.sse_path, settings.message_path]
+        )
+        return app
+    
+    def create_http_server(self) -> DrainingServer:
+        """Build the HTTP server, which drains running queries on shutdown.
+        
+        Returns:
+            Uvicorn server for the configured HTTP transport
+            
+        Raises:
+            ValueError: If the transport is not HTTP based
+        """
+        uvicorn_config = uvicorn.Config(
+            self.http_app(),
+            host=self.config.host,
+            port=self.config.port,
+            log_level=self.config.log_level.lower(),
+            timeout_graceful_shutdown=SHUTDOWN_GRACE
+        )
+        self.http_server = DrainingServer(uvicorn_config, self.drain_queries)
+        return self.http_server
+    
+    def run(self, **kwargs) -> None:
+        """Run the MCP server.
+        
+        Args:
+            **kwargs: Additional arguments to pass to FastMCP.run()
+        """
+        logger.info(f"Starting {self.config.server_name} server")
+        
+        # Configure server settings before running
+        self._configure_transport()
+        
         # Prepare run arguments
         run_kwargs = {
             "transport": self.config.transport
@@ -268,15 +522,13 @@ class Talk2TablesMCP:
         # Override with any additional kwargs
         run_kwargs.update(kwargs)
         
-        # Log server startup information
-        if self.config.transport != "stdio":
-            logger.info(f"Server will be accessible at http://{self.config.host}:{self.config.port}")
-            if self.config.stateless_http:
-                logger.info("Running in stateless HTTP mode")
-            if self.config.json_response:
-                logger.info("Using JSON responses instead of SSE streams")
+        # Warm start runs from the MCP lifespan, on the event loop that serves requests
+        self.start_background_tasks()
         
-        self.mcp.run(**run_kwargs)
+        try:
+            self.mcp.run(**run_kwargs)
+        finally:
+            self.stop_background_tasks()
     
     async def run_async(self, **kwargs) -> None:
         """Run the MCP server asynchronously.
@@ -286,38 +538,22 @@ class Talk2TablesMCP:
         """
         logger.info(f"Starting {self.config.server_name} server (async)")
         
-        # Configure server settings before running
-        if self.config.transport in ["sse", "streamable-http"]:
-            # Set host and port in server settings
-            if hasattr(self.mcp.settings, 'host'):
-                self.mcp.settings.host = self.config.host
-            if hasattr(self.mcp.settings, 'port'):
-                self.mcp.settings.port = self.config.port
-                
-            # Configure stateless mode if enabled
-            if self.config.stateless_http and hasattr(self.mcp.settings, 'stateless_http'):
-                self.mcp.settings.stateless_http = True
-                
-            # Configure JSON responses if enabled
-            if self.config.json_response and hasattr(self.mcp.settings, 'json_response'):
-                self.mcp.settings.json_response = True
-        
-        # Log server startup information
-        if self.config.transport != "stdio":
-            logger.info(f"Server will be accessible at http://{self.config.host}:{self.config.port}")
-            if self.config.stateless_http:
-                logger.info("Running in stateless HTTP mode")
-            if self.config.json_response:
-                logger.info("Using JSON responses instead of SSE streams")
-        
-        # Run appropriate async method based on transport
-        if self.config.transport == "sse":
-            await self.mcp.run_sse_async()
-        elif self.config.transport == "streamable-http":
-            await self.mcp.run_streamable_http_async()
-        else:
+        if self.config.transport not in ["sse", "streamable-http"]:
             # For stdio, we need to use the sync version
             raise ValueError(f"Async mode not supported for transport: {self.config.transport}")
+        
+        http_server = self.create_http_server()
+        
+        self.start_background_tasks()
+        
+        try:
+            if self.config.warm_start:
+                await self._warm_start()
+            
+            # Shutdown signals drain running queries before the server stops
+            await http_server.serve()
+        finally:
+            self.close()
 
 
 def parse_args() -> argparse.Namespace:
@@ -345,6 +581,9 @@ Examples:
   
   # Use JSON responses instead of SSE
   %(prog)s --transport streamable-http --json-response --port 8000
+  
+  # Serve from four worker processes (requires stateless mode)
+  %(prog)s --transport streamable-http --stateless --workers 4 --port 8000
 
 Environment Variables:
   DATABASE_PATH       Path to SQLite database file
@@ -352,6 +591,7 @@ Environment Variables:
   HOST               Server host address
   PORT               Server port number
   TRANSPORT          Transport type (stdio/sse/streamable-http)
+  WORKERS            Number of worker processes
   LOG_LEVEL          Logging level (DEBUG/INFO/WARNING/ERROR)
         """
     )
@@ -404,7 +644,46 @@ Environment Variables:
         help="Disable CORS headers"
     )
     
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        metavar="N",
+        help="Number of worker processes sharing the listening socket (streamable-http with --stateless)"
+    )
+    
+    # Startup options
+    parser.add_argument(
+        "--warm-start",
+        action="store_true",
+        help="Open the connection pool and precompute metadata before serving requests"
+    )
+    
+    parser.add_argument(
+        "--replay-queries",
+        type=int,
+        metavar="N",
+        help="Replay the N most frequent queries from the query log during warm start"
+    )
+    
+    parser.add_argument(
+        "--query-log",
+        help="Path of a JSON file counting executed query shapes, used for warm-start replay"
+    )
+    
+    # Metadata options
+    parser.add_argument(
+        "--column-stats",
+        action="store_true",
+        help="Profile tables in the background and include column statistics in metadata"
+    )
+    
     # Server options
+    parser.add_argument(
+        "--log-notifications",
+        choices=["off", "errors", "summary", "verbose"],
+        help="MCP log notifications sent to clients during tool calls (default: errors)"
+    )
+    
     parser.add_argument(
         "--log-level",
         choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
@@ -449,6 +728,18 @@ def create_server(args: argparse.Namespace = None) -> Talk2TablesMCP:
             config.json_response = True
         if args.no_cors:
             config.allow_cors = False
+        if args.workers:
+            config.workers = args.workers
+        if args.warm_start:
+            config.warm_start = True
+        if args.replay_queries is not None:
+            config.warm_start_replay_queries = args.replay_queries
+        if args.query_log:
+            config.query_log_path = args.query_log
+        if args.column_stats:
+            config.enable_column_stats = True
+        if args.log_notifications:
+            config.log_notifications = args.log_notifications
         if args.log_level:
             config.log_level = args.log_level
         if args.server_name:
@@ -473,7 +764,11 @@ def main() -> None:
         server = create_server(args)
         
         # Run server
-        server.run()
+        if server.config.workers > 1:
+            from .workers import run_workers
+            run_workers(server.config)
+        else:
+            server.run()
         
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
@@ -0,0 +1,76 @@
+"""Runtime statistics for the MCP server.
+
+Counters from admission control, query coalescing, caches, the shutdown
+drain and the connection pool are collected into one document and published
+as the ``server://stats`` resource, so operators and clients can see queue
+depth, wait times and rejections without log scraping. The same counters are
+included in the Prometheus ``/metrics`` endpoint.
+"""
+
+import json
+from typing import TYPE_CHECKING, Any, Dict
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+if TYPE_CHECKING:
+    from .server import Talk2TablesMCP
+
+
+def collect_server_stats(server: "Talk2TablesMCP") -> Dict[str, Any]:
+    """Collect runtime counters from a server instance.
+    
+    Args:
+        server: Server to inspect
+        
+    Returns:
+        Dictionary of counters grouped by component
+    """
+    stats: Dict[str, Any] = {
+        "admission": server.admission.stats(),
+        "singleflight": server.singleflight.stats(),
+        "metadata_cache": server.metadata_cache.stats(),
+        "change_notifications": server.change_notifier.stats(),
+        "drain": server.drain.stats()
+    }
+    
+    if server.db_handler is not None:
+        pool = server.db_handler.pool
+        stats["connection_pool"] = {
+            "size": pool.size,
+            "opened": pool.opened,
+            "in_use": pool.in_use,
+            "utilization": round(pool.in_use / pool.size, 4)
+        }
+        
+    return stats
+
+
+def register_stats_resource(server: "Talk2TablesMCP") -> None:
+    """Register the ``server://stats`` resource on a server.
+    
+    Args:
+        server: Server to register the resource on
+    """
+    
+    @server.mcp.resource("server://stats")
+    async def get_server_stats() -> str:
+        """Get runtime counters for query execution, caches and the connection pool.
+        
+        Returns:
+            JSON string containing server statistics
+        """
+        return json.dumps(collect_server_stats(server), indent=2)
+
+
+def register_metrics_route(server: "Talk2TablesMCP") -> None:
+    """Serve Prometheus metrics at ``/metrics`` on the HTTP transports.
+    
+    Args:
+        server: Server to register the route on
+    """
+    
+    @server.mcp.custom_route("/metrics", methods=["GET"], include_in_schema=False)
+    async def metrics(request: Request) -> Response:
+        body = server.metrics.render(collect_server_stats(server))
+        return Response(body, media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,75 @@
+"""In-flight request coalescing.
+
+When several clients send the same query at the same moment, only the first
+call executes it; the others wait for and share its result. Entries exist
+only while the execution is running, so this is not a result cache and never
+serves stale data.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Shares one execution between concurrent calls with the same key."""
+    
+    def __init__(self):
+        """Initialize an empty group."""
+        self._inflight: Dict[Hashable, "asyncio.Task[Any]"] = {}
+        self._executions = 0
+        self._coalesced = 0
+        
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Run ``func`` unless a call with the same key is already running.
+        
+        The shared execution runs in its own task, so a caller that is
+        cancelled does not cancel the work other callers are waiting for.
+        
+        Args:
+            key: Key identifying equivalent calls
+            func: Coroutine function performing the work
+            
+        Returns:
+            Result of the shared execution
+            
+        Raises:
+            Exception: Whatever the shared execution raised
+        """
+        task = self._inflight.get(key)
+        
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            self._executions += 1
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self._coalesced += 1
+            logger.debug(f"Coalesced with in-flight execution ({len(self._inflight)} in flight)")
+            
+        return await asyncio.shield(task)
+        
+    def stats(self) -> Dict[str, Any]:
+        """Get coalescing counters.
+        
+        Returns:
+            Dictionary with execution and coalescing counts
+        """
+        calls = self._executions + self._coalesced
+        return {
+            "in_flight": len(self._inflight),
+            "executions": self._executions,
+            "coalesced": self._coalesced,
+            "coalesced_ratio": round(self._coalesced / calls, 4) if calls else 0.0
+        }
+        
+    def _finish(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved in case every caller went away
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,371 @@
+"""Column statistics profiler for database metadata.
+
+This module samples each table in the background and computes per-column
+statistics (null fraction, distinct-count estimate, min/max and most common
+values). The statistics are published in a versioned cache and merged into
+the metadata resources so the LLM can see value ranges without issuing
+exploratory queries.
+
+NumPy is an optional dependency (``pip install talk-2-tables-mcp[stats]``);
+the profiler is disabled when it isn't installed.
+"""
+
+import importlib.util
+import logging
+import math
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StatsCache:
+    """Thread-safe, versioned store of column statistics."""
+    
+    def __init__(self):
+        """Initialize an empty stats cache."""
+        self._lock = threading.Lock()
+        self._tables: Dict[str, Dict[str, Any]] = {}
+        self._source_version: Optional[str] = None
+        self._generated_at: Optional[float] = None
+        self.version = 0
+        
+    @property
+    def source_version(self) -> Optional[str]:
+        """Database version the current statistics were computed from."""
+        return self._source_version
+        
+    def publish(self, tables: Dict[str, Dict[str, Any]], source_version: str) -> None:
+        """Replace the cached statistics with a new profiling run.
+        
+        Args:
+            tables: Mapping of table name to per-column statistics
+            source_version: Database version the statistics were computed from
+        """
+        with self._lock:
+            self._tables = tables
+            self._source_version = source_version
+            self._generated_at = time.time()
+            self.version += 1
+            
+    def get_table_stats(self, table_name: str) -> Optional[Dict[str, Any]]:
+        """Get statistics for one table.
+        
+        Args:
+            table_name: Name of the table
+            
+        Returns:
+            Per-column statistics or None if the table hasn't been profiled
+        """
+        with self._lock:
+            return self._tables.get(table_name)
+            
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a copy of the whole cache.
+        
+        Returns:
+            Dictionary with version information and per-table statistics
+        """
+        with self._lock:
+            return {
+                "version": self.version,
+                "source_version": self._source_version,
+                "generated_at": self._generated_at,
+                "tables": dict(self._tables)
+            }
+
+
+class ColumnStatsProfiler:
+    """Computes column statistics from sampled table batches."""
+    
+    def __init__(
+        self,
+        database_path: str,
+        sample_rows: int = 10000,
+        top_k: int = 5,
+        batch_size: int = 2000
+    ):
+        """Initialize the profiler.
+        
+        Args:
+            database_path: Path to the SQLite database file
+            sample_rows: Approximate number of rows sampled per table
+            top_k: Number of most common values reported per column
+            batch_size: Number of rows processed per NumPy batch
+        """
+        self.database_path = Path(database_path)
+        self.sample_rows = sample_rows
+        self.top_k = top_k
+        self.batch_size = batch_size
+        
+    @staticmethod
+    def is_available() -> bool:
+        """Check whether NumPy is installed.
+        
+        NumPy itself is only imported once profiling starts, so it does not
+        add to server start-up time when column statistics are disabled.
+        """
+        return importlib.util.find_spec("numpy") is not None
+        
+    def profile_database(self) -> Dict[str, Dict[str, Any]]:
+        """Profile every user table in the database.
+        
+        Returns:
+            Mapping of table name to per-column statistics
+        """
+        results = {}
+        
+        with sqlite3.connect(f"file:{self.database_path}?mode=ro", uri=True) as conn:
+            tables_query = "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
+            tables = [row[0] for row in conn.execute(tables_query)]
+            
+            for table_name in tables:
+                try:
+                    results[table_name] = self.profile_table(conn, table_name)
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not profile table {table_name}: {e}")
+                    
+        return results
+        
+    def profile_table(self, conn: sqlite3.Connection, table_name: str) -> Dict[str, Any]:
+        """Profile a single table from a random sample of its rows.
+        
+        Args:
+            conn: Open database connection
+            table_name: Name of an existing table
+            
+        Returns:
+            Mapping of column name to statistics
+        """
+        quoted_name = '"' + table_name.replace('"', '""') + '"'
+        total_rows = conn.execute(f"SELECT COUNT(*) FROM {quoted_name}").fetchone()[0]
+        
+        if total_rows <= self.sample_rows:
+            cursor = conn.execute(f"SELECT * FROM {quoted_name}")
+        else:
+            # Bernoulli sampling avoids the full sort that ORDER BY random() needs
+            modulus = max(1, math.ceil(total_rows / self.sample_rows))
+            cursor = conn.execute(
+                f"SELECT * FROM {quoted_name} WHERE abs(random()) % ? = 0",
+                (modulus,)
+            )
+            
+        columns = [description[0] for description in cursor.description]
+        accumulators = [_ColumnAccumulator() for _ in columns]
+        
+        while True:
+            batch = cursor.fetchmany(self.batch_size)
+            if not batch:
+                break
+            # Transpose the batch so each column is processed as one array
+            for accumulator, values in zip(accumulators, zip(*batch)):
+                accumulator.add_batch(values)
+                
+        return {
+            column: accumulator.finish(total_rows, self.top_k)
+            for column, accumulator in zip(columns, accumulators)
+        }
+
+
+class _ColumnAccumulator:
+    """Merges per-batch statistics for a single column."""
+    
+    def __init__(self):
+        self.sampled = 0
+        self.nulls = 0
+        self.counts: Counter = Counter()
+        self.minimum: Any = None
+        self.maximum: Any = None
+        
+    def add_batch(self, values: tuple) -> None:
+        """Fold one batch of column values into the running statistics."""
+        import numpy as np
+        
+        array = np.array(values, dtype=object)
+        null_mask = np.equal(array, None)
+        non_null = array[~null_mask]
+        
+        self.sampled += len(array)
+        self.nulls += int(null_mask.sum())
+        
+        if len(non_null) == 0:
+            return
+            
+        if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in non_null):
+            typed = non_null.astype(np.float64)
+        else:
+            typed = non_null.astype(str)
+            
+        uniques, counts = np.unique(typed, return_counts=True)
+        self.counts.update(dict(zip((value.item() for value in uniques), counts.tolist())))
+        
+        # np.unique returns sorted values, so the extremes are at the ends
+        self._update_range(uniques[0].item(), uniques[-1].item())
+        
+    def _update_range(self, low: Any, high: Any) -> None:
+        try:
+            if self.minimum is None or low < self.minimum:
+                self.minimum = low
+            if self.maximum is None or high > self.maximum:
+                self.maximum = high
+        except TypeError:
+            # Mixed-type column across batches; compare textual forms
+            self.minimum = min(str(self.minimum), str(low))
+            self.maximum = max(str(self.maximum), str(high))
+            
+    def finish(self, total_rows: int, top_k: int) -> Dict[str, Any]:
+        """Produce the final statistics for the column.
+        
+        Args:
+            total_rows: Number of rows in the table
+            top_k: Number of most common values to report
+            
+        Returns:
+            Column statistics dictionary
+        """
+        non_null = self.sampled - self.nulls
+        
+        return {
+            "sampled_rows": self.sampled,
+            "null_fraction": round(self.nulls / self.sampled, 4) if self.sampled else 0.0,
+            "distinct_estimate": _estimate_distinct(self.counts, non_null, total_rows, self.sampled),
+            "min": _json_value(self.minimum),
+            "max": _json_value(self.maximum),
+            "top_values": [
+                {"value": _json_value(value), "count": count}
+                for value, count in self.counts.most_common(top_k)
+            ]
+        }
+
+
+def _estimate_distinct(counts: Counter, non_null: int, total_rows: int, sampled: int) -> int:
+    """Estimate the distinct count of a column from its sample.
+    
+    Uses the GEE estimator: values seen once in the sample are scaled up by
+    sqrt(N / n), values seen more often are counted as-is.
+    """
+    if not counts:
+        return 0
+    if sampled >= total_rows:
+        return len(counts)
+        
+    singletons = sum(1 for count in counts.values() if count == 1)
+    repeated = len(counts) - singletons
+    scale = math.sqrt(total_rows / max(sampled, 1))
+    estimate = int(round(scale * singletons + repeated))
+    
+    # The estimate can never exceed the number of non-null rows in the table
+    non_null_rows = int(total_rows * non_null / sampled) if sampled else total_rows
+    return max(len(counts), min(estimate, non_null_rows))
+
+
+def _json_value(value: Any) -> Any:
+    """Convert a statistic value to something JSON serializable."""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+class BackgroundStatsProfiler:
+    """Runs the column profiler periodically on a daemon thread."""
+    
+    def __init__(
+        self,
+        profiler: ColumnStatsProfiler,
+        cache: StatsCache,
+        version_provider: Callable[[], str],
+        refresh_interval: float = 300.0
+    ):
+        """Initialize the background profiler.
+        
+        Args:
+            profiler: Profiler used to compute statistics
+            cache: Cache the results are published to
+            version_provider: Callable returning the current database version
+            refresh_interval: Seconds between checks for database changes
+        """
+        self.profiler = profiler
+        self.cache = cache
+        self.version_provider = version_provider
+        self.refresh_interval = refresh_interval
+        self._stop_event = threading.Event()
+        self._refresh_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        
+    def start(self) -> None:
+        """Start the background thread if it isn't already running."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+            
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="column-stats-profiler",
+            daemon=True
+        )
+        self._thread.start()
+        logger.info("Started background column statistics profiler")
+        
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background thread.
+        
+        Args:
+            timeout: Seconds to wait for the thread to exit
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+            
+    def refresh(self) -> bool:
+        """Profile the database if it changed since the last run.
+        
+        Returns:
+            True if new statistics were published
+        """
+        # Serialize refreshes so a warm start and the background thread don't both profile
+        with self._refresh_lock:
+            version = self.version_provider()
+            if version == self.cache.source_version:
+                return False
+            
+            started = time.perf_counter()
+            tables = self.profiler.profile_database()
+            self.cache.publish(tables, version)
+            logger.info(
+                f"Profiled {len(tables)} tables in {time.perf_counter() - started:.2f}s "
+                f"(stats version {self.cache.version})"
+            )
+            return True
+        
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Column statistics profiling failed: {e}")
+            self._stop_event.wait(self.refresh_interval)
+
+
+def merge_stats_into_tables(tables: Dict[str, Any], cache: StatsCache) -> Dict[str, Any]:
+    """Attach cached column statistics to metadata table entries.
+    
+    Args:
+        tables: Metadata ``tables`` mapping
+        cache: Stats cache to read from
+        
+    Returns:
+        New tables mapping with ``column_stats`` added where available
+    """
+    merged = {}
+    for table_name, table_info in tables.items():
+        table_stats = cache.get_table_stats(table_name)
+        if table_stats is not None and isinstance(table_info, dict):
+            table_info = {**table_info, "column_stats": table_stats}
+        merged[table_name] = table_info
+    return merged
+
@@ -0,0 +1,264 @@
+"""Database and metadata change tracking.
+
+``DatabaseVersionTracker`` detects schema changes (``PRAGMA schema_version``),
+committed data changes and metadata file changes. Data changes are detected
+from state stored on disk rather than kept in memory: the database file's
+size and modification time, the file change counter in its header and the
+size and modification time of its write-ahead log. Every process reading the
+same file therefore computes the same version, across restarts, pre-forked
+workers and replicas. The resulting version strings are stamped on query
+results and metadata resources, so clients can cache them until the version
+changes.
+
+``ChangeNotifier`` refreshes the tracker in the background and sends
+``notifications/resources/updated`` for subscribed resources, plus
+``notifications/resources/list_changed`` when the schema or metadata changes.
+Reading a version returns the last refreshed snapshot, so request handlers
+never touch the file system for it.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import weakref
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, NamedTuple, Optional, Set
+
+if TYPE_CHECKING:
+    from mcp.server.fastmcp import FastMCP
+
+logger = logging.getLogger(__name__)
+
+
+class VersionSnapshot(NamedTuple):
+    """State of the database and metadata at one point in time."""
+    
+    schema_version: int
+    data_fingerprint: str
+    metadata_mtime: Optional[int]
+
+
+class DatabaseVersionTracker:
+    """Tracks schema, data and metadata versions."""
+    
+    def __init__(self, database_path: Path, metadata_path: Optional[Path] = None):
+        """Initialize the tracker.
+        
+        Args:
+            database_path: Path to the SQLite database file
+            metadata_path: Path to the metadata JSON file, if any
+        """
+        self.database_path = Path(database_path)
+        self.metadata_path = Path(metadata_path) if metadata_path else None
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._inode: Optional[int] = None
+        self._snapshot: Optional[VersionSnapshot] = None
+        
+    def refresh(self) -> VersionSnapshot:
+        """Read the current versions.
+        
+        Returns:
+            Current snapshot
+            
+        Raises:
+            sqlite3.Error: If the database cannot be read
+        """
+        with self._lock:
+            stat = self.database_path.stat()
+            
+            if self._conn is not None and stat.st_ino != self._inode:
+                # The file was replaced; the old connection still sees the old inode
+                self._conn.close()
+                self._conn = None
+                
+            if self._conn is None:
+                self._conn = sqlite3.connect(
+                    f"file:{self.database_path}?mode=ro", uri=True, check_same_thread=False
+                )
+                self._inode = stat.st_ino
+                
+            schema_version = self._conn.execute("PRAGMA schema_version").fetchone()[0]
+            
+            self._snapshot = VersionSnapshot(schema_version, self._data_fingerprint(stat), self._metadata_mtime())
+            return self._snapshot
+            
+    @property
+    def snapshot(self) -> VersionSnapshot:
+        """Last refreshed snapshot, read from disk only if there is none yet."""
+        return self._snapshot or self.refresh()
+        
+    @property
+    def database_version(self) -> str:
+        """Version string for the database contents as of the last refresh."""
+        snapshot = self.snapshot
+        return f"s{snapshot.schema_version}-d{snapshot.data_fingerprint}"
+        
+    def close(self) -> None:
+        """Close the tracker's database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                
+    def _data_fingerprint(self, stat: os.stat_result) -> str:
+        """Fingerprint the committed data from the database and WAL files.
+        
+        Rollback-journal commits bump the change counter in the header and
+        rewrite the file; WAL commits append to the ``-wal`` file until a
+        checkpoint copies them into the database file.
+        """
+        state = [stat.st_size, stat.st_mtime_ns]
+        try:
+            with open(self.database_path, "rb") as f:
+                state.append(f.read(28)[24:28].hex())
+        except OSError:
+            state.append(None)
+        try:
+            wal = Path(f"{self.database_path}-wal").stat()
+            state.extend([wal.st_size, wal.st_mtime_ns])
+        except OSError:
+            state.extend([None, None])
+        return hashlib.sha1(repr(state).encode("ascii")).hexdigest()[:12]
+        
+    def _metadata_mtime(self) -> Optional[int]:
+        if self.metadata_path is None:
+            return None
+        try:
+            return self.metadata_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+
+class ChangeNotifier:
+    """Sends resource change notifications to subscribed sessions."""
+    
+    def __init__(self, tracker: DatabaseVersionTracker, poll_interval: float = 2.0):
+        """Initialize the notifier.
+        
+        Args:
+            tracker: Tracker used to detect changes
+            poll_interval: Seconds between change checks
+        """
+        self.tracker = tracker
+        self.poll_interval = poll_interval
+        self._subscriptions: "weakref.WeakKeyDictionary[Any, Set[str]]" = weakref.WeakKeyDictionary()
+        self._last: Optional[VersionSnapshot] = None
+        self._task: Optional[asyncio.Task] = None
+        self.notifications_sent = 0
+        
+    def subscribe(self, session: Any, uri: str) -> None:
+        """Subscribe a session to updates of a resource.
+        
+        Args:
+            session: MCP server session
+            uri: Resource URI
+        """
+        self._subscriptions.setdefault(session, set()).add(uri)
+        self.ensure_running()
+        
+    def unsubscribe(self, session: Any, uri: str) -> None:
+        """Remove a session's subscription to a resource.
+        
+        Args:
+            session: MCP server session
+            uri: Resource URI
+        """
+        uris = self._subscriptions.get(session)
+        if uris is not None:
+            uris.discard(uri)
+            if not uris:
+                del self._subscriptions[session]
+                
+    def ensure_running(self) -> None:
+        """Start refreshing the tracker on the running event loop if not already doing so."""
+        if self._task is not None and not self._task.done():
+            return
+        self._last = self.tracker.snapshot
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        
+    def stop(self) -> None:
+        """Stop polling."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+            
+    def stats(self) -> Dict[str, Any]:
+        """Get subscription counters.
+        
+        Returns:
+            Dictionary with subscribed session count and notifications sent
+        """
+        return {
+            "subscribed_sessions": len(self._subscriptions),
+            "notifications_total": self.notifications_sent
+        }
+        
+    async def check(self) -> Set[str]:
+        """Check for changes and notify subscribers.
+        
+        Returns:
+            Names of the parts that changed: schema, data and/or metadata
+        """
+        current = await asyncio.to_thread(self.tracker.refresh)
+        previous, self._last = self._last, current
+        if previous is None:
+            return set()
+            
+        changes = set()
+        if current.schema_version != previous.schema_version:
+            changes.add("schema")
+        if current.data_fingerprint != previous.data_fingerprint:
+            changes.add("data")
+        if current.metadata_mtime != previous.metadata_mtime:
+            changes.add("metadata")
+            
+        if changes:
+            logger.info(f"Detected database changes: {', '.join(sorted(changes))}")
+            await self._notify(changes)
+        return changes
+        
+    async def _notify(self, changes: Set[str]) -> None:
+        list_changed = bool(changes & {"schema", "metadata"})
+        
+        for session, uris in list(self._subscriptions.items()):
+            try:
+                if list_changed:
+                    await session.send_resource_list_changed()
+                    self.notifications_sent += 1
+                for uri in sorted(uris):
+                    await session.send_resource_updated(uri)
+                    self.notifications_sent += 1
+            except Exception as e:
+                logger.debug(f"Dropping subscriptions of unreachable session: {e}")
+                self._subscriptions.pop(session, None)
+                
+    async def _run(self) -> None:
+        # Keeps running without subscribers, since versions are read from the refreshed snapshot
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.check()
+            except Exception as e:
+                logger.warning(f"Change detection failed: {e}")
+
+
+def register_subscriptions(mcp: "FastMCP", notifier: ChangeNotifier) -> None:
+    """Register resources/subscribe and resources/unsubscribe handlers.
+    
+    Args:
+        mcp: FastMCP server to register the handlers on
+        notifier: Notifier that keeps track of subscriptions
+    """
+    server = mcp._mcp_server
+    
+    @server.subscribe_resource()
+    async def subscribe(uri) -> None:
+        notifier.subscribe(server.request_context.session, str(uri))
+        
+    @server.unsubscribe_resource()
+    async def unsubscribe(uri) -> None:
+        notifier.unsubscribe(server.request_context.session, str(uri))
@@ -0,0 +1,84 @@
+"""Warm-start phase for the MCP server.
+
+Without a warm start the first request pays for opening the database,
+parsing the schema and rendering metadata. The routine in this module does
+that work before the server reports ready.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Dict
+
+from .database import DatabaseError
+
+if TYPE_CHECKING:
+    from .server import Talk2TablesMCP
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up(server: "Talk2TablesMCP") -> Dict[str, Any]:
+    """Prepare connections and caches before the server reports ready.
+    
+    Opens the connection pool, reads the database file into the page cache,
+    computes column statistics and metadata documents, and replays the most
+    frequent queries from the query log.
+    
+    Args:
+        server: Server instance to warm up
+        
+    Returns:
+        Summary of the work done
+        
+    Raises:
+        DatabaseError: If the database cannot be opened
+    """
+    config = server.config
+    started = time.perf_counter()
+    logger.info("Warming up server")
+    
+    if server.db_handler is None:
+        await server._initialize_database_handler_simple()
+        
+    opened = server.db_handler.pool.warm()
+    primed = server.db_handler.prime_page_cache(config.warm_start_prime_mb * 1024 * 1024)
+    logger.info(f"Opened {opened} pooled connections, primed {primed / (1024 * 1024):.1f} MB of page cache")
+    
+    if server.stats_profiler is not None:
+        try:
+            await asyncio.to_thread(server.stats_profiler.refresh)
+        except Exception as e:
+            logger.warning(f"Warm start column profiling failed: {e}")
+            
+    resources = 0
+    try:
+        await server.mcp.read_resource("database://metadata")
+        tables_document = list(await server.mcp.read_resource("database://tables"))[0].content
+        resources = 2
+        for table in json.loads(tables_document)["tables"]:
+            await server.mcp.read_resource(table["uri"])
+            resources += 1
+    except Exception as e:
+        logger.warning(f"Warm start metadata precomputation failed: {e}")
+        
+    replayed = 0
+    if server.query_log is not None and config.warm_start_replay_queries:
+        for query in server.query_log.top_queries(config.warm_start_replay_queries):
+            try:
+                await asyncio.to_thread(server.db_handler.execute_query, query)
+                replayed += 1
+            except DatabaseError as e:
+                logger.debug(f"Skipping replay of failing query: {e}")
+                
+    elapsed = time.perf_counter() - started
+    logger.info(f"Warm start complete in {elapsed:.2f}s ({resources} resources, {replayed} queries replayed)")
+    
+    return {
+        "connections_opened": opened,
+        "bytes_primed": primed,
+        "resources_rendered": resources,
+        "queries_replayed": replayed,
+        "seconds": elapsed
+    }
@@ -0,0 +1,161 @@
+"""Pre-fork worker processes for the streamable-http transport.
+
+A single server process serves requests on one core. In stateless
+streamable-http mode no session state lives in the server, so the listening
+socket can be bound once by a supervisor and shared by several worker
+processes; the kernel distributes incoming connections between them. Each
+worker builds its own server instance and therefore has its own database
+connection pool and metadata caches.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import signal
+import socket
+import time
+from multiprocessing.connection import wait
+from typing import Dict, Tuple
+
+from .config import ServerConfig, setup_logging
+from .drain import INTERRUPT_GRACE, SHUTDOWN_GRACE
+
+logger = logging.getLogger(__name__)
+
+# Workers that die sooner than this after starting are treated as a startup
+# failure rather than a crash, and are not restarted
+MIN_WORKER_UPTIME = 5.0
+
+
+def check_worker_config(config: ServerConfig) -> None:
+    """Check that a configuration can be served by multiple workers.
+    
+    Args:
+        config: Server configuration
+        
+    Raises:
+        ValueError: If the transport keeps per-process session state
+    """
+    if config.transport != "streamable-http":
+        raise ValueError("Multiple workers require the streamable-http transport")
+    if not config.stateless_http:
+        raise ValueError(
+            "Multiple workers require stateless HTTP mode (--stateless); "
+            "sessions are not shared between worker processes"
+        )
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """Bind the listening socket shared by all workers.
+    
+    Args:
+        host: Host address to bind
+        port: Port number to bind
+        backlog: Listen backlog
+        
+    Returns:
+        Bound, listening socket
+    """
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _serve_worker(config: ServerConfig, sock: socket.socket, worker_id: int) -> None:
+    """Entry point of a worker process."""
+    from .server import Talk2TablesMCP
+    
+    setup_logging(config)
+    logger.info(f"Worker {worker_id} starting")
+    
+    server = Talk2TablesMCP(config)
+    http_server = server.create_http_server()
+    server.start_background_tasks()
+    
+    try:
+        if config.warm_start:
+            asyncio.run(server.warm_up())
+            
+        # SIGTERM from the supervisor drains running queries before exiting
+        http_server.run(sockets=[sock])
+    finally:
+        server.close()
+
+
+def _raise_keyboard_interrupt(signum, frame) -> None:
+    raise KeyboardInterrupt
+
+
+def run_workers(config: ServerConfig) -> None:
+    """Run the server in several worker processes sharing one socket.
+    
+    Blocks until interrupted. Workers that crash are restarted.
+    
+    Args:
+        config: Server configuration; ``config.workers`` sets the process count
+        
+    Raises:
+        ValueError: If the configuration does not support multiple workers
+        RuntimeError: If a worker exits during startup
+    """
+    check_worker_config(config)
+    
+    sock = bind_socket(config.host, config.port)
+    context = multiprocessing.get_context("spawn")
+    processes: Dict[int, Tuple[multiprocessing.Process, float]] = {}
+    
+    def start_worker(worker_id: int) -> None:
+        process = context.Process(
+            target=_serve_worker,
+            args=(config, sock, worker_id),
+            name=f"talk2tables-worker-{worker_id}"
+        )
+        process.start()
+        processes[worker_id] = (process, time.monotonic())
+        
+    previous_handler = signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+    
+    try:
+        for worker_id in range(config.workers):
+            start_worker(worker_id)
+            
+        logger.info(
+            f"Started {config.workers} workers on http://{config.host}:{config.port}"
+        )
+        
+        while True:
+            wait([process.sentinel for process, _ in processes.values()])
+            
+            for worker_id, (process, started) in list(processes.items()):
+                if process.is_alive():
+                    continue
+                if time.monotonic() - started < MIN_WORKER_UPTIME:
+                    raise RuntimeError(
+                        f"Worker {worker_id} exited during startup with code {process.exitcode}"
+                    )
+                logger.warning(
+                    f"Worker {worker_id} (pid {process.pid}) exited with code {process.exitcode}, restarting"
+                )
+                start_worker(worker_id)
+                
+    except KeyboardInterrupt:
+        logger.info(f"Stopping workers, draining queries for up to {config.drain_timeout:.0f}s")
+    finally:
+        signal.signal(signal.SIGTERM, previous_handler)
+        
+        for process, _ in processes.values():
+            if process.is_alive():
+                process.terminate()
+                
+        # Workers drain on SIGTERM; only kill the ones that outlive their drain
+        deadline = time.monotonic() + config.drain_timeout + INTERRUPT_GRACE + SHUTDOWN_GRACE + 5
+        for process, _ in processes.values():
+            process.join(timeout=max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.kill()
+                
+        sock.close()
@@ -0,0 +1,112 @@
+"""Tests for query admission control."""
+
+import asyncio
+import json
+
+import pytest
+
+from talk_2_tables_mcp.admission import AdmissionController, AdmissionRejected
+from talk_2_tables_mcp.config import ServerConfig
+from talk_2_tables_mcp.server import Talk2TablesMCP
+
+
+class TestAdmissionController:
+    """Test cases for AdmissionController class."""
+    
+    async def test_admits_up_to_limit(self):
+        """Test that requests under the limit start immediately."""
+        controller = AdmissionController(max_concurrent=2, max_queued=0, queue_timeout=1.0)
+        
+        await controller.acquire("a")
+        await controller.acquire("b")
+        
+        assert controller.stats()["active"] == 2
+        
+    async def test_rejects_when_queue_full(self):
+        """Test that requests beyond capacity fail fast with a retry hint."""
+        controller = AdmissionController(max_concurrent=1, max_queued=0, queue_timeout=1.0)
+        await controller.acquire("a")
+        
+        with pytest.raises(AdmissionRejected, match="retry after") as exc_info:
+            await controller.acquire("b")
+            
+        assert exc_info.value.retryable
+        assert controller.stats()["rejected"] == 1
+        
+    async def test_queued_request_gets_released_slot(self):
+        """Test that a waiting request runs once a slot is released."""
+        controller = AdmissionController(max_concurrent=1, max_queued=1, queue_timeout=1.0)
+        await controller.acquire("a")
+        
+        waiter = asyncio.create_task(controller.acquire("b"))
+        await asyncio.sleep(0)
+        assert controller.stats()["queued"] == 1
+        
+        controller.release()
+        await waiter
+        
+        stats = controller.stats()
+        assert stats["active"] == 1
+        assert stats["queued"] == 0
+        assert stats["admitted"] == 2
+        
+    async def test_queue_timeout(self):
+        """Test that requests waiting too long are rejected."""
+        controller = AdmissionController(max_concurrent=1, max_queued=1, queue_timeout=0.01)
+        await controller.acquire("a")
+        
+        with pytest.raises(AdmissionRejected):
+            await controller.acquire("b")
+            
+        stats = controller.stats()
+        assert stats["timed_out"] == 1
+        assert stats["queued"] == 0
+        
+    async def test_round_robin_between_clients(self):
+        """Test that a busy client cannot starve another one."""
+        controller = AdmissionController(max_concurrent=1, max_queued=10, queue_timeout=1.0)
+        await controller.acquire("busy")
+        order = []
+        
+        async def run(client_id: str) -> None:
+            async with controller.admit(client_id):
+                order.append(client_id)
+                
+        tasks = [asyncio.create_task(run("busy")) for _ in range(3)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(run("quiet")))
+        await asyncio.sleep(0)
+        
+        controller.release()
+        await asyncio.gather(*tasks)
+        
+        assert order[:2] == ["busy", "quiet"]
+        assert controller.stats()["active"] == 0
+        
+    async def test_cancelled_waiter_leaves_queue(self):
+        """Test that a cancelled request does not hold a queue position."""
+        controller = AdmissionController(max_concurrent=1, max_queued=1, queue_timeout=1.0)
+        await controller.acquire("a")
+        
+        waiter = asyncio.create_task(controller.acquire("b"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+            
+        assert controller.stats()["queued"] == 0
+        controller.release()
+        assert controller.stats()["active"] == 0
+
+
+class TestServerStatsResource:
+    """Test cases for the server statistics resource."""
+    
+    async def test_stats_resource(self):
+        """Test that admission counters are published."""
+        server = Talk2TablesMCP(ServerConfig(max_concurrent_queries=3))
+        contents = list(await server.mcp.read_resource("server://stats"))
+        stats = json.loads(contents[0].content)
+        
+        assert stats["admission"]["max_concurrent"] == 3
+        assert "metadata_cache" in stats
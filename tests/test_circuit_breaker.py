@@ -0,0 +1,79 @@
+"""Tests for the circuit breaker."""
+
+import time
+
+import pytest
+
+from fastapi_server.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+
+
+def open_breaker(breaker):
+    """Record enough failures to open the breaker."""
+    for _ in range(breaker.failure_threshold):
+        breaker.before_call()
+        breaker.record_failure()
+
+
+class TestCircuitBreaker:
+    """Test cases for CircuitBreaker class."""
+    
+    def test_opens_after_consecutive_failures(self):
+        """Test that the circuit opens at the threshold and refuses calls."""
+        breaker = CircuitBreaker("db", failure_threshold=3, reset_timeout=30.0)
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state is CircuitState.CLOSED
+        breaker.record_failure()
+        
+        assert breaker.state is CircuitState.OPEN
+        with pytest.raises(CircuitOpenError, match="db unavailable") as exc_info:
+            breaker.before_call()
+        assert 29.0 < exc_info.value.retry_after <= 30.0
+        assert breaker.stats()["rejected"] == 1
+        
+    def test_success_resets_failure_count(self):
+        """Test that only consecutive failures count."""
+        breaker = CircuitBreaker("db", failure_threshold=2)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        
+        assert breaker.state is CircuitState.CLOSED
+        
+    def test_half_open_allows_single_probe(self):
+        """Test that one probe is let through after the reset timeout and closes the circuit."""
+        breaker = CircuitBreaker("db", failure_threshold=1, reset_timeout=0.05)
+        open_breaker(breaker)
+        time.sleep(0.06)
+        
+        breaker.before_call()
+        assert breaker.state is CircuitState.HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+            
+        breaker.record_success()
+        assert breaker.state is CircuitState.CLOSED
+        breaker.before_call()
+        
+    def test_failed_probe_reopens(self):
+        """Test that a failed probe opens the circuit again."""
+        breaker = CircuitBreaker("db", failure_threshold=1, reset_timeout=0.05)
+        open_breaker(breaker)
+        time.sleep(0.06)
+        
+        breaker.before_call()
+        breaker.record_failure()
+        
+        assert breaker.state is CircuitState.OPEN
+        assert breaker.stats()["times_opened"] == 2
+        
+    def test_released_probe_frees_slot(self):
+        """Test that a probe ending without an outcome lets another probe through."""
+        breaker = CircuitBreaker("db", failure_threshold=1, reset_timeout=0.0)
+        open_breaker(breaker)
+        
+        breaker.before_call()
+        breaker.release()
+        breaker.before_call()
+        
+        assert breaker.state is CircuitState.HALF_OPEN
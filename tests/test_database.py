@@ -238,4 +238,103 @@ class TestDatabaseHandler:
         
         result = handler.execute_query(query)
         assert result["row_count"] == 1
-        assert result["rows"][0]["name"] == "test1"
\ No newline at end of file
+        assert result["rows"][0]["name"] == "test1"    
+    def test_get_table_names(self, temp_db):
+        """Test listing table names."""
+        handler = DatabaseHandler(temp_db)
+        assert handler.get_table_names() == ["test_table"]
+    
+    def test_get_table_info(self, temp_db):
+        """Test schema retrieval for a single table."""
+        handler = DatabaseHandler(temp_db)
+        table_info = handler.get_table_info("test_table")
+        
+        assert table_info["row_count"] == 2
+        assert [column["name"] for column in table_info["columns"]] == ["id", "name", "value"]
+    
+    def test_get_table_info_unknown_table(self, temp_db):
+        """Test schema retrieval for a table that doesn't exist."""
+        handler = DatabaseHandler(temp_db)
+        
+        with pytest.raises(DatabaseError, match="Table not found"):
+            handler.get_table_info("missing; DROP TABLE test_table")
+    
+    def test_get_table_sample(self, temp_db):
+        """Test sampling rows from a table."""
+        handler = DatabaseHandler(temp_db)
+        sample = handler.get_table_sample("test_table", limit=1)
+        
+        assert sample["columns"] == ["id", "name", "value"]
+        assert sample["row_count"] == 1
+        assert sample["rows"][0]["name"] == "test1"
+    
+    def test_get_schema_version_changes_with_schema(self, temp_db):
+        """Test that the schema version increases on schema changes."""
+        handler = DatabaseHandler(temp_db)
+        before = handler.get_schema_version()
+        
+        with sqlite3.connect(temp_db) as conn:
+            conn.execute("CREATE TABLE another_table (id INTEGER)")
+        
+        assert handler.get_schema_version() > before
+    
+    def test_pool_reuses_connections(self, temp_db):
+        """Test that queries reuse pooled connections."""
+        handler = DatabaseHandler(temp_db, pool_size=2)
+        
+        handler.execute_query("SELECT * FROM test_table")
+        handler.execute_query("SELECT * FROM test_table")
+        
+        assert handler.pool.opened == 1
+        assert handler.pool.in_use == 0
+    
+    def test_pool_warm_opens_all_connections(self, temp_db):
+        """Test warming the pool."""
+        handler = DatabaseHandler(temp_db, pool_size=3)
+        
+        assert handler.pool.warm() == 3
+        assert handler.pool.warm() == 0
+        assert handler.pool.opened == 3
+    
+    def test_pool_closed(self, temp_db):
+        """Test that a closed pool refuses queries."""
+        handler = DatabaseHandler(temp_db)
+        handler.close()
+        
+        with pytest.raises(DatabaseError, match="pool is closed"):
+            handler.execute_query("SELECT * FROM test_table")
+    
+    def test_pool_close_releases_checked_out_connections(self, temp_db):
+        """Test that connections checked out while the pool closes are closed on return."""
+        handler = DatabaseHandler(temp_db, pool_size=2)
+        handler.pool.warm()
+        
+        with handler.pool.connection() as conn:
+            handler.close()
+            assert handler.pool.opened == 1
+            
+        assert handler.pool.opened == 0
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+            
+    def test_table_names_cached_per_schema_version(self, temp_db):
+        """Test that table validation uses the pool and sees new tables."""
+        handler = DatabaseHandler(temp_db, pool_size=1)
+        handler.get_table_sample("test_table")
+        
+        with pytest.raises(DatabaseError, match="Table not found"):
+            handler.get_table_sample("later_table")
+            
+        with sqlite3.connect(temp_db) as conn:
+            conn.execute("CREATE TABLE later_table (id INTEGER)")
+            
+        assert handler.get_table_sample("later_table")["row_count"] == 0
+        assert handler.pool.opened == 1
+        
+    def test_prime_page_cache(self, temp_db):
+        """Test reading the database file into the page cache."""
+        handler = DatabaseHandler(temp_db)
+        size = Path(temp_db).stat().st_size
+        
+        assert handler.prime_page_cache(10 * size) == size
+        assert handler.prime_page_cache(100) == 100
@@ -0,0 +1,175 @@
+"""Tests for the graceful shutdown drain."""
+
+import asyncio
+import sqlite3
+import threading
+
+import httpx
+import pytest
+import uvicorn
+from mcp.server.fastmcp.exceptions import ToolError
+
+from talk_2_tables_mcp.config import ServerConfig
+from talk_2_tables_mcp.database import DatabaseError, DatabaseHandler
+from talk_2_tables_mcp.drain import DrainController, DrainingServer, ServerDraining
+from talk_2_tables_mcp.server import Talk2TablesMCP
+
+# Cross join that runs far longer than any test waits for
+SLOW_QUERY = "SELECT count(*) FROM n a, n b, n c"
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Create a database with enough rows for a slow cross join."""
+    path = tmp_path / "test.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE n (x INTEGER)")
+        conn.executemany("INSERT INTO n VALUES (?)", [(i,) for i in range(2000)])
+        conn.commit()
+    return path
+
+
+class TestDrainController:
+    """Test cases for DrainController class."""
+    
+    async def test_waits_for_in_flight_work(self):
+        """Test that the drain finishes once running work completes."""
+        controller = DrainController()
+        release = asyncio.Event()
+        
+        async def work():
+            async with controller.track():
+                await release.wait()
+                
+        task = asyncio.create_task(work())
+        await asyncio.sleep(0)
+        drain = asyncio.create_task(controller.drain(timeout=5.0))
+        await asyncio.sleep(0.05)
+        
+        assert controller.draining
+        assert not drain.done()
+        
+        release.set()
+        stats = await drain
+        await task
+        
+        assert stats["finished"]
+        assert stats["in_flight"] == 0
+        assert stats["interrupted"] == 0
+        
+    async def test_rejects_new_work_while_draining(self):
+        """Test that work arriving during the drain gets a retryable error."""
+        controller = DrainController()
+        await controller.drain(timeout=1.0)
+        
+        with pytest.raises(ServerDraining) as exc_info:
+            async with controller.track():
+                pass
+                
+        assert exc_info.value.retryable
+        assert controller.stats()["rejected"] == 1
+        
+    async def test_interrupts_after_deadline(self):
+        """Test that work still running at the deadline is interrupted."""
+        controller = DrainController()
+        release = asyncio.Event()
+        
+        async def work():
+            async with controller.track():
+                await release.wait()
+                
+        task = asyncio.create_task(work())
+        await asyncio.sleep(0)
+        
+        def interrupt():
+            release.set()
+            return 1
+            
+        stats = await controller.drain(timeout=0.05, interrupt=interrupt)
+        await task
+        
+        assert stats["interrupted"] == 1
+        assert stats["in_flight"] == 0
+
+
+class TestInterrupt:
+    """Test cases for interrupting running statements."""
+    
+    def test_interrupt_aborts_running_query(self, db_path):
+        """Test that interrupting the pool aborts a running statement."""
+        handler = DatabaseHandler(str(db_path))
+        errors = []
+        
+        def run():
+            try:
+                handler.execute_query(SLOW_QUERY)
+            except DatabaseError as e:
+                errors.append(e)
+                
+        thread = threading.Thread(target=run)
+        thread.start()
+        while handler.pool.in_use == 0:
+            thread.join(0.01)
+            
+        assert handler.interrupt() == 1
+        thread.join(5)
+        
+        assert not thread.is_alive()
+        assert "interrupted" in str(errors[0])
+        handler.close()
+
+
+class TestServerDrain:
+    """Test cases for draining the MCP server."""
+    
+    async def test_drain_interrupts_slow_query(self, db_path):
+        """Test that a query outliving the drain deadline fails with a retryable error."""
+        server = Talk2TablesMCP(ServerConfig(database_path=str(db_path), drain_timeout=0.1))
+        query = asyncio.create_task(server.mcp.call_tool("execute_query", {"query": SLOW_QUERY}))
+        while server.drain.in_flight == 0:
+            await asyncio.sleep(0.01)
+            
+        stats = await server.drain_queries()
+        
+        with pytest.raises(ToolError, match="interrupted by server shutdown"):
+            await query
+        assert stats["interrupted"] == 1
+        server.close()
+        
+    async def test_new_queries_are_refused(self, db_path):
+        """Test that queries sent during the drain are refused."""
+        server = Talk2TablesMCP(ServerConfig(database_path=str(db_path)))
+        await server.drain_queries()
+        
+        with pytest.raises(ToolError, match="shutting down"):
+            await server.mcp.call_tool("execute_query", {"query": "SELECT x FROM n LIMIT 1"})
+        server.close()
+        
+    async def test_new_sessions_are_refused(self, db_path):
+        """Test that the MCP endpoint answers 503 to new sessions while draining."""
+        server = Talk2TablesMCP(ServerConfig(database_path=str(db_path), transport="streamable-http"))
+        app = server.http_app()
+        await server.drain_queries()
+        
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.post("/mcp", json={"jsonrpc": "2.0", "id": 1, "method": "initialize"})
+            metrics = await client.get("/metrics")
+            
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+        assert metrics.status_code == 200
+        assert "talk2tables_drain_rejected_total 1" in metrics.text
+        server.close()
+        
+    async def test_http_server_exits_after_drain(self, db_path):
+        """Test that the HTTP server shuts down once the drain has finished."""
+        server = Talk2TablesMCP(ServerConfig(database_path=str(db_path), transport="streamable-http"))
+        http_server = server.create_http_server()
+        
+        await http_server.begin_drain()
+        
+        assert isinstance(http_server, DrainingServer)
+        assert isinstance(http_server.config, uvicorn.Config)
+        assert http_server.should_exit
+        assert server.drain.stats()["finished"]
+        server.close()
@@ -5,12 +5,16 @@ Tests for the FastAPI server with OpenRouter and MCP integration.
 import pytest
 import asyncio
 import json
+import time
 from unittest.mock import AsyncMock, patch, MagicMock
 from fastapi.testclient import TestClient
 
 from fastapi_server.main import app
-from fastapi_server.models import ChatMessage, ChatCompletionRequest, MessageRole
-from fastapi_server.config import FastAPIServerConfig
+from fastapi_server.models import (
+    ChatMessage, ChatCompletionRequest, ChatCompletionResponse, Choice, MCPQueryResult, MCPTool, MessageRole
+)
+from fastapi_server.config import FastAPIServerConfig, config
+from fastapi_server.deadlines import remaining_budget
 from fastapi_server.llm_manager import LLMManager
 from fastapi_server.mcp_client import MCPDatabaseClient
 from fastapi_server.chat_handler import ChatCompletionHandler
@@ -125,12 +129,37 @@ class TestFastAPIServer:
         mock_chat_handler.mcp_client.list_tools = AsyncMock(return_value=[])
         mock_chat_handler.mcp_client.list_resources = AsyncMock(return_value=[])
         mock_chat_handler.mcp_client.get_database_metadata = AsyncMock(return_value={})
+        mock_chat_handler.mcp_client.connection_status = MagicMock(return_value={"state": "connected"})
         
         response = client.get("/mcp/status")
         assert response.status_code == 200
         data = response.json()
         assert data["connected"] is True
-    
+        assert data["connection"]["state"] == "connected"
+        
+    @patch('fastapi_server.main.chat_handler')
+    async def test_request_budget_header(self, mock_chat_handler, client):
+        """Test that X-Request-Timeout lowers the budget seen by MCP calls."""
+        budgets = []
+        
+        async def test_connection():
+            budgets.append(remaining_budget())
+            return True
+            
+        mock_chat_handler.mcp_client.test_connection = test_connection
+        
+        response = client.get("/health", headers={"X-Request-Timeout": "5"})
+        
+        assert response.status_code == 200
+        assert 0 < budgets[0] <= 5
+        assert remaining_budget() is None
+        
+    def test_chat_stats_endpoint(self, client):
+        """Test chat pipeline statistics endpoint."""
+        response = client.get("/chat/stats")
+        assert response.status_code == 200
+        assert "hit_ratio" in response.json()["sql_cache"]
+        
     @patch('fastapi_server.main.chat_handler')
     async def test_integration_test_endpoint(self, mock_chat_handler, client):
         """Test integration test endpoint."""
@@ -218,7 +247,18 @@ class TestMCPClient:
         assert client.transport_type == "http"
         assert client.server_url == "http://localhost:8000"
         assert not client.connected
-    
+        
+    def test_mcp_backend_urls(self):
+        """Test that a comma-separated list of MCP servers overrides the single URL."""
+        single = FastAPIServerConfig(openrouter_api_key="test_key", mcp_server_url="http://mcp:8000")
+        replicas = FastAPIServerConfig(
+            openrouter_api_key="test_key",
+            mcp_server_urls=" http://mcp-1:8000, http://mcp-2:8000 ,"
+        )
+        
+        assert single.mcp_backend_urls == ["http://mcp:8000"]
+        assert replicas.mcp_backend_urls == ["http://mcp-1:8000", "http://mcp-2:8000"]
+        
     @patch('fastapi_server.mcp_client.sse_client')
     @patch('fastapi_server.mcp_client.ClientSession')
     async def test_mcp_client_connect_http(self, mock_session, mock_sse_client, mock_config):
@@ -300,7 +340,21 @@ class TestChatCompletionHandler:
         # Should return None for non-SQL content
         query = handler._extract_sql_query("This is just regular text")
         assert query is None
-    
+        
+    def test_sql_generation_prompt_is_linked_to_question(self):
+        """Test that the SQL generation prompt only lists tables relevant to the question."""
+        handler = ChatCompletionHandler()
+        metadata = {"tables": {
+            "customers": {"columns": [{"name": "customer_id", "primary_key": True}, {"name": "country"}]},
+            "suppliers": {"columns": [{"name": "supplier_id", "primary_key": True}, {"name": "company"}]}
+        }}
+        
+        prompt = handler._create_sql_generation_prompt(metadata, "customers by country")
+        
+        assert "customers" in prompt
+        assert "suppliers" not in prompt
+        assert "customers" in handler._create_sql_generation_prompt(metadata)
+        
     async def test_test_integration(self, mock_openrouter_client, mock_mcp_client):
         """Test integration testing."""
         with patch('fastapi_server.chat_handler.chat_handler.openrouter_client', mock_openrouter_client), \
@@ -321,6 +375,182 @@ class TestChatCompletionHandler:
             assert results["openrouter_connection"] is True
             assert results["mcp_connection"] is True
             assert results["integration_test"] is True
+            
+    @pytest.fixture
+    def pipeline_handler(self, mock_mcp_client, monkeypatch):
+        """Handler whose MCP stages each take 0.1s and whose LLM answers immediately."""
+        monkeypatch.setattr(config, "paraphrase_cache_enabled", True)
+        
+        async def slow(value):
+            await asyncio.sleep(0.1)
+            return value
+            
+        async def get_database_metadata():
+            return await slow({"tables": {}})
+            
+        async def list_tools():
+            return await slow([])
+            
+        async def execute_query(query):
+            return await slow(MCPQueryResult(success=True, data=[{"n": 1}], columns=["n"], row_count=1))
+            
+        mock_mcp_client.get_database_metadata = AsyncMock(side_effect=get_database_metadata)
+        mock_mcp_client.list_tools = AsyncMock(side_effect=list_tools)
+        mock_mcp_client.execute_query = AsyncMock(side_effect=execute_query)
+        
+        handler = ChatCompletionHandler()
+        handler.mcp_client = mock_mcp_client
+        handler.llm_client = AsyncMock()
+        handler.llm_client.create_completion_with_mcp_context = AsyncMock(return_value=ChatCompletionResponse(
+            id="chatcmpl-test",
+            created=0,
+            model="test-model",
+            choices=[Choice(index=0, message=ChatMessage(role=MessageRole.ASSISTANT, content="One row"))]
+        ))
+        return handler
+        
+    async def test_independent_stages_run_concurrently(self, pipeline_handler):
+        """Test that metadata, tools and an explicit query are fetched at the same time."""
+        request = ChatCompletionRequest(messages=[ChatMessage(role=MessageRole.USER, content="SELECT n FROM t")])
+        
+        started = time.monotonic()
+        response = await pipeline_handler.process_chat_completion(request)
+        
+        assert time.monotonic() - started < 0.25
+        assert set(response.timings) == {"metadata", "tools", "query", "completion", "total"}
+        assert response.timings["total"] < response.timings["metadata"] + response.timings["query"]
+        assert response.choices[0].query_result.data == [{"n": 1}]
+        
+    async def test_slow_optional_stage_is_skipped(self, pipeline_handler, monkeypatch):
+        """Test that a stage past its timeout is dropped instead of failing the request."""
+        monkeypatch.setattr(config, "chat_tools_timeout", 0.01)
+        request = ChatCompletionRequest(messages=[ChatMessage(role=MessageRole.USER, content="SELECT n FROM t")])
+        
+        response = await pipeline_handler.process_chat_completion(request)
+        
+        context = pipeline_handler.llm_client.create_completion_with_mcp_context.call_args.kwargs["mcp_context"]
+        assert context["available_tools"] == []
+        assert response.choices[0].finish_reason != "error"
+        
+    async def test_repeat_question_skips_sql_generation(self, pipeline_handler):
+        """Test that SQL generated for a question is reused when it is asked again."""
+        pipeline_handler.llm_client._get_model_name = MagicMock(return_value="test-model")
+        pipeline_handler._suggest_sql_query = AsyncMock(return_value="SELECT n FROM t")
+        
+        for question in ("How many customers are there?", "how many customers are there"):
+            request = ChatCompletionRequest(messages=[ChatMessage(role=MessageRole.USER, content=question)])
+            response = await pipeline_handler.process_chat_completion(request)
+            assert response.choices[0].query_result.data == [{"n": 1}]
+            
+        pipeline_handler._suggest_sql_query.assert_awaited_once()
+        assert "sql_generation" not in response.timings
+        assert pipeline_handler.stats()["sql_cache"]["hits"] == 1
+        
+    async def test_failed_cached_sql_is_discarded(self, pipeline_handler):
+        """Test that cached SQL that no longer runs is dropped."""
+        pipeline_handler.llm_client._get_model_name = MagicMock(return_value="test-model")
+        pipeline_handler._suggest_sql_query = AsyncMock(return_value="SELECT n FROM t")
+        request = ChatCompletionRequest(messages=[ChatMessage(role=MessageRole.USER, content="How many customers?")])
+        await pipeline_handler.process_chat_completion(request)
+        
+        pipeline_handler.mcp_client.execute_query = AsyncMock(
+            return_value=MCPQueryResult(success=False, error="no such table: t")
+        )
+        await pipeline_handler.process_chat_completion(request)
+        
+        assert pipeline_handler.stats()["sql_cache"]["entries"] == 0
+        assert pipeline_handler.stats()["paraphrase_cache"]["entries"] == 0
+        
+    async def test_paraphrased_question_reuses_sql(self, pipeline_handler):
+        """Test that a rephrased question reuses the SQL of the original one."""
+        pipeline_handler.llm_client._get_model_name = MagicMock(return_value="test-model")
+        pipeline_handler._suggest_sql_query = AsyncMock(return_value="SELECT COUNT(*) AS n FROM customers")
+        
+        for question in ("How many customers do we have?", "Show the count of customers"):
+            request = ChatCompletionRequest(messages=[ChatMessage(role=MessageRole.USER, content=question)])
+            await pipeline_handler.process_chat_completion(request)
+            
+        pipeline_handler._suggest_sql_query.assert_awaited_once()
+        assert pipeline_handler.stats()["paraphrase_cache"]["hits"] == 1
+        assert pipeline_handler.stats()["sql_cache"]["entries"] == 1
+        
+    async def test_tool_calling_mode_runs_model_queries(self, pipeline_handler, monkeypatch):
+        """Test that in tool-calling mode the model's query runs without a separate SQL generation call."""
+        monkeypatch.setattr(config, "chat_orchestration_mode", "tool_calling")
+        pipeline_handler.llm_client._get_model_name = MagicMock(return_value="test-model")
+        pipeline_handler._suggest_sql_query = AsyncMock()
+        pipeline_handler.mcp_client.list_tools = AsyncMock(return_value=[MCPTool(
+            name="execute_query",
+            description="Execute a SELECT query",
+            input_schema={"type": "object", "properties": {"query": {"type": "string"}}}
+        )])
+        
+        async def create_completion_with_tools(messages, tools, execute_tool, max_rounds):
+            assert tools[0]["function"]["name"] == "execute_query"
+            assert messages[0].role == MessageRole.SYSTEM
+            results = await asyncio.gather(
+                execute_tool("execute_query", {"query": "SELECT n FROM t"}),
+                execute_tool("drop_table", {})
+            )
+            assert json.loads(results[0])["rows"] == [{"n": 1}]
+            assert "error" in json.loads(results[1])
+            return pipeline_handler.llm_client.create_completion_with_mcp_context.return_value
+            
+        pipeline_handler.llm_client.create_completion_with_tools = AsyncMock(side_effect=create_completion_with_tools)
+        request = ChatCompletionRequest(messages=[ChatMessage(role=MessageRole.USER, content="How many customers?")])
+        
+        response = await pipeline_handler.process_chat_completion(request)
+        
+        assert response.choices[0].query_result.data == [{"n": 1}]
+        pipeline_handler._suggest_sql_query.assert_not_awaited()
+        pipeline_handler.llm_client.create_completion_with_mcp_context.assert_not_awaited()
+        
+        # The model's SQL is cached, so asking again takes a single completion with the results
+        await pipeline_handler.process_chat_completion(request)
+        
+        pipeline_handler.llm_client.create_completion_with_tools.assert_awaited_once()
+        pipeline_handler.llm_client.create_completion_with_mcp_context.assert_awaited_once()
+        
+    async def test_generated_sql_is_repaired_before_running(self, pipeline_handler):
+        """Test that generated SQL is checked against the schema and repaired locally."""
+        metadata = {"tables": {"customers": {"columns": [{"name": "first_name", "type": "TEXT"}]}}}
+        pipeline_handler.llm_client.create_chat_completion = AsyncMock(return_value=ChatCompletionResponse(
+            id="chatcmpl-sql",
+            created=0,
+            model="test-model",
+            choices=[Choice(index=0, message=ChatMessage(
+                role=MessageRole.ASSISTANT, content="```sql\nSELECT frist_name FROM customers;\n```"
+            ))]
+        ))
+        
+        sql_query = await pipeline_handler._suggest_sql_query("List customer names", metadata)
+        
+        assert sql_query == f"SELECT first_name FROM customers LIMIT {config.sql_preflight_row_limit}"
+        assert pipeline_handler.stats()["sql_preflight"] == {"checked": 1, "repaired": 1, "rejected": 0}
+        
+    async def test_unrepairable_model_query_is_rejected_without_round_trip(self, pipeline_handler, monkeypatch):
+        """Test that in tool-calling mode a broken query goes back to the model instead of the server."""
+        monkeypatch.setattr(config, "chat_orchestration_mode", "tool_calling")
+        pipeline_handler.llm_client._get_model_name = MagicMock(return_value="test-model")
+        pipeline_handler.mcp_client.get_database_metadata = AsyncMock(return_value={
+            "tables": {"customers": {"columns": [{"name": "first_name", "type": "TEXT"}]}}
+        })
+        pipeline_handler.mcp_client.list_tools = AsyncMock(return_value=[MCPTool(
+            name="execute_query", input_schema={"type": "object", "properties": {"query": {"type": "string"}}}
+        )])
+        tool_results = []
+        
+        async def create_completion_with_tools(messages, tools, execute_tool, max_rounds):
+            tool_results.append(json.loads(await execute_tool("execute_query", {"query": "SELECT age FROM customers"})))
+            return pipeline_handler.llm_client.create_completion_with_mcp_context.return_value
+            
+        pipeline_handler.llm_client.create_completion_with_tools = AsyncMock(side_effect=create_completion_with_tools)
+        request = ChatCompletionRequest(messages=[ChatMessage(role=MessageRole.USER, content="Show the age of customers in the database")])
+        
+        await pipeline_handler.process_chat_completion(request)
+        
+        assert tool_results == [{"error": "Query rejected before execution: no such column: age"}]
+        pipeline_handler.mcp_client.execute_query.assert_not_awaited()
 
 
 # Pytest configuration
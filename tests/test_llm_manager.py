@@ -181,6 +181,69 @@ class TestLLMManager:
             assert response.choices[0].message.content == "Test response"
             mock_llm.ainvoke.assert_called_once()
     
+    @pytest.mark.asyncio
+    async def test_create_completion_with_tools(self, mock_openrouter_config):
+        """Test that tool calls are executed concurrently and the conversation continues."""
+        with patch('fastapi_server.llm_manager.ChatOpenAI') as mock_chat_openai:
+            mock_llm = MagicMock()
+            mock_chat_openai.return_value = mock_llm
+            tool_model = MagicMock()
+            mock_llm.bind_tools.return_value = tool_model
+            tool_model.ainvoke = AsyncMock(side_effect=[
+                AIMessage(content="", tool_calls=[
+                    {"name": "execute_query", "args": {"query": "SELECT 1"}, "id": "call_1"},
+                    {"name": "execute_query", "args": {"query": "SELECT 2"}, "id": "call_2"}
+                ]),
+                AIMessage(content="Both queries returned one row")
+            ])
+            
+            running = []
+            
+            async def execute_tool(name, arguments):
+                running.append(arguments["query"])
+                await asyncio.sleep(0.05)
+                return f"result of {arguments['query']}"
+            
+            manager = LLMManager()
+            tools = [{"type": "function", "function": {"name": "execute_query", "parameters": {}}}]
+            messages = [ChatMessage(role=MessageRole.USER, content="Compare the two counts")]
+            
+            started = asyncio.get_running_loop().time()
+            response = await manager.create_completion_with_tools(messages, tools, execute_tool)
+            
+            assert asyncio.get_running_loop().time() - started < 0.09
+            assert response.choices[0].message.content == "Both queries returned one row"
+            assert running == ["SELECT 1", "SELECT 2"]
+            followup = tool_model.ainvoke.call_args_list[1].args[0]
+            assert [message.tool_call_id for message in followup[-2:]] == ["call_1", "call_2"]
+            assert followup[-1].content == "result of SELECT 2"
+            mock_llm.bind_tools.assert_called_once_with(tools)
+    
+    @pytest.mark.asyncio
+    async def test_create_completion_with_tools_stops_after_max_rounds(self, mock_openrouter_config):
+        """Test that the model is asked without tools once the rounds are used up."""
+        with patch('fastapi_server.llm_manager.ChatOpenAI') as mock_chat_openai:
+            mock_llm = MagicMock()
+            mock_chat_openai.return_value = mock_llm
+            tool_model = MagicMock()
+            mock_llm.bind_tools.return_value = tool_model
+            tool_model.ainvoke = AsyncMock(return_value=AIMessage(content="", tool_calls=[
+                {"name": "execute_query", "args": {"query": "SELECT 1"}, "id": "call_1"}
+            ]))
+            mock_llm.ainvoke = AsyncMock(return_value=AIMessage(content="Final answer"))
+            
+            manager = LLMManager()
+            tools = [{"type": "function", "function": {"name": "execute_query", "parameters": {}}}]
+            messages = [ChatMessage(role=MessageRole.USER, content="Keep querying")]
+            
+            response = await manager.create_completion_with_tools(
+                messages, tools, AsyncMock(return_value="[]"), max_rounds=2
+            )
+            
+            assert response.choices[0].message.content == "Final answer"
+            assert tool_model.ainvoke.await_count == 2
+            mock_llm.ainvoke.assert_awaited_once()
+    
     @pytest.mark.asyncio
     async def test_create_chat_completion_with_mcp_context(self, mock_openrouter_config):
         """Test chat completion with MCP context."""
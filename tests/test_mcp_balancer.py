@@ -0,0 +1,144 @@
+"""Tests for load balancing across MCP backends."""
+
+import asyncio
+
+import pytest
+from mcp.shared.exceptions import McpError
+from mcp.types import ErrorData
+
+from fastapi_server.circuit_breaker import CircuitBreaker
+from fastapi_server.mcp_balancer import Backend, MCPLoadBalancer
+from fastapi_server.mcp_pool import MCPPoolError
+from fastapi_server.retry_utils import RetryConfig
+
+
+class FakePool:
+    """Stand-in session pool with scripted latency and errors."""
+    
+    def __init__(self, name, latency=0.0, error=None, start_failures=0):
+        self.name = name
+        self.latency = latency
+        self.error = error
+        self.start_failures = start_failures
+        self.calls = 0
+        
+    async def start(self):
+        if self.start_failures:
+            self.start_failures -= 1
+            raise MCPPoolError(f"{self.name} refused connection")
+            
+    async def run(self, operation):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if self.error:
+            raise self.error
+        return self.name
+        
+    def stats(self):
+        return {"calls": self.calls}
+        
+    async def close(self):
+        pass
+
+
+def make_balancer(*pools):
+    """Create a balancer with one backend per fake pool."""
+    backends = [
+        Backend(pool.name, lambda pool=pool: pool, CircuitBreaker(pool.name, failure_threshold=2, reset_timeout=60.0))
+        for pool in pools
+    ]
+    return MCPLoadBalancer(backends, reopen_retry=RetryConfig(initial_delay=0.01, max_delay=0.01))
+
+
+class TestMCPLoadBalancer:
+    """Test cases for MCPLoadBalancer class."""
+    
+    async def test_prefers_lowest_latency_backend(self):
+        """Test that most requests go to the backend with the lowest latency average."""
+        fast, slow = FakePool("fast", latency=0.001), FakePool("slow", latency=0.03)
+        balancer = make_balancer(slow, fast)
+        await balancer.start()
+        
+        for _ in range(20):
+            await balancer.run(None)
+            
+        assert fast.calls >= 18
+        assert slow.calls >= 1
+        stats = balancer.stats()["backends"]
+        assert stats[0]["latency_ewma_ms"] > stats[1]["latency_ewma_ms"]
+        
+    async def test_spreads_concurrent_load(self):
+        """Test that requests in flight push load onto other backends."""
+        first, second = FakePool("a", latency=0.02), FakePool("b", latency=0.02)
+        balancer = make_balancer(first, second)
+        await balancer.start()
+        await asyncio.gather(balancer.run(None), balancer.run(None))
+        
+        await asyncio.gather(*(balancer.run(None) for _ in range(10)))
+        
+        assert first.calls >= 4
+        assert second.calls >= 4
+        
+    async def test_fails_over_and_opens_circuit(self):
+        """Test that failing backends are skipped and taken out of rotation."""
+        broken = FakePool("broken", error=ConnectionError("reset by peer"))
+        healthy = FakePool("healthy", latency=0.01)
+        balancer = make_balancer(broken, healthy)
+        await balancer.start()
+        
+        results = [await balancer.run(None) for _ in range(6)]
+        
+        assert results == ["healthy"] * 6
+        assert broken.calls == 2
+        stats = balancer.stats()
+        assert stats["failovers"] == 2
+        assert stats["backends"][0]["circuit"]["state"] == "open"
+        assert stats["backends"][0]["failures"] == 2
+        assert not stats["backends"][0]["available"]
+        
+    async def test_server_errors_are_not_failed_over(self):
+        """Test that errors answered by a backend are raised without trying another."""
+        answering = FakePool("a", error=McpError(ErrorData(code=-32602, message="Unknown resource")))
+        other = FakePool("b")
+        balancer = make_balancer(answering, other)
+        await balancer.start()
+        balancer._next = 0
+        
+        with pytest.raises(McpError):
+            await balancer.run(None)
+            
+        assert answering.calls + other.calls == 1
+        
+    async def test_all_backends_failing_raises_last_error(self):
+        """Test that the last error is raised once every backend failed."""
+        balancer = make_balancer(
+            FakePool("a", error=ConnectionError("a down")),
+            FakePool("b", error=ConnectionError("b down"))
+        )
+        await balancer.start()
+        
+        with pytest.raises(ConnectionError):
+            await balancer.run(None)
+            
+    async def test_backend_that_failed_to_open_is_reopened(self):
+        """Test that start succeeds with one backend down and reopens it in the background."""
+        down = FakePool("down", start_failures=1)
+        balancer = make_balancer(down, FakePool("up"))
+        await balancer.start()
+        
+        assert balancer.backends[0].pool is None
+        for _ in range(100):
+            if balancer.backends[0].pool is not None:
+                break
+            await asyncio.sleep(0.01)
+            
+        assert balancer.backends[0].available
+        await balancer.close()
+        
+    async def test_start_fails_when_no_backend_opens(self):
+        """Test that start raises when every backend is down."""
+        balancer = make_balancer(FakePool("a", start_failures=1), FakePool("b", start_failures=1))
+        
+        with pytest.raises(MCPPoolError, match="Could not open any MCP backend"):
+            await balancer.start()
+        await balancer.close()
@@ -0,0 +1,65 @@
+"""Tests for the client-side MCP response cache."""
+
+import time
+
+from fastapi_server.mcp_cache import ClientCache
+
+
+class TestClientCache:
+    """Test cases for ClientCache."""
+    
+    def test_evicts_least_recently_used_by_bytes(self):
+        """Test that the byte budget evicts the least recently used entries."""
+        cache = ClientCache(max_bytes=100)
+        cache.put("results", "a", "A", size=40, ttl=60)
+        cache.put("results", "b", "B", size=40, ttl=60)
+        assert cache.get("results", "a") == "A"
+        
+        cache.put("results", "c", "C", size=40, ttl=60)
+        
+        assert cache.get("results", "b") is None
+        assert cache.get("results", "a") == "A"
+        assert cache.stats()["bytes"] == 80
+        assert cache.stats()["evictions"] == 1
+        
+    def test_skips_oversized_values_and_zero_ttl(self):
+        """Test that values that cannot be cached are not stored."""
+        cache = ClientCache(max_bytes=10)
+        cache.put("results", "big", "X", size=11, ttl=60)
+        cache.put("results", "off", "X", size=1, ttl=0)
+        
+        assert cache.stats()["entries"] == 0
+        
+    def test_expired_entries_are_misses(self, monkeypatch):
+        """Test that entries past their TTL are dropped on read."""
+        cache = ClientCache(max_bytes=100)
+        cache.put("metadata", "m", {"tables": {}}, size=10, ttl=5)
+        
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 6)
+        
+        assert cache.get("metadata", "m") is None
+        assert cache.stats()["entries"] == 0
+        assert cache.stats()["misses"] == 1
+        
+    def test_new_version_drops_stale_entries(self):
+        """Test that a newer version invalidates entries of the old one in the same namespace."""
+        cache = ClientCache(max_bytes=100)
+        cache.put("results", "q1", "old", size=1, ttl=60, version="v1")
+        cache.put("metadata", "m", "meta", size=1, ttl=60, version="v1")
+        
+        cache.put("results", "q2", "new", size=1, ttl=60, version="v2")
+        
+        assert cache.get("results", "q1") is None
+        assert cache.get("results", "q2") == "new"
+        assert cache.get("metadata", "m") == "meta"
+        
+    def test_invalidate_namespace(self):
+        """Test that invalidating a namespace leaves the others alone."""
+        cache = ClientCache(max_bytes=100)
+        cache.put("tools", "list", [], size=1, ttl=60)
+        cache.put("metadata", "m", {}, size=1, ttl=60)
+        
+        assert cache.invalidate("tools") == 1
+        assert cache.get("tools", "list") is None
+        assert cache.get("metadata", "m") == {}
@@ -0,0 +1,351 @@
+"""Tests for the MCP client connection state machine."""
+
+import asyncio
+import json
+import time
+
+import pytest
+from mcp import types
+from mcp.shared.exceptions import McpError
+from mcp.types import ErrorData
+
+from fastapi_server.circuit_breaker import CircuitBreaker
+from fastapi_server.config import config
+from fastapi_server.deadlines import reset_request_budget, start_request_budget
+from fastapi_server.mcp_client import ConnectionState, MCPClientError, MCPDatabaseClient, decode_query_result
+from fastapi_server.mcp_pool import MCPPoolError
+from fastapi_server.retry_utils import RetryConfig
+
+
+class FakePool:
+    """Stand-in session pool that can be broken on demand."""
+    
+    def __init__(self):
+        self.broken = False
+        self.session_died = False
+        self.hang = False
+        self.error = None
+        self.result = None
+        self.calls = 0
+        self.closed = False
+        
+    async def run(self, operation):
+        self.calls += 1
+        await asyncio.sleep(0)
+        if self.broken:
+            raise MCPPoolError("No MCP session became available within 0s")
+        if self.session_died:
+            raise MCPPoolError("Session fake-2 closed during the request")
+        if self.hang:
+            await asyncio.Event().wait()
+        if self.error:
+            raise self.error
+        if self.result is not None:
+            return self.result
+        raise RuntimeError("not used")
+        
+    @property
+    def live_sessions(self):
+        return 0 if self.broken else 1
+        
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def client():
+    """Create a client whose pool opening is scripted by each test."""
+    client = MCPDatabaseClient()
+    client.retry_config = RetryConfig(max_retries=3, initial_delay=0.01, max_delay=0.05)
+    client.opened = []
+    client.failures_left = 0
+    
+    async def open_pool():
+        await asyncio.sleep(0.02)
+        if client.failures_left:
+            client.failures_left -= 1
+            raise ConnectionError("connection refused")
+        pool = FakePool()
+        client.opened.append(pool)
+        return pool
+        
+    client._open_pool = open_pool
+    return client
+
+
+class TestConnectionState:
+    """Test cases for MCPDatabaseClient connection handling."""
+    
+    async def test_concurrent_callers_share_one_connect(self, client):
+        """Test that concurrent callers wait on a single connection attempt."""
+        await asyncio.gather(*(client.connect() for _ in range(10)))
+        
+        assert len(client.opened) == 1
+        assert client.state is ConnectionState.CONNECTED
+        assert client.connection_status()["connects"] == 1
+        
+    async def test_retries_with_backoff(self, client):
+        """Test that failed attempts are retried after a backoff delay."""
+        client.failures_left = 2
+        states = []
+        set_state = client._set_state
+        client._set_state = lambda state: (states.append(state), set_state(state))
+        
+        await client.connect()
+        
+        assert client.connected
+        assert states == [
+            ConnectionState.CONNECTING, ConnectionState.BACKOFF,
+            ConnectionState.CONNECTING, ConnectionState.BACKOFF,
+            ConnectionState.CONNECTING, ConnectionState.CONNECTED
+        ]
+        assert client.connection_status()["consecutive_failures"] == 0
+        
+    async def test_failed_round_fails_fast_until_backoff_passes(self, client):
+        """Test that callers fail fast while the failed connection backs off."""
+        client.failures_left = 3
+        
+        with pytest.raises(MCPClientError, match="connection refused"):
+            await client.connect()
+        assert client.state is ConnectionState.FAILED
+        status = client.connection_status()
+        assert status["consecutive_failures"] == 3
+        assert status["retry_in_seconds"] > 0
+        
+        with pytest.raises(MCPClientError, match="next connection attempt"):
+            await client.connect()
+            
+        await asyncio.sleep(status["retry_in_seconds"] + 0.01)
+        await client.connect()
+        assert client.connected
+        assert len(client.opened) == 1
+        
+    async def test_lost_connection_triggers_single_reconnect(self, client):
+        """Test that a pool that cannot serve requests is replaced by one reconnect."""
+        await client.connect()
+        client.opened[0].broken = True
+        
+        results = await asyncio.gather(*(client.execute_query("SELECT 1") for _ in range(5)))
+        
+        assert all(not result.success for result in results)
+        assert client.state is ConnectionState.DISCONNECTED
+        await asyncio.sleep(0)
+        assert client.opened[0].closed
+        
+        await asyncio.gather(*(client.connect() for _ in range(5)))
+        assert len(client.opened) == 2
+        assert client.connection_status()["connects"] == 2
+        
+    async def test_dead_session_keeps_healthy_sessions_connected(self, client):
+        """Test that a session dying while others are alive does not drop the pool."""
+        await client.connect()
+        pool = client.opened[0]
+        pool.session_died = True
+        
+        result = await client.execute_query("SELECT 1")
+        
+        assert not result.success
+        assert "MCP session failed" in result.error
+        assert client.state is ConnectionState.CONNECTED
+        assert client.pool is pool
+        await asyncio.sleep(0)
+        assert not pool.closed
+        
+    async def test_disconnect_cancels_connection_attempt(self, client):
+        """Test that disconnecting stops an attempt in progress."""
+        client.failures_left = 3
+        attempt = asyncio.create_task(client.connect())
+        await asyncio.sleep(0.01)
+        
+        await client.disconnect()
+        
+        with pytest.raises(asyncio.CancelledError):
+            await attempt
+        assert client.state is ConnectionState.DISCONNECTED
+
+
+@pytest.fixture
+def request_budget():
+    """Run the test inside a short request budget."""
+    token = start_request_budget(0.1)
+    yield
+    reset_request_budget(token)
+
+
+class TestCallDeadlines:
+    """Test cases for MCP call deadlines and the circuit breaker."""
+    
+    async def test_hung_call_times_out_within_request_budget(self, client, request_budget):
+        """Test that a call to a hung server ends when the request budget runs out."""
+        await client.connect()
+        client.opened[0].hang = True
+        
+        started = time.monotonic()
+        result = await client.execute_query("SELECT 1")
+        
+        assert not result.success
+        assert "timed out" in result.error
+        assert time.monotonic() - started < 1.0
+        
+    async def test_exhausted_budget_skips_call(self, client):
+        """Test that no call is made once the request deadline has passed."""
+        await client.connect()
+        token = start_request_budget(0)
+        try:
+            result = await client.execute_query("SELECT 1")
+        finally:
+            reset_request_budget(token)
+            
+        assert "deadline passed" in result.error
+        assert client.opened[0].calls == 1
+        
+    async def test_breaker_opens_after_timeouts_and_fails_fast(self, client):
+        """Test that repeated timeouts open the circuit so later calls fail immediately."""
+        client.breaker = CircuitBreaker("MCP server", failure_threshold=2, reset_timeout=60.0)
+        await client.connect()
+        pool = client.opened[0]
+        pool.hang = True
+        
+        for _ in range(2):
+            token = start_request_budget(0.05)
+            try:
+                assert "timed out" in (await client.execute_query("SELECT 1")).error
+            finally:
+                reset_request_budget(token)
+        calls = pool.calls
+        result = await client.execute_query("SELECT 1")
+        
+        assert "circuit open" in result.error
+        assert pool.calls == calls
+        assert client.connection_status()["circuit"]["state"] == "open"
+        
+    async def test_server_errors_do_not_trip_breaker(self, client):
+        """Test that errors answered by the server count as a responsive server."""
+        client.breaker = CircuitBreaker("MCP server", failure_threshold=1)
+        await client.connect()
+        client.opened[0].error = McpError(ErrorData(code=-32602, message="Unknown resource"))
+        
+        assert await client.get_table_metadata("missing") is None
+        
+        assert client.connection_status()["circuit"]["state"] == "closed"
+
+
+
+def query_result(version):
+    """Build an execute_query tool result stamped with a data version."""
+    payload = {"success": True, "columns": ["n"], "rows": [{"n": 1}], "version": version}
+    return types.CallToolResult(content=[types.TextContent(type="text", text=json.dumps(payload))])
+
+
+def metadata_result(version):
+    """Build a database://metadata resource result stamped with a version."""
+    payload = {"tables": {"customers": {}}, "version": version}
+    return types.ReadResourceResult(contents=[
+        types.TextResourceContents(uri="database://metadata", text=json.dumps(payload))
+    ])
+
+
+class TestQueryResultDecoding:
+    """Test cases for decoding execute_query tool results."""
+    
+    def test_structured_content_is_used_without_parsing_text(self):
+        """Test that structured content is taken as is and the text is not parsed."""
+        structured = {"columns": ["n"], "rows": [{"n": 1}, {"n": 2}], "row_count": 2, "version": "s1-g1"}
+        result = types.CallToolResult(
+            content=[types.TextContent(type="text", text="not json")],
+            structuredContent=structured
+        )
+        
+        query_result, size = decode_query_result(result)
+        
+        assert query_result.success
+        assert query_result.data is structured["rows"]
+        assert query_result.row_count == 2
+        assert query_result.version == "s1-g1"
+        assert size == len("not json")
+        
+    def test_text_content_is_parsed_without_structured_content(self):
+        """Test that servers without structured content still work."""
+        result = query_result("s1-g1")
+        
+        decoded, size = decode_query_result(result)
+        
+        assert decoded.data == [{"n": 1}]
+        assert decoded.columns == ["n"]
+        assert size == len(result.content[0].text)
+
+
+class TestClientCache:
+    """Test cases for caching MCP responses in the client."""
+    
+    async def test_results_are_not_cached_by_default(self, client):
+        """Test that without a result TTL every query reaches the server."""
+        await client.connect()
+        pool = client.opened[0]
+        pool.result = query_result("s1-g1")
+        calls = pool.calls
+        
+        await client.execute_query("SELECT 1")
+        await client.execute_query("SELECT 1")
+        
+        assert pool.calls == calls + 2
+        
+    async def test_repeated_query_is_served_from_cache(self, client, monkeypatch):
+        """Test that the same query, modulo whitespace, makes a single call."""
+        monkeypatch.setattr(config, "mcp_result_cache_ttl", 30.0)
+        await client.connect()
+        pool = client.opened[0]
+        pool.result = query_result("s1-g1")
+        calls = pool.calls
+        
+        first = await client.execute_query("SELECT n FROM t")
+        second = await client.execute_query("SELECT n\n  FROM t")
+        
+        assert pool.calls == calls + 1
+        assert second.data == first.data
+        assert second is first
+        
+    async def test_newer_data_version_drops_cached_results(self, client, monkeypatch):
+        """Test that seeing a newer data version evicts results of the old one."""
+        monkeypatch.setattr(config, "mcp_result_cache_ttl", 30.0)
+        await client.connect()
+        pool = client.opened[0]
+        pool.result = query_result("s1-g1")
+        await client.execute_query("SELECT 1")
+        
+        pool.result = query_result("s1-g2")
+        await client.execute_query("SELECT 2")
+        calls = pool.calls
+        await client.execute_query("SELECT 1")
+        
+        assert pool.calls == calls + 1
+        
+    async def test_update_notification_clears_metadata(self, client):
+        """Test that a resource update notification forces a refetch."""
+        await client.connect()
+        pool = client.opened[0]
+        pool.result = metadata_result("s1-g1")
+        calls = pool.calls
+        
+        await client.get_database_metadata()
+        await client.get_database_metadata()
+        assert pool.calls == calls + 1
+        
+        await client._handle_message(types.ServerNotification(types.ResourceUpdatedNotification(
+            method="notifications/resources/updated",
+            params=types.ResourceUpdatedNotificationParams(uri="database://metadata")
+        )))
+        await client.get_database_metadata()
+        
+        assert pool.calls == calls + 2
+        
+    async def test_failed_queries_are_not_cached(self, client):
+        """Test that errors are retried instead of served from the cache."""
+        await client.connect()
+        pool = client.opened[0]
+        pool.error = McpError(ErrorData(code=-32602, message="bad query"))
+        
+        await client.execute_query("SELECT 1")
+        await client.execute_query("SELECT 1")
+        
+        assert client.cache.stats()["entries"] == 0
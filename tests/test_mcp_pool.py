@@ -0,0 +1,260 @@
+"""Tests for the MCP client session pool."""
+
+import asyncio
+import json
+import os
+import sqlite3
+import sys
+
+import pytest
+from mcp import StdioServerParameters
+
+from mcp.client.stdio import stdio_client
+from mcp.shared.exceptions import McpError
+
+from fastapi_server.mcp_pool import MCPPoolError, MCPSessionPool
+
+
+QUERY = {"query": "SELECT n FROM t"}
+
+
+@pytest.fixture
+def server_params(tmp_path):
+    """Parameters starting a stdio server on a small database."""
+    path = tmp_path / "test.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE t (n INTEGER)")
+        conn.execute("INSERT INTO t VALUES (1)")
+        conn.commit()
+    return StdioServerParameters(
+        command=sys.executable,
+        args=["-m", "talk_2_tables_mcp"],
+        env={
+            **os.environ,
+            "DATABASE_PATH": str(path),
+            "METADATA_PATH": str(tmp_path / "metadata.json"),
+            "LOG_LEVEL": "WARNING"
+        }
+    )
+
+
+def stdio_pool(server_params, **kwargs):
+    """Create a session pool of stdio server processes."""
+    return MCPSessionPool(lambda: stdio_client(server_params), name="stdio", **kwargs)
+
+
+async def wait_for_alive(pool, count, timeout=30.0):
+    """Wait until the pool has the given number of live sessions."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while pool.stats()["alive"] < count:
+        assert loop.time() < deadline, pool.stats()
+        await asyncio.sleep(0.05)
+
+
+class TestMCPSessionPool:
+    """Test cases for MCPSessionPool class."""
+    
+    async def test_least_outstanding_spreads_concurrent_requests(self, server_params):
+        """Test that concurrent requests go to the least busy sessions."""
+        pool = stdio_pool(server_params, size=2)
+        await pool.start()
+        try:
+            async with pool.session() as first, pool.session() as second:
+                assert first is not second
+                results = await asyncio.gather(
+                    first.call_tool("execute_query", QUERY),
+                    second.call_tool("execute_query", QUERY)
+                )
+                assert pool.stats()["outstanding"] == 2
+                
+            for result in results:
+                assert json.loads(result.content[0].text)["rows"] == [{"n": 1}]
+            stats = pool.stats()
+            assert stats["outstanding"] == 0
+            assert [session["requests"] for session in stats["sessions"]] == [1, 1]
+        finally:
+            await pool.close()
+            
+    async def test_sessions_are_shared_beyond_pool_size(self, server_params):
+        """Test that more concurrent requests than sessions all run at once."""
+        pool = stdio_pool(server_params, size=2)
+        await pool.start()
+        release = asyncio.Event()
+        started = 0
+        
+        async def operation(session):
+            nonlocal started
+            started += 1
+            await release.wait()
+            return await session.call_tool("execute_query", QUERY)
+            
+        try:
+            tasks = [asyncio.create_task(pool.run(operation)) for _ in range(6)]
+            while started < 6:
+                await asyncio.sleep(0.01)
+            assert [session["outstanding"] for session in pool.stats()["sessions"]] == [3, 3]
+            
+            release.set()
+            results = await asyncio.gather(*tasks)
+            
+            assert all(not result.isError for result in results)
+        finally:
+            await pool.close()
+            
+    async def test_dead_sessions_are_retired_alone(self, server_params):
+        """Test that sessions dying under a request are retired while a healthy one keeps serving."""
+        pool = stdio_pool(server_params, size=3, health_check_interval=0)
+        await pool.start()
+        deaths = 0
+        
+        async def operation(session):
+            nonlocal deaths
+            if deaths == 2:
+                return await session.call_tool("execute_query", QUERY)
+            deaths += 1
+            pooled = next(pooled for pooled in pool._sessions if pooled.session is session)
+            asyncio.create_task(pooled.close())
+            await asyncio.Event().wait()
+            
+        try:
+            # Both the first attempt and its retry land on a dying session
+            with pytest.raises(MCPPoolError):
+                await pool.run(operation)
+                
+            assert pool.live_sessions == 1
+            result = await pool.run(operation)
+            assert not result.isError
+        finally:
+            await pool.close()
+            
+    async def test_round_robin(self, server_params):
+        """Test that round-robin selection alternates between sessions."""
+        pool = stdio_pool(server_params, size=2, strategy="round_robin")
+        await pool.start()
+        try:
+            used = []
+            for _ in range(4):
+                async with pool.session() as session:
+                    used.append(session)
+                    
+            assert used[0] is used[2]
+            assert used[1] is used[3]
+            assert used[0] is not used[1]
+        finally:
+            await pool.close()
+            
+    async def test_dead_session_is_replaced(self, server_params):
+        """Test that a session whose server went away is replaced in the background."""
+        pool = stdio_pool(server_params, size=1)
+        await pool.start()
+        try:
+            await pool._sessions[0].close()
+            
+            result = await pool.run(lambda session: session.call_tool("execute_query", QUERY))
+            
+            assert not result.isError
+            stats = pool.stats()
+            assert stats["replaced"] == 1
+            assert stats["alive"] == 1
+        finally:
+            await pool.close()
+            
+    async def test_request_retried_when_session_dies_mid_call(self, server_params):
+        """Test that a request whose session dies is retried transparently on another."""
+        pool = stdio_pool(server_params, size=2)
+        await pool.start()
+        calls = []
+        
+        async def operation(session):
+            calls.append(session)
+            if len(calls) == 1:
+                dead = next(pooled for pooled in pool._sessions if pooled.session is session)
+                await dead.close()
+            return await session.call_tool("execute_query", QUERY)
+            
+        try:
+            result = await pool.run(operation)
+            
+            assert not result.isError
+            assert calls[0] is not calls[1]
+            stats = pool.stats()
+            assert stats["retried"] == 1
+            assert stats["failed_health_checks"] == 1
+            await wait_for_alive(pool, 2)
+        finally:
+            await pool.close()
+            
+    async def test_in_flight_request_fails_over_when_session_stops(self, server_params):
+        """Test that a request left waiting on a stopped session is retried on another."""
+        pool = stdio_pool(server_params, size=2)
+        await pool.start()
+        calls = []
+        
+        async def operation(session):
+            calls.append(session)
+            if len(calls) == 1:
+                await asyncio.Event().wait()
+            return await session.call_tool("execute_query", QUERY)
+            
+        try:
+            request = asyncio.create_task(pool.run(operation))
+            while not calls:
+                await asyncio.sleep(0.01)
+            stuck = next(pooled for pooled in pool._sessions if pooled.session is calls[0])
+            await stuck.close()
+            
+            result = await asyncio.wait_for(request, 10.0)
+            
+            assert not result.isError
+            assert pool.stats()["retried"] == 1
+        finally:
+            await pool.close()
+            
+    async def test_errors_from_healthy_session_are_not_retried(self, server_params):
+        """Test that a request error on a live session is raised and the session kept."""
+        pool = stdio_pool(server_params, size=1)
+        await pool.start()
+        try:
+            with pytest.raises(McpError):
+                await pool.run(lambda session: session.read_resource("database://missing"))
+                
+            stats = pool.stats()
+            assert stats["retried"] == 0
+            assert stats["replaced"] == 0
+            assert stats["requests"] == 1
+        finally:
+            await pool.close()
+            
+    async def test_idle_sessions_are_health_checked(self, server_params):
+        """Test that idle sessions are pinged and dead ones replaced in the background."""
+        pool = stdio_pool(server_params, size=1, health_check_interval=0.1)
+        await pool.start()
+        try:
+            dead = pool._sessions[0]
+            await dead.close()
+            
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + 30.0
+            while pool.stats()["replaced"] == 0 or pool.stats()["alive"] == 0:
+                assert loop.time() < deadline, pool.stats()
+                await asyncio.sleep(0.05)
+                
+            assert dead not in pool._sessions
+            assert pool.stats()["failed_health_checks"] == 1
+        finally:
+            await pool.close()
+            
+    async def test_start_fails_when_server_cannot_start(self, tmp_path):
+        """Test that start raises when no session can be opened."""
+        params = StdioServerParameters(command=sys.executable, args=["-c", "import sys; sys.exit(1)"])
+        pool = stdio_pool(params, size=1, start_timeout=10.0)
+        
+        with pytest.raises(MCPPoolError):
+            await pool.start()
+        await pool.close()
+        
+    def test_unknown_strategy_is_rejected(self):
+        """Test that the selection strategy is validated."""
+        with pytest.raises(ValueError, match="strategy"):
+            MCPSessionPool(lambda: None, strategy="random")
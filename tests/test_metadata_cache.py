@@ -0,0 +1,130 @@
+"""Tests for the metadata cache and per-table resources."""
+
+import json
+import sqlite3
+
+import pytest
+
+from talk_2_tables_mcp.config import ServerConfig
+from talk_2_tables_mcp.metadata_cache import MetadataCache
+from talk_2_tables_mcp.server import Talk2TablesMCP
+
+
+class TestMetadataCache:
+    """Test cases for MetadataCache class."""
+    
+    def test_miss_then_hit(self):
+        """Test that a stored document is returned for the same version."""
+        cache = MetadataCache()
+        
+        assert cache.get("database://metadata", "v1") is None
+        cache.put("database://metadata", "v1", "{}")
+        
+        assert cache.get("database://metadata", "v1") == "{}"
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+        
+    def test_version_change_drops_entries(self):
+        """Test that a new version invalidates all entries."""
+        cache = MetadataCache()
+        cache.get("a", "v1")
+        cache.put("a", "v1", "old")
+        
+        assert cache.get("a", "v2") is None
+        assert cache.stats()["entries"] == 0
+        
+    def test_put_for_stale_version_is_ignored(self):
+        """Test that documents built from a superseded version are dropped."""
+        cache = MetadataCache()
+        cache.get("a", "v2")
+        cache.put("a", "v1", "stale")
+        
+        assert cache.get("a", "v2") is None
+
+
+class TestTableResources:
+    """Test cases for the per-table resource templates."""
+    
+    @pytest.fixture
+    def config(self, tmp_path):
+        """Create a configuration with a small database and metadata file."""
+        db_path = tmp_path / "test.db"
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)")
+            conn.execute("CREATE TABLE orders (id INTEGER PRIMARY KEY, user_id INTEGER)")
+            conn.execute("INSERT INTO users (name) VALUES ('Alice'), ('Bob')")
+            conn.commit()
+            
+        metadata = {
+            "server_name": "test-server",
+            "tables": {
+                "users": {"description": "Users", "columns": [{"name": "id"}, {"name": "name"}]},
+                "orders": {"description": "Orders", "columns": [{"name": "id"}, {"name": "user_id"}]}
+            },
+            "relationships": [
+                {"from_table": "orders", "from_column": "user_id", "to_table": "users", "to_column": "id"}
+            ]
+        }
+        metadata_path = tmp_path / "metadata.json"
+        metadata_path.write_text(json.dumps(metadata))
+        
+        return ServerConfig(
+            database_path=str(db_path),
+            metadata_path=str(metadata_path),
+            table_sample_rows=1
+        )
+        
+    async def _read(self, server: Talk2TablesMCP, uri: str):
+        contents = list(await server.mcp.read_resource(uri))
+        return json.loads(contents[0].content)
+        
+    async def test_list_tables(self, config):
+        """Test the table list resource."""
+        server = Talk2TablesMCP(config)
+        result = await self._read(server, "database://tables")
+        
+        assert [table["name"] for table in result["tables"]] == ["users", "orders"]
+        assert result["tables"][0]["uri"] == "database://tables/users"
+        
+    async def test_table_metadata(self, config):
+        """Test reading a single table's metadata."""
+        server = Talk2TablesMCP(config)
+        result = await self._read(server, "database://tables/users")
+        
+        assert result["name"] == "users"
+        assert result["description"] == "Users"
+        assert len(result["relationships"]) == 1
+        assert "version" in result
+        
+    async def test_table_metadata_is_cached(self, config):
+        """Test that repeated reads are served from the cache."""
+        server = Talk2TablesMCP(config)
+        await self._read(server, "database://tables/users")
+        await self._read(server, "database://tables/users")
+        
+        assert server.metadata_cache.stats()["hits"] == 1
+        
+    async def test_table_sample(self, config):
+        """Test reading a table sample."""
+        server = Talk2TablesMCP(config)
+        result = await self._read(server, "database://tables/users/sample")
+        
+        assert result["columns"] == ["id", "name"]
+        assert result["row_count"] == 1
+        
+    async def test_unknown_table(self, config):
+        """Test reading an unknown table."""
+        server = Talk2TablesMCP(config)
+        
+        with pytest.raises(Exception, match="Table not found"):
+            await self._read(server, "database://tables/missing")
+        
+    async def test_table_metadata_includes_column_stats(self, config):
+        """Test that published column statistics appear in table metadata."""
+        server = Talk2TablesMCP(config)
+        await self._read(server, "database://tables/users")
+        
+        server.stats_cache.publish({"users": {"id": {"min": 1, "max": 2}}}, "v1")
+        result = await self._read(server, "database://tables/users")
+        
+        assert result["column_stats"]["id"]["max"] == 2
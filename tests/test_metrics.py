@@ -0,0 +1,101 @@
+"""Tests for the Prometheus metrics endpoint."""
+
+import sqlite3
+
+import httpx
+
+from talk_2_tables_mcp.config import ServerConfig
+from talk_2_tables_mcp.database import DatabaseHandler
+from talk_2_tables_mcp.metrics import MetricsRegistry, render_stats
+from talk_2_tables_mcp.server import Talk2TablesMCP
+
+
+class TestMetricsRegistry:
+    """Test cases for metric rendering."""
+    
+    def test_histogram_buckets_are_cumulative(self):
+        """Test histogram exposition format."""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latency", ["tool"], buckets=[0.1, 1.0])
+        histogram.observe(0.05, tool="q")
+        histogram.observe(0.5, tool="q")
+        
+        text = registry.render()
+        
+        assert '# TYPE latency_seconds histogram' in text
+        assert 'latency_seconds_bucket{tool="q",le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{tool="q",le="1"} 2' in text
+        assert 'latency_seconds_bucket{tool="q",le="+Inf"} 2' in text
+        assert 'latency_seconds_count{tool="q"} 2' in text
+        
+    def test_counter_with_labels(self):
+        """Test counter exposition and label escaping."""
+        registry = MetricsRegistry()
+        counter = registry.counter("errors_total", "Errors", ["reason"])
+        counter.inc(reason='bad "quote"')
+        
+        assert 'errors_total{reason="bad \\"quote\\""} 1' in registry.render()
+        
+    def test_render_stats(self):
+        """Test that runtime stats become gauges and counters."""
+        text = render_stats({
+            "admission": {"queued": 2, "rejected": 3, "wait_seconds_total": 1.5},
+            "metadata_cache": {"version": "v1", "hit_ratio": 0.75}
+        })
+        
+        assert "# TYPE talk2tables_admission_queued gauge" in text
+        assert "talk2tables_admission_rejected_total 3" in text
+        assert "# TYPE talk2tables_admission_wait_seconds_total counter" in text
+        assert "talk2tables_metadata_cache_hit_ratio 0.75" in text
+        assert "version" not in text
+
+
+class TestServerMetrics:
+    """Test cases for metrics recorded by the server."""
+    
+    async def test_tool_calls_are_timed(self):
+        """Test that tool latency, serialization and response size are recorded."""
+        server = Talk2TablesMCP(ServerConfig())
+        
+        @server.mcp.tool()
+        def ping() -> str:
+            return "pong"
+            
+        try:
+            await server.mcp.call_tool("ping", {})
+        finally:
+            server.metrics.loop_monitor.stop()
+            
+        text = server.metrics.registry.render()
+        assert 'talk2tables_tool_duration_seconds_count{tool="ping",status="ok"} 1' in text
+        assert 'talk2tables_query_stage_seconds_count{stage="serialization"} 1' in text
+        assert 'talk2tables_tool_response_bytes_sum{tool="ping"} 4' in text
+        
+    def test_query_stage_timings(self, tmp_path):
+        """Test that the database handler reports validation and execution time."""
+        db_path = tmp_path / "test.db"
+        sqlite3.connect(db_path).close()
+        handler = DatabaseHandler(str(db_path))
+        timings = {}
+        
+        handler.execute_query("SELECT 1", timings)
+        
+        assert set(timings) == {"validation", "execution"}
+        
+    async def test_metrics_route(self):
+        """Test the /metrics endpoint on the HTTP app."""
+        server = Talk2TablesMCP(ServerConfig(transport="sse"))
+        transport = httpx.ASGITransport(app=server.http_app())
+        
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/metrics")
+            
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "talk2tables_admission_active 0" in response.text
+        
+    def test_metrics_can_be_disabled(self):
+        """Test that the route is not registered when metrics are disabled."""
+        server = Talk2TablesMCP(ServerConfig(enable_metrics=False))
+        
+        assert server.mcp._custom_starlette_routes == []
@@ -0,0 +1,122 @@
+"""Tests for policy-driven MCP log notifications."""
+
+import sqlite3
+
+import pytest
+
+from talk_2_tables_mcp.config import ServerConfig
+from talk_2_tables_mcp.notifications import ContextNotifier
+from talk_2_tables_mcp.server import Talk2TablesMCP
+
+
+class RecordingContext:
+    """Minimal stand-in for the MCP context that records notifications."""
+    
+    def __init__(self):
+        self.sent = []
+        
+    async def debug(self, message):
+        self.sent.append(("debug", message))
+        
+    async def info(self, message):
+        self.sent.append(("info", message))
+        
+    async def warning(self, message):
+        self.sent.append(("warning", message))
+        
+    async def error(self, message):
+        self.sent.append(("error", message))
+
+
+class Unformattable:
+    """Argument that fails the test if it is ever formatted."""
+    
+    def __str__(self):
+        raise AssertionError("message was formatted")
+
+
+class TestContextNotifier:
+    """Test cases for ContextNotifier class."""
+    
+    async def test_verbose_sends_every_message(self):
+        """Test that verbose mode forwards messages immediately."""
+        ctx = RecordingContext()
+        notifier = ContextNotifier(ctx, "verbose")
+        
+        await notifier.info("returned %d rows", 3)
+        await notifier.warning("truncated")
+        
+        assert ctx.sent == [("info", "returned 3 rows"), ("warning", "truncated")]
+        
+    async def test_errors_policy_filters_without_formatting(self):
+        """Test that filtered messages are never formatted."""
+        ctx = RecordingContext()
+        notifier = ContextNotifier(ctx, "errors")
+        
+        await notifier.info("query %s", Unformattable())
+        await notifier.error("failed")
+        await notifier.flush()
+        
+        assert ctx.sent == [("error", "failed")]
+        
+    async def test_off_sends_nothing(self):
+        """Test that the off policy sends no notifications."""
+        ctx = RecordingContext()
+        notifier = ContextNotifier(ctx, "off")
+        
+        await notifier.error("failed")
+        await notifier.flush()
+        
+        assert ctx.sent == []
+        
+    async def test_summary_sends_one_message(self):
+        """Test that summary mode aggregates into a single notification."""
+        ctx = RecordingContext()
+        notifier = ContextNotifier(ctx, "summary")
+        
+        await notifier.info("executing")
+        await notifier.warning("truncated to %d rows", 10)
+        await notifier.debug("ignored")
+        assert ctx.sent == []
+        
+        await notifier.flush()
+        
+        assert ctx.sent == [("warning", "executing; truncated to 10 rows")]
+        
+    async def test_send_failures_are_ignored(self):
+        """Test that a notification failure does not fail the call."""
+        class BrokenContext:
+            async def error(self, message):
+                raise ValueError("Context is not available outside of a request")
+                
+        await ContextNotifier(BrokenContext(), "errors").error("failed")
+        
+    def test_unknown_policy(self):
+        """Test that unknown policies are rejected."""
+        with pytest.raises(ValueError):
+            ContextNotifier(RecordingContext(), "loud")
+
+
+class TestExecuteQueryNotifications:
+    """Test cases for notifications during execute_query."""
+    
+    async def test_execute_query_with_default_policy(self, tmp_path):
+        """Test that execute_query runs with notifications filtered out."""
+        db_path = tmp_path / "test.db"
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("CREATE TABLE t (n INTEGER)")
+            conn.execute("INSERT INTO t VALUES (1)")
+            conn.commit()
+            
+        server = Talk2TablesMCP(ServerConfig(database_path=str(db_path)))
+        try:
+            _, structured = await server.mcp.call_tool("execute_query", {"query": "SELECT n FROM t"})
+        finally:
+            server.metrics.loop_monitor.stop()
+            
+        assert structured["row_count"] == 1
+        
+    def test_invalid_policy_in_config(self):
+        """Test configuration validation of the policy."""
+        with pytest.raises(ValueError):
+            ServerConfig(log_notifications="loud")
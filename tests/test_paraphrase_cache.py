@@ -0,0 +1,82 @@
+"""Tests for the paraphrase cache."""
+
+import pytest
+
+from fastapi_server.paraphrase_cache import ParaphraseCache, content_words, literals
+
+
+class TestParaphraseCache:
+    """Test cases for ParaphraseCache."""
+    
+    def test_paraphrase_reuses_sql(self):
+        """Test that a rephrased question finds the SQL of the original."""
+        cache = ParaphraseCache(capacity=10)
+        cache.add("How many customers do we have?", "s1", "m", "SELECT COUNT(*) FROM customers")
+        
+        assert cache.lookup("count of customers", "s1", "m") == "SELECT COUNT(*) FROM customers"
+        assert cache.lookup("total sales per region", "s1", "m") is None
+        assert cache.stats()["hits"] == 1
+        
+    def test_different_literals_miss(self):
+        """Test that questions with different numbers or quoted values do not share SQL."""
+        cache = ParaphraseCache(capacity=10)
+        cache.add("orders placed in 2023", "s1", "m", "SELECT * FROM orders WHERE year = 2023")
+        
+        assert cache.lookup("orders placed in 2024", "s1", "m") is None
+        assert cache.lookup("Orders placed in 2023?", "s1", "m") is not None
+        assert literals("customers named 'Ann' over 30") == ("'ann'", "30")
+        
+    @pytest.mark.parametrize("cached, asked", [
+        ("total sales in the western region", "total sales in the eastern region"),
+        ("orders placed last month", "orders placed this month"),
+        ("list cancelled orders", "list not cancelled orders"),
+        ("cancelled orders", "orders that weren't cancelled"),
+        ("average order value", "median order value"),
+        ("products by price ascending", "products by price descending"),
+        ("orders per customer", "customers per order"),
+    ])
+    def test_near_miss_questions_do_not_match(self, cached, asked):
+        """Test that near-identical questions with different content words never share SQL."""
+        cache = ParaphraseCache(capacity=10)
+        cache.add(cached, "s1", "m", "SELECT 1")
+        
+        assert cache.lookup(asked, "s1", "m") is None
+        
+    def test_content_words_keep_negation_and_direction(self):
+        """Test that negation, direction and time words count as content."""
+        assert content_words("orders that weren't cancelled") == ("order", "that", "not", "cancelled")
+        assert content_words("How many customers do we have?") == content_words("count of customers")
+        assert "last" in content_words("sales from last month")
+        
+    def test_scoped_to_schema_and_model(self):
+        """Test that entries from another schema version or model are not used."""
+        cache = ParaphraseCache(capacity=10)
+        cache.add("count of customers", "s1", "m", "SELECT COUNT(*) FROM customers")
+        
+        assert cache.lookup("count of customers", "s1", "other-model") is None
+        
+        cache.add("count of products", "s2", "m", "SELECT COUNT(*) FROM products")
+        assert cache.lookup("count of customers", "s1", "m") is None
+        assert cache.stats()["entries"] == 1
+        
+    def test_evicts_least_recently_used(self):
+        """Test that a full cache evicts its least recently used entry."""
+        cache = ParaphraseCache(capacity=2)
+        cache.add("count of customers", "s1", "m", "SELECT 1")
+        cache.add("average order value", "s1", "m", "SELECT 2")
+        cache.lookup("how many customers", "s1", "m")
+        
+        cache.add("products by revenue", "s1", "m", "SELECT 3")
+        
+        assert cache.lookup("mean order value", "s1", "m") is None
+        assert cache.lookup("how many customers", "s1", "m") == "SELECT 1"
+        assert cache.stats()["evictions"] == 1
+        
+    def test_remove_drops_failed_sql(self):
+        """Test that SQL that failed is removed for every question mapping to it."""
+        cache = ParaphraseCache(capacity=10)
+        cache.add("count of customers", "s1", "m", "SELECT COUNT(*) FROM customer")
+        
+        cache.remove("SELECT COUNT(*) FROM customer", "s1", "m")
+        
+        assert cache.lookup("count of customers", "s1", "m") is None
@@ -0,0 +1,129 @@
+"""Tests for prompt sections cached per schema version."""
+
+from unittest.mock import Mock
+
+from fastapi_server.prompt_templates import PromptTemplateCache, render_database_context, render_table_list
+
+
+def metadata(version="s1-g1-m1-t1"):
+    """Build a small metadata document."""
+    return {
+        "version": version,
+        "database_path": "test.db",
+        "tables": {
+            "users": {"columns": {"id": "INTEGER", "name": "TEXT"}, "row_count": 100},
+            "orders": {"columns": [{"name": "id", "type": "INTEGER"}, {"name": "user_id", "type": "INTEGER"}]}
+        }
+    }
+
+
+def uncached_table_list(metadata):
+    """Render the table listing the way the SQL prompt built it on every request."""
+    prompt_parts = ["Available tables:"]
+    for table_name, table_info in metadata["tables"].items():
+        prompt_parts.append(f"- {table_name}")
+        if "columns" in table_info:
+            columns_data = table_info["columns"]
+            if isinstance(columns_data, dict):
+                columns = list(columns_data.keys())
+            elif isinstance(columns_data, list):
+                columns = [str(col) for col in columns_data]
+            else:
+                columns = []
+            prompt_parts.append(f"  Columns: {', '.join(columns)}")
+    return "\n".join(prompt_parts)
+
+
+def uncached_database_context(metadata):
+    """Render the database section the way the MCP context message built it on every request."""
+    context_parts = [
+        "Available database information:",
+        f"Database: {metadata.get('database_path', 'Unknown')}",
+        "Tables and their structure:"
+    ]
+    for table_name, table_info in metadata["tables"].items():
+        context_parts.append(f"- {table_name}:")
+        if "columns" in table_info:
+            columns_data = table_info["columns"]
+            if isinstance(columns_data, dict):
+                columns = ", ".join(columns_data.keys())
+            elif isinstance(columns_data, list):
+                columns = ", ".join([str(col) for col in columns_data])
+            else:
+                columns = "Unknown"
+            context_parts.append(f"  Columns: {columns}")
+        if "row_count" in table_info:
+            context_parts.append(f"  Rows: {table_info['row_count']}")
+    return "\n".join(context_parts)
+
+
+class TestRendering:
+    """Test cases for the schema section renderers."""
+    
+    def test_render_table_list(self):
+        """Test the table listing of the SQL generation prompt."""
+        rendered = render_table_list(metadata())
+        
+        assert rendered.startswith("Available tables:\n- users\n  Columns: id, name\n- orders\n")
+        assert render_table_list({}) == ""
+        
+    def test_render_database_context(self):
+        """Test the database section of the MCP context message."""
+        rendered = render_database_context(metadata())
+        
+        assert "Database: test.db" in rendered
+        assert "- users:\n  Columns: id, name\n  Rows: 100" in rendered
+        assert "- orders:\n  Columns: {'name': 'id', 'type': 'INTEGER'}" in rendered
+        
+    def test_cached_sections_match_uncached_rendering(self):
+        """Test that cached sections are byte-identical to the per-request rendering."""
+        cache = PromptTemplateCache()
+        document = metadata()
+        document["tables"]["events"] = {"columns": "unknown format", "row_count": 0}
+        document["tables"]["tags"] = {"columns": ["id", 7]}
+        
+        for _ in range(2):
+            assert cache.get(document, "sql_table_list", render_table_list) == uncached_table_list(document)
+            assert cache.get(document, "database_context", render_database_context) == uncached_database_context(document)
+
+
+class TestPromptTemplateCache:
+    """Test cases for PromptTemplateCache."""
+    
+    def test_section_is_rendered_once_per_version(self):
+        """Test that a section is built once and reused for the same version."""
+        cache = PromptTemplateCache()
+        build = Mock(return_value="section")
+        
+        assert cache.get(metadata(), "tables", build) == "section"
+        assert cache.get(metadata(), "tables", build) == "section"
+        
+        build.assert_called_once()
+        assert cache.stats()["hits"] == 1
+        
+    def test_new_version_renders_again(self):
+        """Test that a changed metadata version gets a fresh section."""
+        cache = PromptTemplateCache()
+        
+        assert cache.get(metadata("s1"), "tables", lambda document: document["version"]) == "s1"
+        assert cache.get(metadata("s2"), "tables", lambda document: document["version"]) == "s2"
+        
+    def test_unversioned_metadata_is_keyed_by_content(self):
+        """Test that metadata without a version is keyed by a hash of its content."""
+        cache = PromptTemplateCache()
+        first, same, changed = metadata(None), metadata(None), metadata(None)
+        changed["tables"]["users"]["row_count"] = 101
+        
+        assert cache.version_key(first) == cache.version_key(same)
+        assert cache.version_key(first) != cache.version_key(changed)
+        
+    def test_old_versions_are_evicted(self):
+        """Test that only the most recent versions are kept."""
+        cache = PromptTemplateCache(max_versions=2)
+        build = Mock(return_value="section")
+        
+        for version in ("s1", "s2", "s3", "s1"):
+            cache.get(metadata(version), "tables", build)
+            
+        assert build.call_count == 4
+        assert cache.stats()["versions"] == 2
@@ -0,0 +1,108 @@
+"""Tests for schema linking of the SQL generation prompt."""
+
+import pytest
+
+from fastapi_server.schema_linker import SchemaLinker, estimate_tokens
+
+
+def column(name, type_="TEXT", primary_key=False, description=None):
+    """Build a column entry in the metadata document format."""
+    return {"name": name, "type": type_, "primary_key": primary_key, "description": description}
+
+
+@pytest.fixture
+def metadata():
+    """Metadata of a small shop database with declared relationships."""
+    return {
+        "tables": {
+            "customers": {
+                "description": "Customer contact details",
+                "columns": [column("customer_id", "INTEGER", True), column("name"), column("country")]
+            },
+            "orders": {
+                "description": "Orders placed by customers",
+                "columns": [column("order_id", "INTEGER", True), column("customer_id", "INTEGER"),
+                            column("order_date", "DATE")]
+            },
+            "order_items": {
+                "description": "Line items of an order",
+                "columns": [column("order_item_id", "INTEGER", True), column("order_id", "INTEGER"),
+                            column("product_id", "INTEGER"), column("quantity", "INTEGER")]
+            },
+            "products": {
+                "description": "Product catalog",
+                "columns": [column("product_id", "INTEGER", True), column("title"),
+                            column("price", "REAL", description="Unit price in euros")]
+            },
+            "suppliers": {
+                "description": "Suppliers of stock",
+                "columns": [column("supplier_id", "INTEGER", True), column("company")]
+            }
+        },
+        "relationships": [
+            {"from_table": "orders", "from_column": "customer_id", "to_table": "customers", "to_column": "customer_id"},
+            {"from_table": "order_items", "from_column": "order_id", "to_table": "orders", "to_column": "order_id"},
+            {"from_table": "order_items", "from_column": "product_id", "to_table": "products",
+             "to_column": "product_id"}
+        ]
+    }
+
+
+class TestSchemaLinker:
+    """Test cases for SchemaLinker."""
+    
+    def test_selects_matching_tables_only(self, metadata):
+        """Test that unrelated tables are left out of the prompt."""
+        prompt = SchemaLinker(metadata).link("How many customers live in each country?", 1500)
+        
+        assert "- customers" in prompt
+        assert "suppliers" not in prompt
+        assert "products" not in prompt
+        
+    def test_adds_tables_on_the_join_path(self, metadata):
+        """Test that tables needed to join the matched tables are included with their joins."""
+        prompt = SchemaLinker(metadata).link("Which products did customers from France buy?", 1500)
+        
+        assert "- orders" in prompt
+        assert "- order_items" in prompt
+        assert "order_items.product_id = products.product_id" in prompt
+        assert "orders.customer_id = customers.customer_id" in prompt
+        assert "suppliers" not in prompt
+        
+    def test_matches_column_descriptions(self, metadata):
+        """Test that words from column descriptions select their table."""
+        prompt = SchemaLinker(metadata).link("average unit price in euros", 1500)
+        
+        assert "- products" in prompt
+        assert "price (REAL)" in prompt
+        
+    def test_infers_joins_without_relationships(self, metadata):
+        """Test that joins are inferred from key columns when none are declared."""
+        del metadata["relationships"]
+        
+        prompt = SchemaLinker(metadata).link("orders per customer", 1500)
+        
+        assert "orders.customer_id = customers.customer_id" in prompt
+        
+    def test_prompt_stays_within_budget_as_schema_grows(self, metadata):
+        """Test that a large schema still renders within the token budget."""
+        for i in range(500):
+            metadata["tables"][f"audit_log_{i}"] = {
+                "columns": [column("id", "INTEGER", True)] + [column(f"field_{j}") for j in range(20)]
+            }
+            
+        prompt = SchemaLinker(metadata).link("How many customers live in each country?", 300)
+        
+        assert estimate_tokens(prompt) <= 300
+        assert "- customers" in prompt
+        assert "audit_log" not in prompt
+        
+    def test_unmatched_question_falls_back_to_schema_within_budget(self, metadata):
+        """Test that a question matching nothing still gets tables up to the budget."""
+        prompt = SchemaLinker(metadata).link("hello there", 1500)
+        
+        assert all(f"- {table}" in prompt for table in metadata["tables"])
+        
+    def test_empty_schema(self):
+        """Test that a schema without tables renders an empty listing."""
+        assert SchemaLinker({"tables": {}}).link("How many customers?", 1500) == "Available tables:"
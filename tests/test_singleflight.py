@@ -0,0 +1,106 @@
+"""Tests for in-flight query coalescing."""
+
+import asyncio
+import sqlite3
+
+import pytest
+
+from talk_2_tables_mcp.config import ServerConfig
+from talk_2_tables_mcp.server import Talk2TablesMCP
+from talk_2_tables_mcp.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test cases for SingleFlight class."""
+    
+    async def test_concurrent_calls_share_execution(self):
+        """Test that concurrent calls with one key run the work once."""
+        group = SingleFlight()
+        calls = 0
+        
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"rows": [1]}
+            
+        results = await asyncio.gather(*(group.do("q", work) for _ in range(5)))
+        
+        assert calls == 1
+        assert all(result is results[0] for result in results)
+        assert group.stats()["coalesced"] == 4
+        assert group.stats()["in_flight"] == 0
+        
+    async def test_sequential_calls_execute_again(self):
+        """Test that completed executions are not reused."""
+        group = SingleFlight()
+        calls = 0
+        
+        async def work():
+            nonlocal calls
+            calls += 1
+            return calls
+            
+        assert await group.do("q", work) == 1
+        assert await group.do("q", work) == 2
+        
+    async def test_different_keys_run_separately(self):
+        """Test that different keys are not coalesced."""
+        group = SingleFlight()
+        
+        async def work():
+            await asyncio.sleep(0.01)
+            
+        await asyncio.gather(group.do("a", work), group.do("b", work))
+        
+        assert group.stats()["executions"] == 2
+        
+    async def test_errors_are_shared(self):
+        """Test that every waiting caller sees the execution error."""
+        group = SingleFlight()
+        
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+            
+        results = await asyncio.gather(group.do("q", work), group.do("q", work), return_exceptions=True)
+        
+        assert all(isinstance(result, ValueError) for result in results)
+        
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        """Test that the shared execution survives a cancelled caller."""
+        group = SingleFlight()
+        
+        async def work():
+            await asyncio.sleep(0.02)
+            return "done"
+            
+        first = asyncio.create_task(group.do("q", work))
+        second = asyncio.create_task(group.do("q", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        
+        assert await second == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+
+class TestRunQuery:
+    """Test cases for the shared query execution path."""
+    
+    async def test_row_limit_applied_once(self, tmp_path):
+        """Test that the shared result is truncated to the row limit."""
+        db_path = tmp_path / "test.db"
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("CREATE TABLE numbers (n INTEGER)")
+            conn.executemany("INSERT INTO numbers VALUES (?)", [(i,) for i in range(5)])
+            conn.commit()
+            
+        server = Talk2TablesMCP(ServerConfig(database_path=str(db_path), max_result_rows=2))
+        await server._initialize_database_handler_simple()
+        
+        result, truncated = await server._run_query("SELECT n FROM numbers", "client")
+        
+        assert truncated
+        assert result.row_count == 2
+        assert server.admission.stats()["active"] == 0
@@ -0,0 +1,91 @@
+"""Tests for the SQL translation cache."""
+
+import sqlite3
+
+from fastapi_server.sql_cache import SQLTranslationCache, normalize_question, schema_version
+
+
+class TestSQLTranslationCache:
+    """Test cases for SQLTranslationCache."""
+    
+    def test_normalized_questions_share_an_entry(self):
+        """Test that case, whitespace and trailing punctuation are ignored."""
+        cache = SQLTranslationCache()
+        cache.put("How many customers are there?", "s1", "model", "SELECT COUNT(*) FROM customers")
+        
+        assert cache.get("how many  customers are there", "s1", "model") == "SELECT COUNT(*) FROM customers"
+        assert normalize_question("  Show ALL orders!! ") == "show all orders"
+        
+    def test_key_includes_schema_and_model(self):
+        """Test that a different schema version or model misses."""
+        cache = SQLTranslationCache()
+        cache.put("q", "s1", "model-a", "SELECT 1")
+        
+        assert cache.get("q", "s2", "model-a") is None
+        assert cache.get("q", "s1", "model-b") is None
+        assert cache.stats()["misses"] == 2
+        
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest unused translation is evicted first."""
+        cache = SQLTranslationCache(max_entries=2)
+        cache.put("a", "s1", "m", "SELECT 'a'")
+        cache.put("b", "s1", "m", "SELECT 'b'")
+        cache.get("a", "s1", "m")
+        
+        cache.put("c", "s1", "m", "SELECT 'c'")
+        
+        assert cache.get("b", "s1", "m") is None
+        assert cache.get("a", "s1", "m") == "SELECT 'a'"
+        assert cache.stats()["evictions"] == 1
+        
+    def test_new_schema_version_drops_old_translations(self):
+        """Test that translations for an older schema are removed."""
+        cache = SQLTranslationCache()
+        cache.put("a", "s1", "m", "SELECT 'a'")
+        cache.put("b", "s2", "m", "SELECT 'b'")
+        
+        assert cache.stats()["entries"] == 1
+        assert cache.stats()["schema_version"] == "s2"
+        
+    def test_survives_restart(self, tmp_path):
+        """Test that translations are persisted in the SQLite file."""
+        path = tmp_path / "sql_cache.db"
+        cache = SQLTranslationCache(str(path))
+        cache.put("q", "s1", "m", "SELECT 1")
+        cache.put("gone", "s1", "m", "SELECT 2")
+        cache.discard("gone", "s1", "m")
+        cache.close()
+        
+        reopened = SQLTranslationCache(str(path))
+        
+        assert reopened.get("q", "s1", "m") == "SELECT 1"
+        assert reopened.get("gone", "s1", "m") is None
+        reopened.close()
+        
+    def test_hits_are_written_on_close(self, tmp_path):
+        """Test that hits don't write to the file but their recency survives a restart."""
+        path = tmp_path / "sql_cache.db"
+        cache = SQLTranslationCache(str(path))
+        cache.put("a", "s1", "m", "SELECT 'a'")
+        cache.put("b", "s1", "m", "SELECT 'b'")
+        
+        def last_used():
+            with sqlite3.connect(path) as conn:
+                return dict(conn.execute("SELECT question, last_used FROM translations"))
+                
+        before = last_used()
+        assert cache.get("a", "s1", "m") == "SELECT 'a'"
+        assert last_used() == before
+        cache.close()
+        
+        reopened = SQLTranslationCache(str(path), max_entries=1)
+        
+        assert reopened.get("a", "s1", "m") == "SELECT 'a'"
+        assert reopened.get("b", "s1", "m") is None
+        reopened.close()
+        
+    def test_schema_version_ignores_data_changes(self):
+        """Test that only schema and metadata parts of the server version are used."""
+        assert schema_version({"version": "s5-g3-m1700-t2"}, "prompt") == "s5-m1700"
+        assert schema_version({"version": "s5-g4-m1700-t3"}, "prompt") == "s5-m1700"
+        assert schema_version({}, "prompt a") != schema_version({}, "prompt b")
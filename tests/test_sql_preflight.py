@@ -0,0 +1,132 @@
+"""Tests for the local pre-flight check of generated SQL."""
+
+import pytest
+
+from fastapi_server.sql_preflight import SQLPreflight, extract_statement
+
+
+@pytest.fixture
+def preflight():
+    """Pre-flight checker for a customers and orders schema."""
+    return SQLPreflight({
+        "tables": {
+            "customers": {"columns": [
+                {"name": "customer_id", "type": "INTEGER"},
+                {"name": "first_name", "type": "TEXT"},
+                {"name": "country", "type": "TEXT"}
+            ]},
+            "orders": {"columns": {"order_id": "INTEGER", "customer_id": "INTEGER", "total_amount": "REAL"}}
+        }
+    }, row_limit=100)
+
+
+class TestExtractStatement:
+    """Test cases for extract_statement."""
+    
+    def test_code_fence_and_prose(self):
+        """Test that the statement is taken out of a fenced block surrounded by prose."""
+        response = "Here is the query:\n```sql\nSELECT * FROM customers;\n```\nIt lists all customers."
+        
+        assert extract_statement(response) == "SELECT * FROM customers"
+        
+    def test_semicolon_inside_string_is_kept(self):
+        """Test that only a semicolon outside string literals ends the statement."""
+        assert extract_statement("SELECT 'a;b' AS v; SELECT 2") == "SELECT 'a;b' AS v"
+        
+    def test_no_select(self):
+        """Test that responses without a SELECT yield nothing."""
+        assert extract_statement("DELETE FROM customers") is None
+
+
+class TestSQLPreflight:
+    """Test cases for SQLPreflight."""
+    
+    def test_valid_query_gets_limit(self, preflight):
+        """Test that a valid query only gets a LIMIT added."""
+        result = preflight.check("SELECT first_name FROM customers")
+        
+        assert result.sql == "SELECT first_name FROM customers LIMIT 100"
+        assert result.repairs == ["added LIMIT"]
+        
+    def test_existing_limit_is_kept(self, preflight):
+        """Test that a query with a LIMIT is left alone."""
+        assert preflight.check("SELECT * FROM customers LIMIT 5").sql == "SELECT * FROM customers LIMIT 5"
+        
+    def test_misspelled_identifiers_are_repaired(self, preflight):
+        """Test that unknown tables and columns are replaced by close matches, but not inside strings."""
+        result = preflight.check("SELECT c.firstname FROM customer c WHERE c.country = 'firstname' LIMIT 5")
+        
+        assert result.sql == "SELECT c.first_name FROM customers c WHERE c.country = 'firstname' LIMIT 5"
+        assert result.repairs == ["table customer -> customers", "column firstname -> first_name"]
+        
+    def test_trailing_prose_is_removed(self, preflight):
+        """Test that an explanation after the statement is cut off."""
+        result = preflight.check("SELECT country FROM customers LIMIT 5\nThis lists the countries.")
+        
+        assert result.sql == "SELECT country FROM customers LIMIT 5"
+        
+    def test_missing_group_by_is_added(self, preflight):
+        """Test that plain columns next to an aggregate are grouped, before ORDER BY."""
+        result = preflight.check("SELECT country, COUNT(*) AS n FROM customers ORDER BY n DESC")
+        
+        assert result.sql == "SELECT country, COUNT(*) AS n FROM customers GROUP BY country ORDER BY n DESC LIMIT 100"
+        assert "added GROUP BY" in result.repairs
+        
+    @pytest.mark.parametrize("query", [
+        "SELECT c.first_name, (SELECT COUNT(*) FROM orders o WHERE o.customer_id = c.customer_id) AS n "
+        "FROM customers c",
+        "SELECT country, COUNT(*) OVER (PARTITION BY country) AS n FROM customers",
+    ])
+    def test_subquery_and_window_aggregates_are_not_grouped(self, preflight, query):
+        """Test that aggregates in scalar subqueries or window functions do not add a GROUP BY."""
+        result = preflight.check(query)
+        
+        assert result.sql == f"{query} LIMIT 100"
+        assert "added GROUP BY" not in result.repairs
+        
+    def test_limit_is_added_before_trailing_comments(self, preflight):
+        """Test that the LIMIT does not end up inside a trailing comment."""
+        assert preflight.check("SELECT * FROM customers -- all rows").sql == "SELECT * FROM customers LIMIT 100"
+        assert preflight.check("SELECT * FROM customers /* limit */").sql == "SELECT * FROM customers LIMIT 100"
+        assert preflight.check("SELECT '--' AS v FROM customers").sql == "SELECT '--' AS v FROM customers LIMIT 100"
+        
+    def test_bare_column_with_max_is_not_grouped(self, preflight):
+        """Test that SQLite's row-of-the-maximum idiom is not changed into a grouping."""
+        result = preflight.check("SELECT first_name, MAX(customer_id) FROM customers")
+        
+        assert "GROUP BY" not in result.sql
+        
+    @pytest.mark.parametrize("query, column", [
+        ("SELECT customer_name FROM customers", "customer_name"),
+        ("SELECT * FROM customers WHERE customer = 3", "customer"),
+    ])
+    def test_column_with_other_meaning_is_rejected(self, preflight, query, column):
+        """Test that a column sharing only a prefix with a real one is rejected, not rewritten."""
+        result = preflight.check(query)
+        
+        assert not result.ok
+        assert result.error == f"no such column: {column}"
+        
+    def test_columns_of_other_tables_are_not_used(self, preflight):
+        """Test that a column is only repaired to one of the tables the query reads from."""
+        assert not preflight.check("SELECT total_amount FROM customers").ok
+        assert preflight.check("SELECT o.total_amont FROM orders o").sql == "SELECT o.total_amount FROM orders o LIMIT 100"
+        
+    def test_unknown_column_without_match_is_rejected(self, preflight):
+        """Test that queries that cannot be repaired are rejected with SQLite's error."""
+        result = preflight.check("SELECT loyalty_points FROM customers")
+        
+        assert not result.ok
+        assert result.error == "no such column: loyalty_points"
+        
+    def test_syntax_error_is_rejected(self, preflight):
+        """Test that broken SQL is rejected."""
+        assert not preflight.check("SELECT * FROM customers WHERE").ok
+        
+    def test_incomplete_metadata_passes_unknown_identifiers(self):
+        """Test that unknown tables are left to the server when the metadata lacks columns."""
+        preflight = SQLPreflight({"tables": {"customers": {"row_count": 10}}})
+        
+        result = preflight.check("SELECT * FROM customers")
+        
+        assert result.sql == "SELECT * FROM customers LIMIT 1000"
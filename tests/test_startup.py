@@ -0,0 +1,99 @@
+"""Start-up benchmark for the stdio server.
+
+Stdio clients spawn one server process per connection, so the time until the
+server answers ``initialize`` adds directly to the first request's latency.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+
+import pytest
+
+logger = logging.getLogger(__name__)
+
+# Generous default so slow CI machines pass; tighten locally to catch regressions
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "5.0"))
+
+INITIALIZE_REQUEST = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2025-06-18",
+        "capabilities": {},
+        "clientInfo": {"name": "startup-benchmark", "version": "0"}
+    }
+}
+
+
+@pytest.fixture
+def server_env(tmp_path):
+    """Environment pointing the server at a small database."""
+    path = tmp_path / "test.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE t (n INTEGER)")
+        conn.commit()
+    return {
+        **os.environ,
+        "DATABASE_PATH": str(path),
+        "METADATA_PATH": str(tmp_path / "metadata.json"),
+        "LOG_LEVEL": "WARNING"
+    }
+
+
+def time_to_initialize(env):
+    """Spawn a stdio server and measure the time until it answers initialize."""
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "talk_2_tables_mcp"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=env
+    )
+    try:
+        process.stdin.write((json.dumps(INITIALIZE_REQUEST) + "\n").encode())
+        process.stdin.flush()
+        response = json.loads(process.stdout.readline())
+        elapsed = time.perf_counter() - started
+    finally:
+        process.stdin.close()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            
+    assert response["id"] == 1
+    assert "result" in response
+    return elapsed
+
+
+class TestStartup:
+    """Test cases for server start-up cost."""
+    
+    def test_time_to_first_initialize(self, server_env, record_property):
+        """Test that a stdio server answers initialize within the budget."""
+        samples = [time_to_initialize(server_env) for _ in range(3)]
+        median = statistics.median(samples)
+        record_property("startup_seconds", round(median, 4))
+        logger.info(f"Time to initialize response: median {median * 1000:.0f} ms over {len(samples)} runs")
+        
+        assert median < STARTUP_BUDGET_SECONDS, f"median start-up {median:.2f}s over {STARTUP_BUDGET_SECONDS}s budget"
+        
+    def test_heavy_imports_are_deferred(self, server_env):
+        """Test that modules only some transports or features need are not imported at start-up."""
+        code = (
+            "import sys, talk_2_tables_mcp.server; "
+            "print(','.join(m for m in ('numpy', 'talk_2_tables_mcp.workers') if m in sys.modules))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, env=server_env, check=True
+        ).stdout.strip()
+        
+        assert output == ""
@@ -0,0 +1,87 @@
+"""Tests for the column statistics profiler."""
+
+import sqlite3
+
+import pytest
+
+from talk_2_tables_mcp.stats import (
+    BackgroundStatsProfiler, ColumnStatsProfiler, StatsCache, merge_stats_into_tables
+)
+
+pytest.importorskip("numpy")
+
+
+class TestColumnStatsProfiler:
+    """Test cases for ColumnStatsProfiler class."""
+    
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        """Create a database with a mix of numeric, text and NULL values."""
+        path = tmp_path / "stats.db"
+        with sqlite3.connect(path) as conn:
+            conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, category TEXT, price REAL)")
+            rows = [(f"cat{i % 3}", float(i) if i % 4 else None) for i in range(1, 101)]
+            conn.executemany("INSERT INTO items (category, price) VALUES (?, ?)", rows)
+            conn.commit()
+        return path
+        
+    def test_profile_full_table(self, db_path):
+        """Test statistics for a table smaller than the sample size."""
+        profiler = ColumnStatsProfiler(str(db_path), sample_rows=1000, top_k=2, batch_size=30)
+        stats = profiler.profile_database()["items"]
+        
+        assert stats["id"]["min"] == 1
+        assert stats["id"]["max"] == 100
+        assert stats["id"]["distinct_estimate"] == 100
+        assert stats["id"]["null_fraction"] == 0.0
+        
+        assert stats["price"]["null_fraction"] == 0.25
+        assert stats["price"]["max"] == 99
+        
+        assert stats["category"]["distinct_estimate"] == 3
+        assert stats["category"]["min"] == "cat0"
+        assert len(stats["category"]["top_values"]) == 2
+        assert stats["category"]["top_values"][0]["count"] == 34
+        
+    def test_profile_sampled_table(self, db_path):
+        """Test that large tables are sampled and distinct counts extrapolated."""
+        profiler = ColumnStatsProfiler(str(db_path), sample_rows=20)
+        stats = profiler.profile_database()["items"]
+        
+        assert stats["id"]["sampled_rows"] < 100
+        assert stats["id"]["distinct_estimate"] >= stats["id"]["sampled_rows"]
+        assert stats["id"]["distinct_estimate"] <= 100
+
+
+class TestBackgroundStatsProfiler:
+    """Test cases for BackgroundStatsProfiler class."""
+    
+    def test_refresh_only_on_version_change(self, tmp_path):
+        """Test that profiling reruns only when the database version changes."""
+        path = tmp_path / "stats.db"
+        with sqlite3.connect(path) as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+            conn.execute("INSERT INTO t VALUES (1)")
+            conn.commit()
+            
+        version = {"value": "v1"}
+        cache = StatsCache()
+        background = BackgroundStatsProfiler(
+            ColumnStatsProfiler(str(path)), cache, lambda: version["value"]
+        )
+        
+        assert background.refresh() is True
+        assert background.refresh() is False
+        version["value"] = "v2"
+        assert background.refresh() is True
+        assert cache.version == 2
+        
+    def test_merge_stats_into_tables(self):
+        """Test merging statistics into metadata tables."""
+        cache = StatsCache()
+        cache.publish({"users": {"id": {"min": 1}}}, "v1")
+        
+        merged = merge_stats_into_tables({"users": {"columns": []}, "orders": {}}, cache)
+        
+        assert merged["users"]["column_stats"] == {"id": {"min": 1}}
+        assert "column_stats" not in merged["orders"]
@@ -0,0 +1,200 @@
+"""Tests for database change tracking and notifications."""
+
+import json
+import os
+import sqlite3
+
+import pytest
+from mcp import types
+
+from talk_2_tables_mcp.config import ServerConfig
+from talk_2_tables_mcp.server import Talk2TablesMCP
+from talk_2_tables_mcp.versioning import ChangeNotifier, DatabaseVersionTracker
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Create a small database."""
+    path = tmp_path / "test.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE t (n INTEGER)")
+        conn.execute("INSERT INTO t VALUES (1)")
+        conn.commit()
+    return path
+
+
+class RecordingSession:
+    """Stand-in for an MCP server session."""
+    
+    def __init__(self):
+        self.sent = []
+        
+    async def send_resource_list_changed(self):
+        self.sent.append("list_changed")
+        
+    async def send_resource_updated(self, uri):
+        self.sent.append(f"updated {uri}")
+
+
+class TestDatabaseVersionTracker:
+    """Test cases for DatabaseVersionTracker class."""
+    
+    def test_version_is_stable_without_changes(self, db_path):
+        """Test that reading the version twice gives the same result."""
+        tracker = DatabaseVersionTracker(db_path)
+        
+        assert tracker.database_version == tracker.database_version
+        
+    def test_data_change_changes_fingerprint(self, db_path):
+        """Test that committed writes from another connection are detected."""
+        tracker = DatabaseVersionTracker(db_path)
+        before = tracker.refresh()
+        
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("INSERT INTO t VALUES (2)")
+            conn.commit()
+            
+        after = tracker.refresh()
+        assert after.data_fingerprint != before.data_fingerprint
+        assert after.schema_version == before.schema_version
+        
+    def test_wal_commits_change_fingerprint(self, db_path):
+        """Test that commits still in the write-ahead log are detected."""
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+        tracker = DatabaseVersionTracker(db_path)
+        writer = sqlite3.connect(db_path)
+        try:
+            before = tracker.refresh()
+            writer.execute("INSERT INTO t VALUES (2)")
+            writer.commit()
+            
+            assert tracker.refresh().data_fingerprint != before.data_fingerprint
+        finally:
+            writer.close()
+            tracker.close()
+            
+    def test_version_is_shared_across_trackers(self, db_path):
+        """Test that separate processes, modelled by separate trackers, agree on the version."""
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("INSERT INTO t VALUES (2)")
+            conn.commit()
+            
+        assert DatabaseVersionTracker(db_path).database_version == DatabaseVersionTracker(db_path).database_version
+        
+    def test_version_is_read_from_last_refresh(self, db_path):
+        """Test that reading the version does not check the database again."""
+        tracker = DatabaseVersionTracker(db_path)
+        before = tracker.database_version
+        
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("INSERT INTO t VALUES (2)")
+            conn.commit()
+            
+        assert tracker.database_version == before
+        tracker.refresh()
+        assert tracker.database_version != before
+        
+    def test_schema_change_is_detected(self, db_path):
+        """Test that DDL changes the schema version."""
+        tracker = DatabaseVersionTracker(db_path)
+        before = tracker.refresh()
+        
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("CREATE TABLE u (id INTEGER)")
+            
+        assert tracker.refresh().schema_version != before.schema_version
+        
+    def test_metadata_change_is_detected(self, db_path, tmp_path):
+        """Test that metadata file modifications are tracked."""
+        metadata_path = tmp_path / "metadata.json"
+        metadata_path.write_text("{}")
+        tracker = DatabaseVersionTracker(db_path, metadata_path)
+        before = tracker.refresh()
+        
+        stat = metadata_path.stat()
+        os.utime(metadata_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        
+        assert tracker.refresh().metadata_mtime != before.metadata_mtime
+
+
+class TestChangeNotifier:
+    """Test cases for ChangeNotifier class."""
+    
+    async def test_subscribers_are_notified(self, db_path):
+        """Test that a data change notifies subscribed sessions."""
+        notifier = ChangeNotifier(DatabaseVersionTracker(db_path), poll_interval=60)
+        session = RecordingSession()
+        notifier.subscribe(session, "database://metadata")
+        
+        try:
+            with sqlite3.connect(db_path) as conn:
+                conn.execute("INSERT INTO t VALUES (2)")
+                conn.commit()
+            changes = await notifier.check()
+        finally:
+            notifier.stop()
+            
+        assert changes == {"data"}
+        assert session.sent == ["updated database://metadata"]
+        
+    async def test_schema_change_sends_list_changed(self, db_path):
+        """Test that schema changes also announce a new resource list."""
+        notifier = ChangeNotifier(DatabaseVersionTracker(db_path), poll_interval=60)
+        session = RecordingSession()
+        notifier.subscribe(session, "database://tables")
+        
+        try:
+            with sqlite3.connect(db_path) as conn:
+                conn.execute("CREATE TABLE u (id INTEGER)")
+            await notifier.check()
+        finally:
+            notifier.stop()
+            
+        assert session.sent[0] == "list_changed"
+        
+    async def test_unsubscribed_sessions_are_not_notified(self, db_path):
+        """Test unsubscribing."""
+        notifier = ChangeNotifier(DatabaseVersionTracker(db_path), poll_interval=60)
+        session = RecordingSession()
+        notifier.subscribe(session, "database://metadata")
+        notifier.unsubscribe(session, "database://metadata")
+        
+        try:
+            with sqlite3.connect(db_path) as conn:
+                conn.execute("INSERT INTO t VALUES (2)")
+                conn.commit()
+            await notifier.check()
+        finally:
+            notifier.stop()
+            
+        assert session.sent == []
+
+
+class TestVersionStamps:
+    """Test cases for versions on results and resources."""
+    
+    async def test_query_result_has_version(self, db_path):
+        """Test that query results carry the database version."""
+        server = Talk2TablesMCP(ServerConfig(database_path=str(db_path)))
+        try:
+            _, structured = await server.mcp.call_tool("execute_query", {"query": "SELECT n FROM t"})
+        finally:
+            server.metrics.loop_monitor.stop()
+            server.change_notifier.stop()
+            
+        assert structured["version"] == server.version_tracker.database_version
+        
+    async def test_metadata_has_version(self, db_path):
+        """Test that the metadata resource carries a version."""
+        server = Talk2TablesMCP(ServerConfig(database_path=str(db_path), metadata_path="missing.json"))
+        contents = list(await server.mcp.read_resource("database://metadata"))
+        
+        assert json.loads(contents[0].content)["version"].startswith("s")
+        
+    def test_subscriptions_are_supported(self, db_path):
+        """Test that the server handles resource subscriptions."""
+        server = Talk2TablesMCP(ServerConfig(database_path=str(db_path)))
+        
+        assert types.SubscribeRequest in server.mcp._mcp_server.request_handlers
+        assert types.UnsubscribeRequest in server.mcp._mcp_server.request_handlers
@@ -0,0 +1,135 @@
+"""Tests for the query log and warm-start phase."""
+
+import json
+import os
+import sqlite3
+from unittest.mock import AsyncMock
+
+import pytest
+
+from talk_2_tables_mcp.config import ServerConfig
+from talk_2_tables_mcp.query_log import QueryLog, fingerprint_query, normalize_query
+from talk_2_tables_mcp.server import Talk2TablesMCP
+
+
+class TestQueryNormalization:
+    """Test cases for query normalization helpers."""
+    
+    def test_normalize_query(self):
+        """Test that formatting differences are removed."""
+        query = "SELECT *\n  FROM users -- all users\n WHERE id = 1;"
+        assert normalize_query(query) == "SELECT * FROM users WHERE id = 1"
+        
+    def test_fingerprint_ignores_literals(self):
+        """Test that queries differing only in literals share a fingerprint."""
+        first = fingerprint_query("SELECT * FROM users WHERE name = 'Alice' AND id IN (1, 2)")
+        second = fingerprint_query("select * from users where name = 'Bob' and id in (3)")
+        assert first == second
+
+
+class TestQueryLog:
+    """Test cases for QueryLog class."""
+    
+    def test_top_queries(self, tmp_path):
+        """Test that the most frequent fingerprints are replayed with a recently used query."""
+        log = QueryLog(str(tmp_path / "logs" / "queries.json"))
+        log.record("SELECT * FROM users WHERE id = 1")
+        log.record("SELECT * FROM users WHERE id = 2")
+        log.record("SELECT COUNT(*) FROM orders LIMIT 5")
+        
+        assert log.top_queries(1) == ["SELECT * FROM users WHERE id = 2"]
+        assert log.top_queries(5)[1] == "SELECT COUNT(*) FROM orders LIMIT 5"
+        
+    def test_samples_are_kept_apart_from_the_counts(self, tmp_path):
+        """Test that representative queries survive a restart in a private file, not in the counts."""
+        path = tmp_path / "queries.json"
+        log = QueryLog(str(path))
+        log.record("SELECT * FROM users WHERE name = 'Alice'")
+        log.flush()
+        
+        samples = tmp_path / "queries.json.samples"
+        assert "Alice" not in path.read_text()
+        assert os.stat(samples).st_mode & 0o077 == 0
+        assert QueryLog(str(path)).top_queries(1) == ["SELECT * FROM users WHERE name = 'Alice'"]
+        
+        samples.unlink()
+        assert QueryLog(str(path)).top_queries(1) == []
+        
+    def test_top_queries_missing_file(self, tmp_path):
+        """Test reading a log that doesn't exist yet."""
+        assert QueryLog(str(tmp_path / "missing.json")).top_queries(3) == []
+        
+    def test_flush_writes_counts_without_literals(self, tmp_path):
+        """Test that recording does no I/O and the file holds only query shapes."""
+        path = tmp_path / "queries.json"
+        log = QueryLog(str(path))
+        log.record("SELECT * FROM users WHERE name = 'Alice'")
+        assert not path.exists()
+        
+        log.flush()
+        
+        assert json.loads(path.read_text()) == {"select * from users where name = ?": 1}
+        
+    def test_flush_merges_counts_and_caps_the_file(self, tmp_path):
+        """Test that processes sharing the file add up their counts and rare shapes are dropped."""
+        path = str(tmp_path / "queries.json")
+        first, second = QueryLog(path, max_fingerprints=1), QueryLog(path, max_fingerprints=1)
+        first.record("SELECT * FROM users WHERE id = 1")
+        second.record("SELECT * FROM users WHERE id = 2")
+        second.record("SELECT * FROM orders")
+        
+        first.flush()
+        second.flush()
+        
+        assert json.loads((tmp_path / "queries.json").read_text()) == {"select * from users where id = ?": 2}
+
+
+class TestWarmStart:
+    """Test cases for the warm-start phase."""
+    
+    @pytest.fixture
+    def config(self, tmp_path):
+        """Create a configuration with a database, metadata and query log."""
+        db_path = tmp_path / "test.db"
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)")
+            conn.execute("INSERT INTO users (name) VALUES ('Alice')")
+            conn.commit()
+            
+        metadata_path = tmp_path / "metadata.json"
+        metadata_path.write_text(json.dumps({"tables": {"users": {"columns": []}}}))
+        
+        log = QueryLog(str(tmp_path / "queries.json"))
+        log.record("SELECT * FROM users")
+        log.record("SELECT * FROM missing_table")
+        log.close()
+        
+        return ServerConfig(
+            database_path=str(db_path),
+            metadata_path=str(metadata_path),
+            query_log_path=str(log.path),
+            db_pool_size=2,
+            warm_start=True,
+            warm_start_replay_queries=5
+        )
+        
+    async def test_warm_up(self, config):
+        """Test that warm-up opens the pool, renders metadata and replays queries."""
+        server = Talk2TablesMCP(config)
+        summary = await server.warm_up()
+        
+        assert summary["connections_opened"] == 2
+        assert summary["resources_rendered"] == 3
+        assert summary["queries_replayed"] == 1
+        assert server.metadata_cache.stats()["entries"] == 3
+        
+    async def test_lifespan_warms_up_once(self, config):
+        """Test that the MCP lifespan runs the warm-up on the serving loop, once for all sessions."""
+        server = Talk2TablesMCP(config)
+        server.warm_up = AsyncMock(return_value={})
+        
+        for _ in range(2):
+            async with server._lifespan(server.mcp):
+                pass
+                
+        server.warm_up.assert_awaited_once()
@@ -0,0 +1,68 @@
+"""Tests for multi-process worker support."""
+
+import pytest
+
+from talk_2_tables_mcp.config import ServerConfig
+from talk_2_tables_mcp.remote_server import create_remote_config
+from talk_2_tables_mcp.server import Talk2TablesMCP
+from talk_2_tables_mcp.workers import bind_socket, check_worker_config
+
+
+class TestWorkers:
+    """Test cases for worker configuration and socket sharing."""
+    
+    def test_stateless_streamable_http_is_accepted(self):
+        """Test that stateless streamable-http can run multiple workers."""
+        config = ServerConfig(transport="streamable-http", stateless_http=True, workers=4)
+        check_worker_config(config)
+        
+    def test_stateful_mode_is_rejected(self):
+        """Test that session-based mode cannot run multiple workers."""
+        config = ServerConfig(transport="streamable-http", workers=4)
+        
+        with pytest.raises(ValueError, match="stateless"):
+            check_worker_config(config)
+            
+    def test_sse_is_rejected(self):
+        """Test that SSE cannot run multiple workers."""
+        config = ServerConfig(transport="sse", stateless_http=True, workers=2)
+        
+        with pytest.raises(ValueError, match="streamable-http"):
+            check_worker_config(config)
+            
+    def test_invalid_worker_count(self):
+        """Test worker count validation."""
+        with pytest.raises(ValueError):
+            ServerConfig(workers=0)
+            
+    def test_bind_socket_is_inheritable(self):
+        """Test that the shared socket can be passed to worker processes."""
+        sock = bind_socket("127.0.0.1", 0)
+        try:
+            assert sock.get_inheritable()
+            assert sock.getsockname()[1] > 0
+        finally:
+            sock.close()
+            
+    def test_http_app(self):
+        """Test building the ASGI application served by each worker."""
+        config = ServerConfig(transport="streamable-http", stateless_http=True)
+        server = Talk2TablesMCP(config)
+        
+        assert server.http_app() is not None
+        assert server.mcp.settings.stateless_http is True
+        
+    def test_http_app_requires_http_transport(self):
+        """Test that stdio has no HTTP application."""
+        server = Talk2TablesMCP(ServerConfig())
+        
+        with pytest.raises(ValueError):
+            server.http_app()
+            
+    def test_remote_config_enables_stateless_for_workers(self, monkeypatch):
+        """Test that remote deployments with several workers run stateless."""
+        monkeypatch.setenv("WORKERS", "3")
+        config = create_remote_config()
+        
+        assert config.workers == 3
+        assert config.stateless_http is True